@@ -0,0 +1,362 @@
+"""
+Benchmarks for the formatting, saving and pagination hot paths, and for startup time.
+
+Each scenario is timed at several sizes (numbers of observations) on synthetic data from windborne.mock_server,
+and results are written as JSON. If a baseline exists, each result is compared with it and regressions are reported.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py                          # every scenario at 1k, 100k and 1m observations
+    python benchmarks/run_benchmarks.py --sizes 1k,100k --scenarios 'save_track_as_*'
+    python benchmarks/run_benchmarks.py --save-baseline          # record the current results as the baseline
+    python benchmarks/run_benchmarks.py --fail-on-regression     # exit with status 1 if anything regressed
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# The mock server doesn't check credentials, but the client insists on having some
+os.environ.setdefault('WB_CLIENT_ID', 'benchmark_client')
+os.environ.setdefault('WB_API_KEY', '0' * 32)
+
+from windborne import json_backend
+from windborne.mock_server import MockAPIServer, synthetic_observation
+from windborne.observation_formatting import format_little_r, convert_to_netcdf
+from windborne.observations_api import save_observations_batch_in_buckets, get_observations, iter_observations, OBSERVATIONS_CSV_HEADERS
+from windborne.track_formatting import save_track_as_csv, save_track_as_little_r, save_track_as_kml, save_track_as_gpx, save_track_as_geojson
+from windborne.utils import save_arbitrary_response
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_SIZES = '1k,100k,1m'
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, 'benchmarks', 'baseline.json')
+DEFAULT_RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+# A result is a regression if its median time is this fraction slower than the baseline's
+DEFAULT_THRESHOLD = 0.2
+
+# Slowdowns of less than this many seconds are timer noise rather than regressions
+MIN_SIGNIFICANT_SECONDS = 0.005
+
+# Synthetic observations cover this window, so every size spans the same number of 6 hour buckets
+START_TIME = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+WINDOW_SECONDS = 6 * 60 * 60
+NUM_MISSIONS = 10
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """
+    Register a scenario. It is called with (observations, size, workdir) and returns the function to time,
+    so that preparing its input isn't part of the measurement.
+    """
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+def make_observations(size):
+    interval = WINDOW_SECONDS / size
+    first_index = round(START_TIME / interval)
+    return [synthetic_observation(index, interval, NUM_MISSIONS) for index in range(first_index, first_index + size)]
+
+
+def make_track_data(observations):
+    tracks = {}
+    for observation in observations:
+        tracks.setdefault(observation['mission_name'], []).append({
+            'latitude': observation['latitude'],
+            'longitude': observation['longitude'],
+            'altitude': observation['altitude'],
+            'time': datetime.fromtimestamp(observation['timestamp'], tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+
+    return tracks
+
+
+# Formatting
+
+@scenario('format_little_r')
+def bench_format_little_r(observations, size, workdir):
+    return lambda: format_little_r(observations)
+
+
+@scenario('convert_to_netcdf')
+def bench_convert_to_netcdf(observations, size, workdir):
+    return lambda: convert_to_netcdf(observations, observations[0]['timestamp'], os.path.join(workdir, 'observations.nc'))
+
+
+# Bucketed saving
+
+def _bench_buckets(output_format):
+    def bench(observations, size, workdir):
+        return lambda: save_observations_batch_in_buckets(observations, output_format, workdir, csv_headers=OBSERVATIONS_CSV_HEADERS)
+
+    return bench
+
+
+for _output_format in ('csv', 'json', 'little_r', 'netcdf'):
+    scenario(f"save_observations_batch_in_buckets[{_output_format}]")(_bench_buckets(_output_format))
+
+
+# Track writers
+
+def _bench_track(writer, extension):
+    def bench(observations, size, workdir):
+        track_data = make_track_data(observations)
+        return lambda: writer(os.path.join(workdir, f"track{extension}"), track_data)
+
+    return bench
+
+
+for _writer, _extension in ((save_track_as_csv, '.csv'), (save_track_as_little_r, '.little_r'), (save_track_as_kml, '.kml'),
+                            (save_track_as_gpx, '.gpx'), (save_track_as_geojson, '.geojson')):
+    scenario(_writer.__name__)(_bench_track(_writer, _extension))
+
+
+# Arbitrary responses
+
+@scenario('save_arbitrary_response[csv]')
+def bench_save_arbitrary_response_csv(observations, size, workdir):
+    response = {'observations': observations, 'has_next_page': False}
+    return lambda: save_arbitrary_response(os.path.join(workdir, 'response.csv'), response, csv_data_key='observations')
+
+
+# Full runs against the mock server
+
+def _bench_get_observations(stream):
+    def bench(observations, size, workdir):
+        server = MockAPIServer(observations_per_hour=size * 3600 / WINDOW_SECONDS, num_missions=NUM_MISSIONS)
+
+        def run():
+            with server:
+                get_observations(START_TIME, START_TIME + WINDOW_SECONDS - 1, output_format='csv', output_dir=workdir, verbose=False, stream=stream)
+
+        return run
+
+    return bench
+
+
+scenario('get_observations[mock_server]')(_bench_get_observations(stream=False))
+scenario('get_observations[mock_server,stream]')(_bench_get_observations(stream=True))
+
+
+@scenario('iter_observations[mock_server]')
+def bench_iter_observations(observations, size, workdir):
+    server = MockAPIServer(observations_per_hour=size * 3600 / WINDOW_SECONDS, num_missions=NUM_MISSIONS)
+
+    def run():
+        with server:
+            for _ in iter_observations(START_TIME, START_TIME + WINDOW_SECONDS - 1):
+                pass
+
+    return run
+
+
+# Startup, in a fresh interpreter each time (the size makes no difference)
+
+def _bench_startup(*args):
+    def bench(observations, size, workdir):
+        return lambda: subprocess.run([sys.executable, *args], cwd=ROOT_DIR, stdout=subprocess.DEVNULL, check=True)
+
+    return bench
+
+
+scenario('import_windborne')(_bench_startup('-c', 'import windborne'))
+scenario('cli_help')(_bench_startup('-m', 'windborne.cli', '--help'))
+
+
+# Running and comparing
+
+def time_scenario(name, observations, size, repeat):
+    times = []
+    for _ in range(repeat):
+        workdir = tempfile.mkdtemp(prefix='windborne-bench-')
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                func = SCENARIOS[name](observations, size, workdir)
+                gc.collect()
+
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    median = statistics.median(times)
+    return {
+        'scenario': name,
+        'size': size,
+        'repeat': repeat,
+        'min_seconds': min(times),
+        'median_seconds': median,
+        'mean_seconds': statistics.mean(times),
+        'observations_per_second': size / median if median > 0 else None,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'json_backend': json_backend.JSON_BACKEND,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns:
+        list: (result, baseline median or None, relative change or None, is regression) for each result
+    """
+    baseline_medians = {(entry['scenario'], entry['size']): entry['median_seconds'] for entry in baseline.get('results', [])}
+
+    comparisons = []
+    for result in results:
+        baseline_median = baseline_medians.get((result['scenario'], result['size']))
+        if not baseline_median:
+            comparisons.append((result, None, None, False))
+            continue
+
+        change = result['median_seconds'] / baseline_median - 1
+        is_regression = change > threshold and result['median_seconds'] - baseline_median > MIN_SIGNIFICANT_SECONDS
+        comparisons.append((result, baseline_median, change, is_regression))
+
+    return comparisons
+
+
+def print_report(comparisons):
+    headers = ['Scenario', 'Size', 'Median (s)', 'Obs/s', 'Baseline (s)', 'Change']
+    rows = []
+    for result, baseline_median, change, is_regression in comparisons:
+        rows.append([
+            result['scenario'],
+            str(result['size']),
+            f"{result['median_seconds']:.4f}",
+            f"{result['observations_per_second']:,.0f}" if result['observations_per_second'] else '-',
+            f"{baseline_median:.4f}" if baseline_median else '-',
+            (f"{change:+.1%}" + (' REGRESSION' if is_regression else '')) if change is not None else '-',
+        ])
+
+    widths = [max(len(row[i]) for row in [headers] + rows) + 2 for i in range(len(headers))]
+    print(''.join(f"{headers[i]:<{widths[i]}}" for i in range(len(headers))))
+    print('-' * sum(widths))
+    for row in rows:
+        print(''.join(f"{row[i]:<{widths[i]}}" for i in range(len(row))))
+
+
+def parse_sizes(value):
+    sizes = []
+    for name in value.split(','):
+        name = name.strip().lower()
+        if name in SIZES:
+            sizes.append(SIZES[name])
+        elif name.isdigit():
+            sizes.append(int(name))
+        else:
+            raise argparse.ArgumentTypeError(f"Unknown size {name!r}; use {', '.join(SIZES)} or a number of observations")
+
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the formatting, saving and pagination hot paths")
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes(DEFAULT_SIZES), help=f"Comma separated sizes (default {DEFAULT_SIZES})")
+    parser.add_argument('--scenarios', default='*', help="Comma separated glob patterns of scenarios to run (default all)")
+    parser.add_argument('--repeat', type=int, help="Runs per measurement (default 3, or 1 for a million observations or more)")
+    parser.add_argument('--output', help="Where to write the results (default benchmarks/results/<time>.json)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline results to compare against (default benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Also save the results as the baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help=f"Slowdown counted as a regression (default {DEFAULT_THRESHOLD})")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 if any scenario regressed")
+    parser.add_argument('--list', action='store_true', help="List the scenarios and exit")
+    args = parser.parse_args()
+
+    patterns = [pattern.strip() for pattern in args.scenarios.split(',')]
+    names = [name for name in SCENARIOS if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+
+    if args.list:
+        print('\n'.join(names))
+        return
+
+    if not names:
+        print(f"No scenarios match {args.scenarios}")
+        sys.exit(1)
+
+    results = []
+    for size in args.sizes:
+        observations = make_observations(size)
+        repeat = args.repeat or (1 if size >= 1_000_000 else 3)
+
+        for name in names:
+            print(f"Running {name} with {size} observations...", flush=True)
+            results.append(time_scenario(name, observations, size, repeat))
+
+        del observations
+        gc.collect()
+
+    report = {**environment(), 'results': results}
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    comparisons = compare(results, baseline, args.threshold)
+    print()
+    print_report(comparisons)
+    print(f"\nResults saved to {output}")
+
+    if baseline:
+        print(f"Compared with baseline {args.baseline} (git revision {baseline.get('git_revision')}, {baseline.get('created_at')})")
+
+    if args.save_baseline:
+        # Keep baseline entries for scenarios and sizes that weren't run this time
+        merged = {(entry['scenario'], entry['size']): entry for entry in baseline.get('results', [])}
+        merged.update({(entry['scenario'], entry['size']): entry for entry in results})
+
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({**environment(), 'results': list(merged.values())}, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+
+    regressions = [result for result, _, _, is_regression in comparisons if is_regression]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
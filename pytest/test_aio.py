@@ -0,0 +1,61 @@
+import asyncio
+import contextlib
+import io
+
+import pytest
+
+from windborne.api_request import WindborneClient
+from windborne.mock_server import MockAPIServer, _FILE_BLOCK
+from windborne.retry import RetryPolicy
+
+aio = pytest.importorskip('windborne.aio')
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+def run(coroutine):
+    async def run_and_close():
+        try:
+            return await coroutine
+        finally:
+            await aio.close()
+
+    return asyncio.run(run_and_close())
+
+
+def quick_retries(server):
+    return WindborneClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=50, base_delay=0, max_delay=0))
+
+
+def test_observation_pages():
+    with MockAPIServer(observations_per_hour=100, num_missions=4, page_size=50):
+        page = run(aio.get_observations_page(min_time='2024-01-01 00:00:00', max_time='2024-01-01 06:00:00'))
+
+    assert len(page['observations']) == 50
+    assert page['has_next_page']
+
+
+def test_dropped_connections_are_retried():
+    with MockAPIServer(num_missions=100, disconnect_rate=0.5, seed=1) as server, quick_retries(server).use():
+        with contextlib.redirect_stdout(io.StringIO()):
+            missions = run(aio.get_flying_missions())
+
+        assert server.errors_injected > 0
+
+    assert len(missions) == 100
+
+
+def test_interrupted_gridded_downloads_are_retried(tmp_path):
+    size = 3 * 1024 * 1024
+    with MockAPIServer(gridded_file_size=size, disconnect_rate=0.5, seed=1) as server, quick_retries(server).use():
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = run(aio.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=str(tmp_path / 'grid')))
+
+        assert server.errors_injected > 0
+
+    assert path == str(tmp_path / 'grid.nc')
+    assert open(path, 'rb').read() == (_FILE_BLOCK * (size // len(_FILE_BLOCK) + 1))[:size]
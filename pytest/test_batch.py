@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+import windborne
+from windborne.api_request import WindborneClient, get_current_client
+from windborne.batch import iter_batch, normalize_call, run_batch
+from windborne.mock_server import MockAPIServer
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+def add(a, b=0):
+    return a + b
+
+
+@pytest.mark.parametrize('call, expected', [
+    (add, (add, (), {})),
+    ((add, {'a': 1}), (add, (), {'a': 1})),
+    ((add, [1, 2]), (add, (1, 2), {})),
+    ((add, (1,), {'b': 2}), (add, (1,), {'b': 2})),
+    ({'func': add, 'args': [1], 'kwargs': {'b': 2}}, (add, (1,), {'b': 2})),
+])
+def test_call_specs(call, expected):
+    assert normalize_call(call) == expected
+
+
+def test_unsupported_call_specs_are_rejected():
+    with pytest.raises(ValueError):
+        normalize_call((1, 2))
+
+
+def test_results_are_returned_in_input_order():
+    def slow_add(a):
+        time.sleep(0.01 * (5 - a))
+        return a + 1
+
+    results = run_batch([(slow_add, [a]) for a in range(5)], max_workers=5)
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.value for result in results] == [1, 2, 3, 4, 5]
+
+
+def test_failures_do_not_stop_the_batch():
+    def fail():
+        raise ValueError("bad input")
+
+    def exit_on_bad_input():
+        exit(2)
+
+    results = run_batch([(add, [1]), fail, exit_on_bad_input, (add, [2])])
+
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert isinstance(results[2].error, SystemExit)
+    assert results[3].value == 2
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def track():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    run_batch([track] * 12, max_workers=3)
+
+    assert running[1] == 3
+
+
+def test_calls_use_the_callers_client():
+    client = WindborneClient(client_id='test_client', api_key='a' * 32)
+
+    with client.use():
+        results = list(iter_batch([get_current_client] * 4))
+
+    assert all(result.value is client for result in results)
+
+
+def test_api_calls_run_concurrently():
+    with MockAPIServer(forecast_hours=12) as server:
+        results = run_batch([(windborne.get_point_forecasts, {'coordinates': coordinates}) for coordinates in ['37,-122', '40,-74', '51,0']])
+
+        assert server.requests_served == 3
+
+    assert all(result.ok and result.value for result in results)
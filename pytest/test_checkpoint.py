@@ -0,0 +1,109 @@
+import contextlib
+import filecmp
+import io
+import json
+import os
+
+import pytest
+
+import windborne
+from windborne.checkpoint import CursorCheckpoint
+from windborne.mock_server import MockAPIServer
+
+START_TIME = '2024-01-01 03:17:00'
+END_TIME = '2024-01-02 10:05:00'
+
+QUERY = {'function': 'get_observations', 'min_time': 1704079020, 'mission_id': None}
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+def quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def interrupt_after(pages):
+    fetched = [0]
+
+    def callback(response):
+        fetched[0] += 1
+        if fetched[0] == pages:
+            raise Interrupted()
+
+    return callback
+
+
+def test_saved_cursors_are_loaded_for_the_same_query(tmp_path):
+    state_file = str(tmp_path / 'state' / 'backfill.json')
+    CursorCheckpoint(state_file, QUERY).save(1704079020000000000)
+
+    assert CursorCheckpoint(state_file, dict(QUERY)).load() == 1704079020000000000
+
+
+def test_state_files_of_other_queries_are_ignored(tmp_path):
+    state_file = str(tmp_path / 'state.json')
+    CursorCheckpoint(state_file, QUERY).save(1704079020000000000)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert CursorCheckpoint(state_file, {**QUERY, 'mission_id': 'abc'}).load() is None
+
+    assert 'different query' in output.getvalue()
+
+
+def test_missing_or_corrupt_state_files_start_from_the_beginning(tmp_path):
+    state_file = str(tmp_path / 'state.json')
+    assert CursorCheckpoint(state_file, QUERY).load() is None
+
+    with open(state_file, 'w') as f:
+        f.write('{"query": ')
+    assert quietly(CursorCheckpoint(state_file, QUERY).load) is None
+
+
+def test_clearing_removes_the_state_file(tmp_path):
+    state_file = str(tmp_path / 'state.json')
+    checkpoint = CursorCheckpoint(state_file, QUERY)
+    checkpoint.save(1)
+    checkpoint.clear()
+    checkpoint.clear()
+
+    assert not os.path.exists(state_file)
+
+
+def test_resumed_backfill_has_no_gaps_or_duplicates(tmp_path):
+    complete = tmp_path / 'complete'
+    resumed = tmp_path / 'resumed'
+    state_file = str(tmp_path / 'state.json')
+
+    with MockAPIServer(observations_per_hour=1000, num_missions=4, page_size=2000):
+        quietly(windborne.get_observations, START_TIME, END_TIME, output_format='json', output_dir=str(complete), verbose=False)
+
+        with pytest.raises(Interrupted):
+            quietly(windborne.get_observations, START_TIME, END_TIME, output_format='json', output_dir=str(resumed), verbose=False,
+                    state_file=state_file, callback=interrupt_after(8))
+        assert os.path.exists(state_file)
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            windborne.get_observations(START_TIME, END_TIME, output_format='json', output_dir=str(resumed), verbose=False, state_file=state_file)
+
+    assert 'Resuming' in output.getvalue()
+    assert sorted(os.listdir(resumed)) == sorted(os.listdir(complete))
+    for name in os.listdir(complete):
+        assert filecmp.cmp(resumed / name, complete / name, shallow=False), name
+
+    ids = [observation['id'] for name in os.listdir(resumed) for observation in json.load(open(resumed / name))]
+    assert len(ids) == len(set(ids))
+
+    # A complete run leaves nothing to resume from
+    assert not os.path.exists(state_file)
+    assert not os.path.exists(state_file + '.spool')
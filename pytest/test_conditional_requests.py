@@ -0,0 +1,122 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import windborne
+from windborne.api_request import configure_api_base_url, clear_conditional_cache, make_api_request
+
+
+class ETagServer:
+    """
+    Serves a JSON body with an ETag, replying 304 Not Modified when the client already has it.
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self.statuses = []
+        self.if_none_match = []
+
+    def __enter__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = json.dumps(server.body).encode('utf-8')
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                server.if_none_match.append(self.headers.get('If-None-Match'))
+
+                if self.headers.get('If-None-Match') == etag:
+                    server.statuses.append(304)
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                server.statuses.append(200)
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture(autouse=True)
+def empty_conditional_cache():
+    clear_conditional_cache()
+    yield
+    clear_conditional_cache()
+
+
+def test_unchanged_responses_are_not_downloaded_again():
+    with ETagServer({'latest': '2024-01-01T00:00:00Z'}) as server:
+        first = make_api_request(f"{server.url}/forecasts/v1/wm/initialization_times", conditional=True)
+        second = make_api_request(f"{server.url}/forecasts/v1/wm/initialization_times", conditional=True)
+
+        server.body = {'latest': '2024-01-01T06:00:00Z'}
+        third = make_api_request(f"{server.url}/forecasts/v1/wm/initialization_times", conditional=True)
+
+    assert server.statuses == [200, 304, 200]
+    assert server.if_none_match[0] is None
+    assert server.if_none_match[1] is not None
+    assert first == second == {'latest': '2024-01-01T00:00:00Z'}
+    assert third == {'latest': '2024-01-01T06:00:00Z'}
+
+
+def test_requests_are_only_conditional_when_asked_for():
+    with ETagServer({'latest': '2024-01-01T00:00:00Z'}) as server:
+        make_api_request(f"{server.url}/forecasts/v1/wm/initialization_times")
+        make_api_request(f"{server.url}/forecasts/v1/wm/initialization_times")
+
+    assert server.statuses == [200, 200]
+
+
+def test_responses_reused_on_304_are_copies():
+    with ETagServer({'available': [{'forecast_hour': 0}]}) as server:
+        first = make_api_request(f"{server.url}/forecasts/v1/wm/run_information", conditional=True)
+        first['available'].append({'forecast_hour': 'modified by the first caller'})
+
+        second = make_api_request(f"{server.url}/forecasts/v1/wm/run_information", conditional=True)
+        second['available'].clear()
+
+        third = make_api_request(f"{server.url}/forecasts/v1/wm/run_information", conditional=True)
+
+    assert server.statuses == [200, 304, 304]
+    assert third == {'available': [{'forecast_hour': 0}]}
+
+
+def test_run_information_is_requested_conditionally():
+    run_information = {'initialization_time': '2024-01-01T00:00:00Z', 'in_progress': False, 'available': []}
+    with ETagServer(run_information) as server:
+        configure_api_base_url(server.url)
+        try:
+            assert windborne.get_run_information() == run_information
+            assert windborne.get_run_information() == run_information
+        finally:
+            configure_api_base_url(None)
+
+    assert server.statuses == [200, 304]
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+import windborne
+from windborne import downloads
+from windborne.api_request import WindborneClient
+from windborne.forecasts_api import download_and_save_output
+from windborne.mock_server import MockAPIServer, _FILE_BLOCK
+from windborne.retry import RetryPolicy
+
+FILE_SIZE = 3 * 1024 * 1024
+
+
+def expected_file(size=FILE_SIZE):
+    return (_FILE_BLOCK * (size // len(_FILE_BLOCK) + 1))[:size]
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+def test_gridded_forecast_is_saved_and_returned_as_a_response(tmp_path):
+    with MockAPIServer(gridded_file_size=FILE_SIZE):
+        response = windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0,
+                                                  output_file=str(tmp_path / 'grid'), silent=True)
+
+    assert response.status_code == 200
+    assert response.content == expected_file()
+    assert open(tmp_path / 'grid.nc', 'rb').read() == expected_file()
+
+
+def test_gridded_analysis_is_saved_and_returned_as_a_response(tmp_path):
+    with MockAPIServer(gridded_file_size=FILE_SIZE):
+        response = windborne.get_gridded_analysis(variable='temperature_2m', time='2024010100', output_file=str(tmp_path / 'analysis'))
+
+    assert response.content == expected_file()
+    assert os.path.exists(tmp_path / 'analysis.nc')
+
+
+def test_download_and_save_output_reports_success_as_a_bool(tmp_path):
+    with MockAPIServer(gridded_file_size=FILE_SIZE) as server:
+        response = windborne.make_api_request(f"{server.url}/forecasts/v1/wm/gridded", params={'variable': 'temperature_2m'}, as_json=False, stream=True)
+        assert download_and_save_output(str(tmp_path / 'grid'), response, silent=True) is True
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert download_and_save_output(str(tmp_path / 'missing' / 'grid'), response, silent=True) is False
+
+
+def test_interrupted_segmented_downloads_are_resumed(tmp_path):
+    with MockAPIServer(gridded_file_size=20 * 1024 * 1024, disconnect_rate=0.3) as server:
+        client = WindborneClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=50, base_delay=0, max_delay=0))
+        with contextlib.redirect_stdout(io.StringIO()) as output, client.use():
+            response = windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0,
+                                                      output_file=str(tmp_path / 'grid.nc'), download_segments=2)
+
+        assert server.errors_injected > 0
+
+    assert 'Download interrupted' in output.getvalue()
+    assert open(tmp_path / 'grid.nc', 'rb').read() == expected_file(20 * 1024 * 1024)
+    assert len(response.content) == 20 * 1024 * 1024
+    assert sorted(os.listdir(tmp_path)) == ['grid.nc']
+
+
+
+def test_downloads_interrupted_in_an_earlier_run_are_resumed(tmp_path):
+    size = 20 * 1024 * 1024
+    output_file = str(tmp_path / 'grid.nc')
+
+    with MockAPIServer(gridded_file_size=size, disconnect_rate=1.0) as server:
+        client = WindborneClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=1))
+        with contextlib.redirect_stdout(io.StringIO()), client.use():
+            windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=output_file)
+
+    assert sorted(os.listdir(tmp_path)) == ['grid.nc.part', 'grid.nc.part.json']
+
+    with MockAPIServer(gridded_file_size=size):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            response = windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=output_file)
+
+    assert 'Resuming partial download' in output.getvalue()
+    assert response.content == expected_file(size)
+    assert sorted(os.listdir(tmp_path)) == ['grid.nc']
+
+
+def test_corrupted_downloads_are_discarded(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloads, '_file_md5', lambda path, chunk_size: '0' * 32)
+
+    with MockAPIServer(gridded_file_size=FILE_SIZE):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=str(tmp_path / 'grid.nc'))
+
+    assert 'does not match its ETag' in output.getvalue()
+    assert os.listdir(tmp_path) == []
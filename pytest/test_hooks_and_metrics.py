@@ -0,0 +1,154 @@
+import contextlib
+import io
+import urllib.request
+
+import pytest
+
+import windborne
+from windborne.api_request import WindborneClient
+from windborne.hooks import clear_hooks, emit, endpoint_name, register_hook, unregister_hook
+from windborne.metrics import MetricsRegistry, disable_metrics, enable_metrics, get_metrics_text, start_metrics_server
+from windborne.mock_server import MockAPIServer
+from windborne.retry import RetryPolicy
+
+MISSION_ID = '0c3b5c6d-1b2a-4c3d-8e9f-0a1b2c3d4e5f'
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture(autouse=True)
+def no_hooks():
+    yield
+    disable_metrics()
+    clear_hooks()
+
+
+@pytest.mark.parametrize('url, name', [
+    (f"https://api.windbornesystems.com/observations/v1/missions/{MISSION_ID}/flight_path.json", '/observations/v1/missions/{id}/flight_path.json'),
+    ('https://api.windbornesystems.com/forecasts/v1/wm/stations/KJFK', '/forecasts/v1/wm/stations/{id}'),
+    (f"https://api.windbornesystems.com/observations/v1/soundings/{MISSION_ID}", '/observations/v1/soundings/{id}'),
+    ('https://api.windbornesystems.com/observations/v1/observations.json?since=0', '/observations/v1/observations.json'),
+])
+def test_endpoint_names(url, name):
+    assert endpoint_name(url) == name
+
+
+def test_unknown_events_are_rejected():
+    with pytest.raises(ValueError):
+        register_hook('after_download', print)
+
+
+def test_hooks_see_every_attempt(monkeypatch):
+    events = []
+    for event in ['before_request', 'after_response', 'on_retry', 'on_error']:
+        register_hook(event, events.append)
+    monkeypatch.setattr(windborne.api_request.time, 'sleep', lambda seconds: None)
+
+    with MockAPIServer(error_rate=0.5, seed=1) as server:
+        client = WindborneClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=10, base_delay=0, max_delay=0))
+        with contextlib.redirect_stdout(io.StringIO()):
+            client.request(f"{server.url}/observations/v1/flying_missions.json")
+
+        assert server.errors_injected > 0
+
+    retries = [event for event in events if event.event == 'on_retry']
+    assert len(retries) == server.errors_injected
+    assert all(event.status_code == 503 for event in retries)
+    assert [event.attempt for event in events if event.event == 'before_request'] == list(range(1, len(retries) + 2))
+    assert events[-1].event == 'after_response'
+    assert events[-1].status_code == 200
+    assert events[-1].endpoint == '/observations/v1/flying_missions.json'
+
+
+def test_client_hooks_only_see_their_clients_requests():
+    events = []
+
+    with MockAPIServer() as server:
+        client = WindborneClient(base_url=server.url)
+        client.register_hook('after_response', events.append)
+        client.request(f"{server.url}/observations/v1/flying_missions.json")
+        windborne.make_api_request(f"{server.url}/observations/v1/flying_missions.json")
+
+    assert len(events) == 1
+
+
+def test_failing_hooks_do_not_break_requests():
+    @register_hook('after_response')
+    def broken(event):
+        raise RuntimeError("broken hook")
+
+    with MockAPIServer() as server, contextlib.redirect_stdout(io.StringIO()) as output:
+        assert windborne.make_api_request(f"{server.url}/observations/v1/flying_missions.json") is not None
+
+    assert 'broken hook' in output.getvalue()
+
+
+def test_unregistered_hooks_are_not_called():
+    events = []
+    hook = register_hook('before_request', events.append)
+    unregister_hook('before_request', hook)
+
+    emit('before_request', 'https://api.windbornesystems.com/observations/v1/observations.json')
+
+    assert events == []
+
+
+def test_metrics_count_requests_by_endpoint_and_status():
+    registry = enable_metrics()
+
+    with MockAPIServer() as server:
+        for _ in range(3):
+            windborne.make_api_request(f"{server.url}/observations/v1/flying_missions.json")
+
+    counters = {counter['name']: counter for counter in registry.snapshot()['counters']}
+    assert counters['windborne_requests_total']['labels'] == {'endpoint': '/observations/v1/flying_missions.json', 'status': 200, 'source': 'network'}
+    assert counters['windborne_requests_total']['value'] == 3
+    assert registry.snapshot()['histograms'][0]['count'] == 3
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry(latency_buckets=(0.1, 1.0))
+    registry.inc('windborne_requests_total', (('endpoint', '/a"b'), ('status', 200)))
+    registry.observe('windborne_request_duration_seconds', (('endpoint', '/a'),), 0.5)
+
+    assert registry.to_prometheus() == '\n'.join([
+        '# HELP windborne_requests_total Responses received, by endpoint, status and source (network, cache or cassette)',
+        '# TYPE windborne_requests_total counter',
+        'windborne_requests_total{endpoint="/a\\"b",status="200"} 1',
+        '# HELP windborne_request_duration_seconds Time taken by each attempt, by endpoint',
+        '# TYPE windborne_request_duration_seconds histogram',
+        'windborne_request_duration_seconds_bucket{endpoint="/a",le="0.1"} 0',
+        'windborne_request_duration_seconds_bucket{endpoint="/a",le="1"} 1',
+        'windborne_request_duration_seconds_bucket{endpoint="/a",le="+Inf"} 1',
+        'windborne_request_duration_seconds_sum{endpoint="/a"} 0.5',
+        'windborne_request_duration_seconds_count{endpoint="/a"} 1',
+    ]) + '\n'
+
+
+def test_metrics_are_served_for_scraping():
+    registry = enable_metrics()
+    registry.inc('windborne_requests_total', (('endpoint', '/a'), ('status', 200), ('source', 'network')))
+
+    server = start_metrics_server(port=0)
+    try:
+        body = urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics").read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert body == get_metrics_text()
+    assert 'windborne_requests_total{endpoint="/a",status="200",source="network"} 1' in body
+
+
+def test_disabled_metrics_collect_nothing():
+    enable_metrics()
+    disable_metrics()
+
+    with MockAPIServer() as server:
+        windborne.make_api_request(f"{server.url}/observations/v1/flying_missions.json")
+
+    assert get_metrics_text() == ''
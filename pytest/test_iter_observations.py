@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+import windborne
+from windborne.mock_server import MockAPIServer
+from windborne.observations_api import ObservationSpool
+from windborne.utils import to_unix_timestamp
+
+START_TIME = '2024-01-01 03:17:00'
+END_TIME = '2024-01-01 15:05:00'
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture
+def mock_server():
+    with MockAPIServer(observations_per_hour=1000, num_missions=4, page_size=2000) as server:
+        yield server
+
+
+def observation(id, timestamp, **values):
+    return {'id': id, 'timestamp': timestamp, **values}
+
+
+def test_observations_are_yielded_once_each(mock_server):
+    observations = list(windborne.iter_observations(START_TIME, END_TIME))
+    ids = [observation['id'] for observation in observations]
+
+    assert len(ids) == len(set(ids)) > 2000
+    assert all(to_unix_timestamp(START_TIME) <= observation['timestamp'] <= to_unix_timestamp(END_TIME) for observation in observations)
+
+
+def test_pages_are_only_fetched_once_consumed(mock_server):
+    observations = windborne.iter_observations(START_TIME, END_TIME)
+    next(observations)
+    assert mock_server.requests_served == 1
+
+    for _ in range(2000):
+        next(observations)
+    assert mock_server.requests_served == 2
+
+
+def test_pages_and_streams_yield_the_same_observations(mock_server):
+    observations = list(windborne.iter_observations(START_TIME, END_TIME))
+    pages = list(windborne.iter_observations(START_TIME, END_TIME, pages=True))
+    streamed = list(windborne.iter_observations(START_TIME, END_TIME, stream=True))
+
+    assert [len(page) for page in pages[:-1]] == [2000] * (len(pages) - 1)
+    assert [observation for page in pages for observation in page] == observations
+    assert streamed == observations
+
+
+def test_spooled_observations_are_grouped_by_bucket():
+    with ObservationSpool(bucket_hours=6) as spool:
+        spool.add([observation('a', 0), observation('b', 6 * 3600), observation('c', 3600)])
+        spool.add([observation('d', 12 * 3600 + 1)])
+
+        assert spool.count == 4
+        assert spool.keys() == [0, 1, 2]
+        assert [[observation['id'] for observation in spool.read(key)] for key in spool.keys()] == [['a', 'c'], ['b'], ['d']]
+
+        saved = []
+        spool.save(saved.append)
+        assert [len(batch) for batch in saved] == [2, 1, 1]
+
+
+def test_observations_spooled_again_keep_their_position_and_latest_values():
+    with ObservationSpool() as spool:
+        spool.add([observation('a', 0, altitude=1), observation('b', 1)])
+        spool.add([observation('c', 2), observation('a', 0, altitude=2)])
+
+        assert spool.read(0) == [observation('a', 0, altitude=2), observation('b', 1), observation('c', 2)]
+
+
+def test_temporary_spools_are_removed_on_close():
+    with ObservationSpool() as spool:
+        spool.add([observation('a', 0)])
+
+    assert not os.path.exists(spool.directory)
+
+
+def test_persistent_spools_are_picked_up_by_the_next_run(tmp_path):
+    directory = str(tmp_path / 'spool')
+    with ObservationSpool(directory=directory) as spool:
+        spool.add([observation('a', 0)])
+
+    # A run killed while adding a batch leaves an unfinished line behind
+    with open(os.path.join(directory, '0.jsonl'), 'a') as f:
+        f.write(json.dumps([observation('b', 1)])[:10])
+
+    with ObservationSpool(directory=directory) as spool:
+        spool.add([observation('c', 2)])
+        assert [observation['id'] for observation in spool.read(0)] == ['a', 'c']
+
+        spool.clear()
+
+    assert not os.path.exists(directory)
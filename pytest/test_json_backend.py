@@ -0,0 +1,69 @@
+import json
+
+import pytest
+import requests
+
+from windborne import json_backend
+from windborne.json_backend import configure_json_output, dump, dumps, is_compact_output, loads, loads_response
+
+VALUE = {'observations': [{'id': 'a', 'altitude': 1234.5, 'mission_name': 'W-1234', 'humidity': None}], 'has_next_page': True}
+
+
+@pytest.fixture(autouse=True, params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    if request.param == 'json':
+        monkeypatch.setattr(json_backend, 'orjson', None)
+    elif json_backend.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def indented_output():
+    yield
+    configure_json_output(compact=False)
+
+
+def test_loads_accepts_str_and_bytes():
+    assert loads(json.dumps(VALUE)) == VALUE
+    assert loads(json.dumps(VALUE).encode('utf-8')) == VALUE
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        loads(b'{"observations": [')
+
+
+def test_loads_response_falls_back_to_the_response_encoding():
+    response = requests.Response()
+    response._content = json.dumps({'name': 'Zürich'}, ensure_ascii=False).encode('latin-1')
+    response.encoding = 'latin-1'
+
+    assert loads_response(response) == {'name': 'Zürich'}
+
+
+def test_indented_output_matches_the_standard_library():
+    assert dumps(VALUE) == json.dumps(VALUE, indent=4)
+
+
+def test_compact_output():
+    configure_json_output(compact=True)
+
+    assert is_compact_output()
+    assert dumps(VALUE) == json.dumps(VALUE, separators=(',', ':'))
+    assert dumps(VALUE, compact=False) == json.dumps(VALUE, indent=4)
+
+
+def test_numbers_too_large_for_orjson_are_still_written():
+    assert dumps({'value': 2 ** 70}, compact=True) == '{"value":1180591620717411303424}'
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_dump_writes_the_same_as_dumps(tmp_path, compact):
+    path = tmp_path / 'output.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        dump(VALUE, f, compact=compact)
+        f.write(']')
+
+    assert path.read_text(encoding='utf-8') == f"[{dumps(VALUE, compact=compact)}]"
@@ -0,0 +1,52 @@
+import contextlib
+import filecmp
+import io
+import os
+
+import pytest
+
+import windborne
+from windborne.mock_server import MockAPIServer
+
+START_TIME = '2024-01-01 03:17:00'
+END_TIME = '2024-01-02 10:05:00'
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture
+def mock_server():
+    # Small pages, so that a day of observations takes a few dozen of them
+    with MockAPIServer(observations_per_hour=1000, num_missions=4, page_size=2000) as server:
+        yield server
+
+
+def quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def assert_same_files(directory, expected_directory):
+    assert sorted(os.listdir(directory)) == sorted(os.listdir(expected_directory))
+    for name in os.listdir(expected_directory):
+        assert filecmp.cmp(os.path.join(directory, name), os.path.join(expected_directory, name), shallow=False), name
+
+
+def test_sharded_backfill_matches_single_worker(mock_server, tmp_path):
+    single = tmp_path / 'single'
+    sharded = tmp_path / 'sharded'
+    quietly(windborne.get_observations, START_TIME, END_TIME, output_format='json', output_dir=str(single), verbose=False)
+    quietly(windborne.get_observations, START_TIME, END_TIME, output_format='json', output_dir=str(sharded), verbose=False, workers=5)
+
+    assert_same_files(sharded, single)
+
+
+def test_sharded_backfill_to_single_file_matches_single_worker(mock_server, tmp_path):
+    quietly(windborne.get_observations, START_TIME, END_TIME, output_file=str(tmp_path / 'single.csv'), verbose=False)
+    quietly(windborne.get_observations, START_TIME, END_TIME, output_file=str(tmp_path / 'sharded.csv'), verbose=False, workers=5)
+
+    assert filecmp.cmp(tmp_path / 'single.csv', tmp_path / 'sharded.csv', shallow=False)
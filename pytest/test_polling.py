@@ -0,0 +1,101 @@
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+import windborne
+from windborne import observations_api
+from windborne.mock_server import MockAPIServer
+
+START_TIME = '2024-01-01 03:17:00'
+END_TIME = '2024-01-02 10:05:00'
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture
+def mock_server():
+    with MockAPIServer(observations_per_hour=1000, num_missions=4, page_size=2000) as server:
+        yield server
+
+
+def quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def read_observations(directory):
+    return {name: json.load(open(os.path.join(directory, name))) for name in sorted(os.listdir(directory))}
+
+
+def test_polled_bucket_files_hold_each_observation_once_in_its_latest_version(tmp_path, monkeypatch):
+    get_page = observations_api.get_observations_page
+    latest_versions = {}
+    polls = [0]
+
+    def get_page_with_updates(since=None, **kwargs):
+        # Each poll delivers everything again, with every third observation updated since the poll before
+        polls[0] += 1
+        if polls[0] > 4:
+            raise Interrupted()
+
+        page = get_page(**kwargs)
+        for index, observation in enumerate(page['observations']):
+            if index % 3 == 0:
+                observation['updated_at'] += polls[0]
+            latest_versions[observation['id']] = observation['updated_at']
+        page['has_next_page'] = False
+        return page
+
+    monkeypatch.setattr(observations_api, 'get_observations_page', get_page_with_updates)
+    monkeypatch.setattr(observations_api.time, 'sleep', lambda seconds: None)
+
+    with MockAPIServer(observations_per_hour=100, num_missions=4):
+        with pytest.raises(Interrupted):
+            quietly(windborne.get_observations, START_TIME, END_TIME, include_updated_at=True, output_format='json', output_dir=str(tmp_path),
+                    verbose=False, exit_at_end=False)
+
+    files = read_observations(tmp_path)
+    assert not any('.1.' in name for name in files)
+
+    saved_versions = {}
+    for observations in files.values():
+        ids = [observation['id'] for observation in observations]
+        assert len(ids) == len(set(ids))
+        for observation in observations:
+            assert observation['id'] not in saved_versions
+            saved_versions[observation['id']] = observation['updated_at']
+
+    assert saved_versions == latest_versions
+
+
+def test_polling_to_a_single_file_saves_each_version_once(mock_server, tmp_path, monkeypatch):
+    get_page = observations_api.get_observations_page
+    polls = [0]
+
+    def get_page_delivering_again(since=None, **kwargs):
+        polls[0] += 1
+        if polls[0] > 3:
+            raise Interrupted()
+
+        page = get_page(**kwargs)
+        page['has_next_page'] = False
+        return page
+
+    monkeypatch.setattr(observations_api, 'get_observations_page', get_page_delivering_again)
+    monkeypatch.setattr(observations_api.time, 'sleep', lambda seconds: None)
+
+    with pytest.raises(Interrupted):
+        quietly(windborne.get_observations, START_TIME, END_TIME, output_file=str(tmp_path / 'observations.json'), verbose=False, exit_at_end=False)
+
+    assert sorted(os.listdir(tmp_path)) == ['observations.json']
@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+
+from windborne.api_request import WindborneClient
+from windborne.mock_server import MockAPIServer
+from windborne.rate_limit import FileTokenBucket, RateLimiter, TokenBucket, configure_rate_limits, endpoint_family, get_rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limits():
+    yield
+    configure_rate_limits()
+
+
+@pytest.mark.parametrize('url, family', [
+    ('https://api.windbornesystems.com/observations/v1/observations.json', 'observations'),
+    ('https://api.windbornesystems.com/forecasts/v1/wm/point_forecast', 'forecasts'),
+    ('https://api.windbornesystems.com/insights/v1/flying_missions', 'insights'),
+    ('https://example.com/other', None),
+])
+def test_endpoint_families(url, family):
+    assert endpoint_family(url) == family
+
+
+def test_bursts_are_allowed_then_requests_are_spaced_at_the_rate():
+    bucket = TokenBucket(rate=10, burst=3)
+    delays = [bucket.reserve() for _ in range(5)]
+
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert delays[3] == pytest.approx(0.1, abs=0.01)
+    assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_file_buckets_are_shared_through_their_file(tmp_path):
+    path = str(tmp_path / 'observations.bucket')
+    first = FileTokenBucket(path, rate=10, burst=2)
+    second = FileTokenBucket(path, rate=10, burst=2)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() == pytest.approx(0.1, abs=0.01)
+    assert os.path.getsize(path) > 0
+
+
+def test_only_configured_families_are_limited():
+    limiter = configure_rate_limits(forecasts=1, burst=1)
+
+    assert get_rate_limiter() is limiter
+    assert limiter.reserve('https://api.windbornesystems.com/forecasts/v1/wm/gridded') == 0.0
+    assert limiter.reserve('https://api.windbornesystems.com/forecasts/v1/wm/gridded') > 0.5
+    assert limiter.reserve('https://api.windbornesystems.com/observations/v1/observations.json') == 0.0
+
+
+def test_configuring_no_limits_disables_rate_limiting():
+    configure_rate_limits(observations=5)
+
+    assert configure_rate_limits() is None
+    assert get_rate_limiter() is None
+
+
+def test_requests_wait_for_their_turn():
+    limiter = RateLimiter({'observations': TokenBucket(rate=20, burst=1)})
+
+    with MockAPIServer() as server:
+        client = WindborneClient(base_url=server.url, rate_limiter=limiter)
+        started_at = time.monotonic()
+        for _ in range(4):
+            client.request(f"{server.url}/observations/v1/flying_missions.json")
+
+    assert time.monotonic() - started_at >= 0.14
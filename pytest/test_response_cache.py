@@ -0,0 +1,146 @@
+import contextlib
+import io
+import json
+import os
+import time
+
+import pytest
+import requests
+
+import windborne
+from windborne import response_cache
+from windborne.mock_server import MockAPIServer
+from windborne.response_cache import ResponseCache, IMMUTABLE, configure_response_cache
+
+POINT_FORECAST_PARAMS = {'coordinates': '37,-122', 'initialization_time': '2024-01-01T00:00:00Z'}
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield configure_response_cache(str(tmp_path / 'cache'))
+    configure_response_cache(None)
+
+
+def json_response(value, url='https://example.com/observations/v1/soundings/a'):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = json.dumps(value).encode('utf-8')
+    return response
+
+
+@pytest.mark.parametrize('path, params, ttl', [
+    ('/forecasts/v1/wm/gridded', {'initialization_time': '2024010100'}, IMMUTABLE),
+    ('/forecasts/v1/wm/gridded', {}, None),
+    ('/forecasts/v1/wm/run_information', {'initialization_time': '2024010100'}, None),
+    ('/forecasts/v1/wm/tropical_cyclones', {'initialization_time': '2024010100'}, 900),
+    ('/forecasts/v1/wm/tropical_cyclones', {}, None),
+    ('/forecasts/v1/ecmwf_det_anl/analysis/gridded', {'time': '2024010100'}, IMMUTABLE),
+    ('/forecasts/v1/ecmwf_det_anl/analysis/interpolated', {}, None),
+    ('/observations/v1/soundings/abc', {}, IMMUTABLE),
+    ('/observations/v1/missions/abc/flight_path.json', {}, 300),
+    ('/observations/v1/observations.json', {'since': 0}, None),
+])
+def test_default_rules(tmp_path, path, params, ttl):
+    assert ResponseCache(str(tmp_path)).ttl_for(f"https://api.windbornesystems.com{path}", params) == ttl
+
+
+def test_repeated_requests_are_served_from_the_cache(cache):
+    with MockAPIServer() as server:
+        first = windborne.make_api_request(f"{server.url}/forecasts/v1/wm/point_forecast", params=POINT_FORECAST_PARAMS)
+        second = windborne.make_api_request(f"{server.url}/forecasts/v1/wm/point_forecast", params=POINT_FORECAST_PARAMS)
+
+        assert server.requests_served == 1
+
+    assert first == second
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['entries'] == 1
+
+
+def test_gridded_downloads_are_cached_once_saved(cache, tmp_path):
+    with MockAPIServer(gridded_file_size=3 * 1024 * 1024) as server:
+        first = windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=str(tmp_path / 'first.nc'), silent=True, download_segments=2)
+        requests_for_download = server.requests_served
+        second = windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=str(tmp_path / 'second.nc'), silent=True)
+
+        assert server.requests_served == requests_for_download
+
+    assert first.content == second.content
+    assert open(tmp_path / 'first.nc', 'rb').read() == open(tmp_path / 'second.nc', 'rb').read()
+    assert cache.stats()['size_bytes'] == 3 * 1024 * 1024
+
+
+def test_files_larger_than_the_cache_are_not_stored(tmp_path):
+    cache = configure_response_cache(str(tmp_path / 'cache'), max_size_bytes=1024 * 1024)
+    try:
+        with MockAPIServer(gridded_file_size=2 * 1024 * 1024):
+            windborne.get_gridded_forecast('temperature_2m', initialization_time='2024010100', forecast_hour=0, output_file=str(tmp_path / 'grid.nc'), silent=True)
+    finally:
+        configure_response_cache(None)
+
+    assert os.path.getsize(tmp_path / 'grid.nc') == 2 * 1024 * 1024
+    assert cache.stats()['stores'] == 0
+    assert cache.stats()['entries'] == 0
+
+
+def test_failing_to_write_the_cache_still_returns_the_response(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+
+    def failing_atomic_write(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(response_cache, 'atomic_write', failing_atomic_write)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        value = cache.store('key', json_response({'value': 1}))
+
+    assert value == {'value': 1}
+    assert 'Could not write to the response cache' in output.getvalue()
+    assert cache.load('key') is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store('key', json_response({'value': 1}), ttl=60)
+    assert cache.load('key') == {'value': 1}
+
+    cache.store('key', json_response({'value': 1}), ttl=-1)
+    assert cache.load('key') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_eviction_removes_expired_entries_before_least_recently_used_ones(tmp_path):
+    body_size = len(json.dumps({'value': 'x' * 100}))
+    cache = ResponseCache(str(tmp_path), max_size_bytes=body_size * 2)
+
+    cache.store('oldest', json_response({'value': 'x' * 100}))
+    cache.store('expired', json_response({'value': 'y' * 100}), ttl=-1)
+    os.utime(os.path.join(str(tmp_path), 'oldest.json'), (time.time() - 60, time.time() - 60))
+
+    # Going over the limit evicts the expired entry, even though it was used more recently
+    cache.store('newest', json_response({'value': 'z' * 100}))
+
+    assert cache.load('oldest') == {'value': 'x' * 100}
+    assert cache.load('newest') == {'value': 'z' * 100}
+    assert cache.stats()['entries'] == 2
+    assert cache.evictions == 1
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_limit(tmp_path):
+    body_size = len(json.dumps({'value': 'x' * 100}))
+    cache = ResponseCache(str(tmp_path), max_size_bytes=body_size * 2)
+
+    for index, key in enumerate(['first', 'second', 'third']):
+        cache.store(key, json_response({'value': 'x' * 100}))
+        os.utime(os.path.join(str(tmp_path), f"{key}.json"), (time.time() - 60 + index, time.time() - 60 + index))
+    cache.evict()
+
+    assert cache.load('first') is None
+    assert cache.load('second') is not None
+    assert cache.load('third') is not None
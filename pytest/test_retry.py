@@ -0,0 +1,92 @@
+import contextlib
+import io
+import time
+from email.utils import formatdate
+
+import pytest
+
+from windborne import api_request
+from windborne.api_request import WindborneClient
+from windborne.mock_server import MockAPIServer
+from windborne.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(api_request.time, 'sleep', slept.append)
+    return slept
+
+
+def test_delays_are_jittered_between_the_base_and_max_delay():
+    state = RetryPolicy(max_attempts=100, base_delay=1, max_delay=10, deadline=None).start()
+    delays = [state.next_delay() for _ in range(50)]
+
+    assert all(1 <= delay <= 10 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_attempts_are_limited():
+    state = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0).start()
+
+    assert state.next_delay() is not None
+    assert state.next_delay() is not None
+    assert state.next_delay() is None
+
+
+def test_retry_after_is_respected_unless_disabled():
+    assert RetryPolicy(base_delay=0, max_delay=0).start().next_delay(retry_after=7) == 7
+    assert RetryPolicy(base_delay=0, max_delay=0, respect_retry_after=False).start().next_delay(retry_after=7) == 0
+
+
+def test_retrying_past_the_deadline_gives_up():
+    state = RetryPolicy(base_delay=5, max_delay=5, deadline=4).start()
+
+    assert state.next_delay() is None
+
+
+def test_budget_limits_retries_across_requests():
+    policy = RetryPolicy(max_attempts=10, base_delay=0, max_delay=0, budget=RetryBudget(ratio=0, min_per_second=0.2, ttl=10))
+
+    assert [policy.start().next_delay() is not None for _ in range(3)] == [True, True, False]
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('3', 3.0),
+    ('-1', 0.0),
+    ('', None),
+    ('soon', None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_dates():
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+
+
+def test_failed_requests_are_retried(sleeps):
+    with MockAPIServer(error_rate=0.5, retry_after=2, seed=1) as server:
+        client = WindborneClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=20, base_delay=0, max_delay=0))
+        with contextlib.redirect_stdout(io.StringIO()):
+            missions = client.get_flying_missions()
+
+        assert server.errors_injected > 0
+
+    assert len(missions) > 0
+    assert sleeps == [2] * server.errors_injected
+
+
+def test_requests_give_up_after_max_attempts(sleeps):
+    with MockAPIServer(error_rate=1.0) as server:
+        client = WindborneClient(base_url=server.url, retry_policy=RetryPolicy(max_attempts=3, base_delay=0, max_delay=0))
+        with contextlib.redirect_stdout(io.StringIO()), pytest.raises(ConnectionError):
+            client.request(f"{server.url}/observations/v1/flying_missions.json")
+
+        assert server.requests_served == 3
@@ -0,0 +1,138 @@
+import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import windborne
+from windborne.api_request import make_api_request
+from windborne.mock_server import MockAPIServer
+from windborne.single_flight import SingleFlight, configure_request_coalescing
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+
+@pytest.fixture(autouse=True)
+def default_coalescing():
+    yield
+    configure_request_coalescing()
+
+
+def run_together(single_flight, key, func, callers):
+    # The first caller's call is held open until the others have joined it
+    release = threading.Event()
+    calls = [0]
+
+    def slow_func():
+        calls[0] += 1
+        release.wait(5)
+        return func()
+
+    with ThreadPoolExecutor(callers) as executor:
+        futures = [executor.submit(single_flight.do, key, slow_func) for _ in range(callers)]
+        while single_flight.coalesced < callers - 1:
+            time.sleep(0.001)
+        release.set()
+        return [future.result() for future in futures], calls[0]
+
+
+def test_concurrent_callers_share_one_call():
+    single_flight = SingleFlight()
+    results, calls = run_together(single_flight, 'key', lambda: {'value': 1}, callers=4)
+
+    assert calls == 1
+    assert single_flight.coalesced == 3
+    assert all(result is results[0] for result in results)
+
+
+def test_concurrent_callers_get_their_own_copies():
+    single_flight = SingleFlight(copy_result=copy.deepcopy)
+    results, calls = run_together(single_flight, 'key', lambda: {'missions': [{'id': 'a'}]}, callers=4)
+
+    assert calls == 1
+    assert len({id(result) for result in results}) == 4
+
+    results[0]['missions'].append({'id': 'b'})
+    results[1]['missions'][0]['name'] = 'W-1'
+    assert results[2] == {'missions': [{'id': 'a'}]}
+    assert results[3] == {'missions': [{'id': 'a'}]}
+
+
+def test_memoized_callers_get_their_own_copies():
+    single_flight = SingleFlight(memo_seconds=60, copy_result=copy.deepcopy)
+    calls = [0]
+
+    def func():
+        calls[0] += 1
+        return {'missions': []}
+
+    first = single_flight.do('key', func)
+    first['missions'].append('modified by the first caller')
+    second = single_flight.do('key', func)
+    second['missions'].append('modified by the second caller')
+
+    assert calls == [1]
+    assert single_flight.do('key', func) == {'missions': []}
+
+
+def test_results_are_not_copied_when_not_shared():
+    single_flight = SingleFlight(copy_result=lambda value: pytest.fail("copied a result nobody shared"))
+    value = {'value': 1}
+
+    assert single_flight.do('key', lambda: value) is value
+
+
+def test_errors_are_shared_and_not_memoized():
+    single_flight = SingleFlight(memo_seconds=60)
+
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        single_flight.do('key', fail)
+
+    assert single_flight.do('key', lambda: 'retried') == 'retried'
+
+
+def test_concurrent_requests_can_modify_their_responses():
+    with MockAPIServer(num_missions=100, latency=0.05) as server:
+        url = f"{server.url}/observations/v1/flying_missions.json"
+
+        def get_and_modify(_):
+            response = make_api_request(url, params={'page': 0, 'page_size': 64})
+            response['missions'] += [{'id': 'added'}]
+            return response
+
+        with ThreadPoolExecutor(5) as executor:
+            responses = list(executor.map(get_and_modify, range(5)))
+
+    assert [len(response['missions']) for response in responses] == [65] * 5
+
+
+def test_concurrent_async_flying_missions_are_independent():
+    aio = pytest.importorskip('windborne.aio')
+
+    async def get_flying_missions_concurrently():
+        try:
+            return await asyncio.gather(*[aio.get_flying_missions() for _ in range(5)])
+        finally:
+            await aio.close()
+
+    with MockAPIServer(num_missions=100):
+        results = asyncio.run(get_flying_missions_concurrently())
+
+    for missions in results:
+        assert len(missions) == 100
+        assert len({mission['id'] for mission in missions}) == 100
+        assert all(mission['name'].startswith('W-') for mission in missions)
+
+
+def test_coalescing_can_be_disabled():
+    assert configure_request_coalescing(enabled=False) is None
+    assert windborne.single_flight.get_request_coalescer() is None
@@ -0,0 +1,89 @@
+import io
+import json
+
+import pytest
+import requests
+
+import windborne
+from windborne.mock_server import MockAPIServer
+from windborne.streaming_json import StreamedPage, StreamingArrayParser
+
+PAGE = {
+    'before': {'nested': [1, {'a': '}]'}]},
+    'observations': [
+        {'id': 'a', 'mission_name': 'W-1', 'altitude': 1234.5},
+        {'id': 'b"}],', 'tags': ['[', ']', {'x': None}], 'escaped': 'back\\slash \\"quote\\"'},
+        {'id': 'c', 'unicode': 'Zürich ☁'},
+    ],
+    'has_next_page': True,
+    'next_since': 1704067200000000000,
+    'note': 'a, b: c',
+}
+
+
+def parse(body, chunk_size):
+    parser = StreamingArrayParser()
+    items = []
+    for start in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[start:start + chunk_size]))
+    return items, parser.close()
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 20])
+def test_items_and_fields_are_parsed_in_any_chunking(chunk_size, indent):
+    body = json.dumps(PAGE, indent=indent, ensure_ascii=False).encode('utf-8')
+    items, fields = parse(body, chunk_size)
+
+    assert items == PAGE['observations']
+    assert fields == {key: value for key, value in PAGE.items() if key != 'observations'}
+
+
+def test_empty_arrays():
+    assert parse(b'{"observations": [], "has_next_page": false}', 3) == ([], {'has_next_page': False})
+
+
+def test_items_are_returned_as_soon_as_they_are_complete():
+    parser = StreamingArrayParser()
+
+    assert parser.feed(b'{"observations": [{"id": "a"}, {"id": "b"}, {"id"') == [{'id': 'a'}, {'id': 'b'}]
+    assert parser.feed(b': "c"}], "has_next_page": false}') == [{'id': 'c'}]
+
+
+def test_truncated_bodies_raise():
+    parser = StreamingArrayParser()
+    parser.feed(b'{"observations": [{"id": "a"}, {"id"')
+
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_streamed_pages_can_only_be_iterated_once():
+    response = requests.Response()
+    response.raw = io.BytesIO(json.dumps(PAGE).encode('utf-8'))
+    page = StreamedPage(response, chunk_size=16)
+
+    with pytest.raises(RuntimeError):
+        page.has_next_page
+
+    assert list(page) == PAGE['observations']
+    assert page.has_next_page is True
+    assert page.next_since == PAGE['next_since']
+
+    with pytest.raises(RuntimeError):
+        list(page)
+
+
+def test_streamed_pages_match_parsed_ones(monkeypatch):
+    monkeypatch.setenv('WB_CLIENT_ID', 'test_client')
+    monkeypatch.setenv('WB_API_KEY', 'a' * 32)
+
+    with MockAPIServer(observations_per_hour=1000, num_missions=4):
+        page = windborne.get_observations_page(min_time='2024-01-01 00:00:00', max_time='2024-01-01 06:00:00')
+        streamed = windborne.get_observations_page(min_time='2024-01-01 00:00:00', max_time='2024-01-01 06:00:00', stream=True)
+        observations = list(streamed)
+
+    assert len(observations) > 0
+    assert observations == page['observations']
+    assert streamed.has_next_page == page['has_next_page']
+    assert streamed.next_since == page['next_since']
@@ -0,0 +1,51 @@
+import os
+import stat
+
+import pytest
+
+from windborne import utils
+from windborne.utils import atomic_write
+
+
+def test_atomic_writes_replace_the_file_only_once_complete(tmp_path):
+    path = str(tmp_path / 'output.json')
+    with atomic_write(path, 'w') as f:
+        f.write('first')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path, 'w') as f:
+            f.write('partial')
+            raise RuntimeError("interrupted")
+
+    assert open(path).read() == 'first'
+    assert os.listdir(tmp_path) == ['output.json']
+
+
+def test_new_files_get_the_usual_permissions(tmp_path):
+    path = str(tmp_path / 'output.json')
+    with atomic_write(path, 'w') as f:
+        f.write('{}')
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~utils._import_umask
+
+
+def test_replaced_files_keep_their_permissions(tmp_path):
+    path = str(tmp_path / 'output.json')
+    open(path, 'w').close()
+    os.chmod(path, 0o600)
+
+    with atomic_write(path, 'w') as f:
+        f.write('{}')
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_the_umask_is_read_without_changing_it(monkeypatch):
+    def fail(mask):
+        pytest.fail("changed the umask")
+
+    monkeypatch.setattr(utils.os, 'umask', fail)
+    if utils._read_umask() is None:
+        pytest.skip("the umask can only be read from /proc on Linux")
+
+    assert utils._default_file_mode() == 0o666 & ~utils._read_umask()
@@ -115,4 +115,66 @@ describe 'observations' do
     end
   end
 
+  it 'fetches observations to a directory with several workers' do
+    output_dir = 'spec_outputs/dec_2024_2h_buckets_workers'
+    single_worker_output_dir = 'spec_outputs/dec_2024_2h_buckets_single_worker'
+    FileUtils.rm_rf(output_dir) if File.exist?(output_dir)
+    FileUtils.rm_rf(single_worker_output_dir) if File.exist?(single_worker_output_dir)
+    run('observations', "2024-12-01_06:00", "2024-12-01_12:00", "json", "-d", single_worker_output_dir, '-b', '2')
+    run('observations', "2024-12-01_06:00", "2024-12-01_12:00", "json", "-d", output_dir, '-b', '2', '--workers', '3')
+
+    json_outputs = Dir.glob("#{output_dir}/*.json")
+    expect(json_outputs.size).to eq(70)
+    total_observations = json_outputs.map { |file| JSON.parse(File.read(file)).size }.sum
+    expect(total_observations).to eq(47014)
+
+    json_outputs.each do |file|
+      expect(File.read(file)).to eq(File.read("#{single_worker_output_dir}/#{File.basename(file)}"))
+    end
+  end
+
+  it 'fetches observations to a directory with a state file' do
+    output_dir = 'spec_outputs/dec_2024_state_file'
+    state_file = 'spec_outputs/dec_2024_state.json'
+    FileUtils.rm_rf(output_dir) if File.exist?(output_dir)
+    File.delete(state_file) if File.exist?(state_file)
+    run('observations', "2024-12-01_06:00", "2024-12-01_07:00", "json", "-d", output_dir, '--state-file', state_file)
+
+    json_outputs = Dir.glob("#{output_dir}/*.json")
+    expect(json_outputs.size).to eq(24)
+    total_observations = json_outputs.map { |file| JSON.parse(File.read(file)).size }.sum
+    expect(total_observations).to eq(7950)
+
+    # A complete run leaves nothing to resume from
+    expect(File.exist?(state_file)).to be false
+    expect(File.exist?("#{state_file}.spool")).to be false
+  end
+
+  it 'fetches observations to a compact json file' do
+    output_path = 'spec_outputs/observations_dec_2024_compact.json'
+    File.delete(output_path) if File.exist?(output_path)
+    run('--compact-json', 'observations', "2024-12-01_06:00", "2024-12-01_07:00", output_path)
+
+    contents = File.read(output_path)
+    expect(contents.strip).not_to include("\n")
+    observations = JSON.parse(contents)
+    expect(observations.size).to eq(7950)
+  end
+
+  it 'profiles fetching observations' do
+    output_path = 'spec_outputs/observations_dec_2024_profiled.json'
+    profile_output = 'spec_outputs/observations_profile'
+    File.delete(output_path) if File.exist?(output_path)
+    FileUtils.rm_f(["#{profile_output}.pstats", "#{profile_output}.collapsed"])
+    output = run('--profile', '--profile-output', profile_output, 'observations', "2024-12-01_06:00", "2024-12-01_07:00", output_path)
+
+    observations = JSON.parse(File.read(output_path))
+    expect(observations.size).to eq(7950)
+
+    expect(output).to include('Stage')
+    expect(output).to match(/^total\s+\d+\.\d{3}$/)
+    expect(File.exist?("#{profile_output}.pstats")).to be true
+    expect(File.exist?("#{profile_output}.collapsed")).to be true
+  end
+
 end
@@ -1,58 +1,115 @@
-# Import key functions and classes for easier access when users import the package
-
-# Import API request helpers
-from .api_request import API_BASE_URL, make_api_request
-
-# Import Observations API functions
-from .observations_api import (
-    get_observations_page,
-    get_observations,
-
-    get_super_observations_page,
-    get_super_observations,
-
-    poll_super_observations,
-    poll_observations,
-
-    get_flying_missions,
-    get_mission_launch_site,
-    get_predicted_path,
-    get_current_location,
-    get_flight_path,
-    get_constellation_status,
-    get_soundings,
-    get_sounding,
-
-    get_recent_asos_observations
-)
-
-# Import Forecasts API functions
-from .forecasts_api import (
-    get_point_forecasts,
-    get_point_forecasts_interpolated,
-    get_initialization_times,
-    get_archived_initialization_times,
-    get_run_information,
-    get_variables,
-
-    get_available_stations,
-    get_station_forecast,
-    get_interpolated_sounding,
-
-    get_gridded_forecast,
-    get_full_gridded_forecast,
-
-    get_tropical_cyclones,
-
-    get_population_weighted_hdds,
-    get_population_weighted_cdds,
-    get_calculation_times_degree_days,
-
-    get_analysis_available_times,
-    get_analysis_variables,
-    get_interpolated_analysis,
-    get_gridded_analysis
-)
+# Key functions and classes are available from the package itself for easier access.
+# They're imported on first access (see __getattr__) rather than here, so that `import windborne`
+# and CLI calls that don't need them skip loading requests, jwt and the API modules
+import importlib
+
+# Public names, by the module they're defined in
+_LAZY_IMPORTS = {
+    # API request helpers and clients
+    'api_request': ('API_BASE_URL', 'make_api_request', 'configure_session', 'get_session', 'configure_token_cache', 'configure_conditional_requests', 'configure_api_base_url',
+                    'WindborneClient', 'get_default_client'),
+
+    # Batch helpers for running many calls concurrently
+    'batch': ('run_batch', 'iter_batch', 'BatchResult'),
+
+    # Retry policy configuration
+    'retry': ('configure_retry_policy', 'RetryPolicy', 'RetryBudget'),
+
+    # Client-side rate limiting
+    'rate_limit': ('configure_rate_limits', 'RateLimiter', 'TokenBucket', 'FileTokenBucket'),
+
+    # Request coalescing configuration
+    'single_flight': ('configure_request_coalescing',),
+
+    # JSON output configuration
+    'json_backend': ('configure_json_output', 'JSON_BACKEND'),
+
+    # The opt-in on-disk response cache
+    'response_cache': ('configure_response_cache', 'get_cache_stats', 'ResponseCache', 'IMMUTABLE'),
+
+    # Response recording and replay
+    'cassette': ('configure_cassette', 'Cassette', 'CassetteMissError'),
+
+    # Request lifecycle hooks and metrics
+    'hooks': ('register_hook', 'unregister_hook', 'clear_hooks', 'RequestEvent'),
+    'metrics': ('enable_metrics', 'disable_metrics', 'get_metrics_registry', 'get_metrics_text', 'start_metrics_server', 'MetricsRegistry'),
+
+    # Tracing
+    'tracing': ('configure_tracing', 'span', 'add_span_listener', 'remove_span_listener'),
+
+    # Observations API functions
+    'observations_api': (
+        'get_observations_page',
+        'get_observations',
+
+        'get_super_observations_page',
+        'get_super_observations',
+
+        'poll_super_observations',
+        'poll_observations',
+
+        'iter_observations',
+        'iter_super_observations',
+
+        'get_flying_missions',
+        'get_mission_launch_site',
+        'get_predicted_path',
+        'get_current_location',
+        'get_flight_path',
+        'get_constellation_status',
+        'get_soundings',
+        'get_sounding',
+
+        'get_recent_asos_observations',
+    ),
+
+    # Forecasts API functions
+    'forecasts_api': (
+        'get_point_forecasts',
+        'get_point_forecasts_interpolated',
+        'get_initialization_times',
+        'get_archived_initialization_times',
+        'get_run_information',
+        'get_variables',
+
+        'get_available_stations',
+        'get_station_forecast',
+        'get_interpolated_sounding',
+
+        'get_gridded_forecast',
+        'get_full_gridded_forecast',
+
+        'get_tropical_cyclones',
+
+        'get_population_weighted_hdds',
+        'get_population_weighted_cdds',
+        'get_calculation_times_degree_days',
+
+        'get_analysis_available_times',
+        'get_analysis_variables',
+        'get_interpolated_analysis',
+        'get_gridded_analysis',
+    ),
+}
+
+_ATTRIBUTE_MODULES = {name: module for module, names in _LAZY_IMPORTS.items() for name in names}
+
+
+def __getattr__(name):
+    module = _ATTRIBUTE_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+
+    # Later accesses find it directly, without coming back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 # Define what should be available when users import *
 __all__ = [
@@ -65,6 +122,9 @@ __all__ = [
     "poll_super_observations",
     "poll_observations",
 
+    "iter_observations",
+    "iter_super_observations",
+
     "get_flying_missions",
     "get_mission_launch_site",
     "get_predicted_path",
@@ -104,4 +164,63 @@ __all__ = [
     # API helpers
     "API_BASE_URL",
     "make_api_request",
+    "configure_session",
+    "get_session",
+    "configure_token_cache",
+    "configure_conditional_requests",
+    "configure_api_base_url",
+    "WindborneClient",
+    "get_default_client",
+
+    # Batch helpers
+    "run_batch",
+    "iter_batch",
+    "BatchResult",
+
+    # Retry policy
+    "configure_retry_policy",
+    "RetryPolicy",
+    "RetryBudget",
+
+    # Rate limiting
+    "configure_rate_limits",
+    "RateLimiter",
+    "TokenBucket",
+    "FileTokenBucket",
+
+    # Request coalescing
+    "configure_request_coalescing",
+
+    # JSON output
+    "configure_json_output",
+    "JSON_BACKEND",
+
+    # Response cache
+    "configure_response_cache",
+    "get_cache_stats",
+    "ResponseCache",
+    "IMMUTABLE",
+
+    # Record and replay
+    "configure_cassette",
+    "Cassette",
+    "CassetteMissError",
+
+    # Hooks and metrics
+    "register_hook",
+    "unregister_hook",
+    "clear_hooks",
+    "RequestEvent",
+    "enable_metrics",
+    "disable_metrics",
+    "get_metrics_registry",
+    "get_metrics_text",
+    "start_metrics_server",
+    "MetricsRegistry",
+
+    # Tracing
+    "configure_tracing",
+    "span",
+    "add_span_listener",
+    "remove_span_listener",
 ]
\ No newline at end of file
@@ -0,0 +1,1186 @@
+"""
+Asyncio equivalents of the windborne API functions.
+
+Every request made through this module shares a single aiohttp session (and therefore a single connection pool),
+so hundreds of concurrent calls can run on one event loop:
+
+    import asyncio
+    from windborne import aio
+
+    async def main():
+        forecasts = await asyncio.gather(*(aio.get_station_forecast(station) for station in ['KJFK', 'PANC']))
+        await aio.close()
+
+    asyncio.run(main())
+
+Requests follow the same retry policy, rate limits and hooks as the synchronous functions, but some features are sync only:
+    - the response cache (see windborne.configure_response_cache) and conditional requests aren't used, so every call
+      downloads its response again
+    - gridded downloads aren't resumed with byte ranges; if the connection drops, the file is downloaded again from the start,
+      in a single request (there is no download_segments option)
+"""
+import asyncio
+import copy
+import functools
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    raise ImportError("Please install the aiohttp library to use windborne.aio, eg 'python3 -m pip install aiohttp'.")
+
+from .api_request import (
+    get_current_client,
+    get_signed_token,
+    invalidate_signed_token,
+    print_forbidden_error,
+    print_not_found_error,
+    _request_key,
+    API_BASE_URL
+)
+from .observations_api import (
+    DATA_API_BASE_URL,
+    OBSERVATIONS_CSV_HEADERS,
+    SUPER_OBSERVATIONS_CSV_HEADERS,
+    ObservationSpool,
+    ObservationUpserter,
+    build_observations_params,
+    save_observations_batch,
+    verify_observations_output_format
+)
+from .forecasts_api import (
+    FORECASTS_API_BASE_URL,
+    TCS_SUPPORTED_FORMATS,
+    _build_gridded_forecast_params,
+    _build_point_forecast_params,
+    _default_gridded_forecast_extension,
+    _format_point_forecast_coordinates,
+    print_tc_supported_formats,
+    save_degree_days_csv
+)
+from .utils import to_unix_timestamp, parse_time, save_arbitrary_response, print_table, atomic_write
+from .track_formatting import save_track
+from .retry import parse_retry_after
+from .single_flight import get_request_coalescer
+from .json_backend import loads
+from .hooks import emit
+
+# Maximum number of simultaneous connections in the shared pool (0 means no limit)
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 0
+
+# Size of the chunks gridded files are written to disk in
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+# ------------
+# HTTP SESSION
+# ------------
+
+_session = None
+_session_is_owned = False
+_session_loop = None
+_session_settings = {
+    'limit': DEFAULT_CONNECTION_LIMIT,
+    'limit_per_host': DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    'keep_alive': True,
+}
+
+
+def configure_session(session=None, limit=DEFAULT_CONNECTION_LIMIT, limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST, keep_alive=True):
+    """
+    Configure the aiohttp session shared by every request in this module.
+    If no session is passed in, one is created with the given pool settings the next time a request is made.
+
+    Args:
+        session (aiohttp.ClientSession): Optional session to use for all requests.
+        limit (int): Maximum number of simultaneous connections (ignored if session is provided).
+        limit_per_host (int): Maximum number of simultaneous connections per host; 0 means no limit (ignored if session is provided).
+        keep_alive (bool): Whether to reuse connections between requests (ignored if session is provided).
+    """
+    global _session, _session_is_owned, _session_loop
+
+    _session_settings['limit'] = limit
+    _session_settings['limit_per_host'] = limit_per_host
+    _session_settings['keep_alive'] = keep_alive
+
+    _session = session
+    _session_is_owned = False
+    _session_loop = None
+
+
+async def get_session():
+    """
+    Get the shared aiohttp session, creating it on first use.
+    A new session is created if the previous one was closed or belongs to a different event loop.
+    """
+    global _session, _session_is_owned, _session_loop
+
+    loop = asyncio.get_event_loop()
+
+    if _session is not None and not _session.closed and (_session_loop is None or _session_loop is loop):
+        return _session
+
+    if _session is not None and not _session_is_owned and not _session.closed:
+        # A caller-provided session is always used as is
+        return _session
+
+    connector = aiohttp.TCPConnector(
+        limit=_session_settings['limit'],
+        limit_per_host=_session_settings['limit_per_host'],
+        force_close=not _session_settings['keep_alive']
+    )
+    # aiohttp limits whole requests to 5 minutes by default, which would cut off large downloads; requests set their own timeouts instead
+    _session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None))
+    _session_is_owned = True
+    _session_loop = loop
+
+    return _session
+
+
+async def close():
+    """
+    Close the shared session and its connections. Call this before your event loop shuts down.
+    """
+    global _session, _session_is_owned, _session_loop
+
+    if _session is not None and _session_is_owned and not _session.closed:
+        await _session.close()
+
+    _session = None
+    _session_is_owned = False
+    _session_loop = None
+
+
+# ------------
+# REQUESTS
+# ------------
+
+def _prepare_params(params):
+    # aiohttp only accepts str, int and float query values, so serialize everything else the way requests does
+    if not params:
+        return None
+
+    prepared = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            value = str(value)
+        prepared[key] = value
+
+    return prepared
+
+
+# In-flight JSON requests by (event loop, request key), as [task, number of callers sharing it], shared by identical concurrent calls
+_inflight_requests = {}
+
+
+def _client_timeout(timeout):
+    # Same meaning as the timeout of the sync client: seconds to connect and between bytes received, never for the whole download
+    if timeout is None:
+        return None
+
+    if isinstance(timeout, tuple):
+        connect_timeout, read_timeout = timeout
+    else:
+        connect_timeout, read_timeout = timeout, timeout
+
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=read_timeout)
+
+
+async def _make_request(url, params, read_response, retry_counter=0, retry_policy=None):
+    # Credentials, base URL, rate limiter, retry policy and hooks come from the current WindborneClient; connections from the aiohttp session
+    client = get_current_client()
+    if retry_policy is None:
+        retry_policy = client.retry_policy
+
+    if retry_counter >= retry_policy.max_attempts:
+        raise ConnectionError("Max retries to API reached.")
+
+    url = client.resolve_url(url)
+    client_id, api_key = client.get_credentials()
+    request_kwargs = {}
+    timeout = _client_timeout(client.timeout)
+    if timeout is not None:
+        request_kwargs['timeout'] = timeout
+    retry_state = retry_policy.start(attempts=retry_counter)
+    attempt = retry_counter
+
+    while True:
+        attempt += 1
+        signed_token = get_signed_token(client_id, api_key)
+        session = await get_session()
+        retry_after = None
+        status = None
+
+        rate_limiter = client.rate_limiter
+        if rate_limiter is not None:
+            delay = rate_limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        emit('before_request', url, client.hooks, params=params, attempt=attempt)
+        started_at = time.perf_counter()
+
+        try:
+            async with session.get(url, auth=aiohttp.BasicAuth(client_id, signed_token), params=_prepare_params(params), **request_kwargs) as response:
+                status = response.status
+                emit('after_response', url, client.hooks, params=params, attempt=attempt, status_code=status, bytes=response.content_length,
+                     elapsed=time.perf_counter() - started_at)
+
+                if response.status == 403:
+                    # Don't keep reusing a token the server rejected
+                    invalidate_signed_token(client_id, api_key)
+                    emit('on_error', url, client.hooks, params=params, attempt=attempt, status_code=status, elapsed=time.perf_counter() - started_at, error='403 Forbidden')
+                    print_forbidden_error()
+                    return None
+                elif response.status in [404, 400]:
+                    emit('on_error', url, client.hooks, params=params, attempt=attempt, status_code=status, elapsed=time.perf_counter() - started_at, error=f"{status} {response.reason}")
+                    print_not_found_error(url, params, response.status, await response.text())
+                    return None
+                elif not retry_policy.is_retryable_status(response.status):
+                    try:
+                        response.raise_for_status()
+                    except aiohttp.ClientResponseError as error:
+                        emit('on_error', url, client.hooks, params=params, attempt=attempt, status_code=status, elapsed=time.perf_counter() - started_at, error=error)
+                        raise
+                    return await read_response(response)
+
+                underlying_error = f"{response.status} {response.reason}"
+                error = underlying_error
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as conn_err:
+            underlying_error = f"\n\n{conn_err}"
+            error = conn_err
+
+        elapsed = time.perf_counter() - started_at
+        delay = retry_state.next_delay(retry_after=retry_after)
+        if delay is None:
+            emit('on_error', url, client.hooks, params=params, attempt=attempt, status_code=status, elapsed=elapsed, error=error)
+            raise ConnectionError("Max retries to API reached.")
+
+        emit('on_retry', url, client.hooks, params=params, attempt=attempt, status_code=status, elapsed=elapsed, delay=delay, error=error)
+        print(f"Temporary connection failure; sleeping for {delay:.1f}s before retrying")
+        print(f"Underlying error: {underlying_error}")
+        await asyncio.sleep(delay)
+
+
+async def _read_json(response):
+    body = await response.read()
+    try:
+        return loads(body)
+    except ValueError:
+        return await response.json(content_type=None)
+
+
+async def _read_bytes(response):
+    return await response.read()
+
+
+async def make_api_request(url, params=None, as_json=True, retry_counter=0, retry_policy=None):
+    """
+    Make an authenticated request to the WindBorne API using the shared aiohttp session.
+    Same authentication, error reporting and retry behavior as windborne.make_api_request.
+
+    Args:
+        url (str): The URL to make the request to
+        params (dict): The parameters to pass to the request
+        as_json (bool): Whether to return the response parsed as JSON or as raw bytes
+        retry_counter (int): The number of times the request has been retried
+        retry_policy (RetryPolicy): The policy to use instead of the configured one (see windborne.configure_retry_policy)
+
+    Returns:
+        dict | list | bytes | None: The response, or None if the server couldn't find the resource or rejected the request
+    """
+    if not as_json:
+        return await _make_request(url, params, _read_bytes, retry_counter=retry_counter, retry_policy=retry_policy)
+
+    if get_request_coalescer() is None:
+        return await _make_request(url, params, _read_json, retry_counter=retry_counter, retry_policy=retry_policy)
+
+    # Identical concurrent requests on this event loop share one task (see windborne.configure_request_coalescing)
+    client = get_current_client()
+    client_id, _ = client.get_credentials()
+    key = (asyncio.get_event_loop(), _request_key(client_id, client.resolve_url(url), params))
+
+    async def request_once():
+        try:
+            return await _make_request(url, params, _read_json, retry_counter=retry_counter, retry_policy=retry_policy)
+        finally:
+            # Removed before the task finishes, so nobody can join once its callers start using the result
+            _inflight_requests.pop(key, None)
+
+    inflight = _inflight_requests.get(key)
+    if inflight is None:
+        inflight = _inflight_requests[key] = [asyncio.ensure_future(request_once()), 1]
+    else:
+        inflight[1] += 1
+    task = inflight[0]
+
+    # Shielded, so one caller being cancelled doesn't cancel the request for everyone else waiting on it
+    value = await asyncio.shield(task)
+
+    # Like the sync path, each caller of a shared request gets its own copy, so none of them can modify what another got
+    if inflight[1] > 1:
+        return copy.deepcopy(value)
+    return value
+
+
+async def download_and_save_output(output_file, url, params=None, silent=False, default_extension='.nc', chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE):
+    """
+    Downloads a forecast output file from the API and streams it to disk chunk by chunk.
+    The file is written under a temporary name and moved into place once complete.
+
+    Args:
+        output_file (str): Path where to save the output file
+        url (str): API URL that returns (or redirects to) the file
+        params (dict): The parameters to pass to the request
+        silent (bool): Whether to suppress output
+        default_extension (str): Extension to add when output_file has no extension
+        chunk_size (int): Number of bytes to read and write at a time
+
+    Returns:
+        str | None: The path the file was saved to, or None if the request failed
+    """
+    # Add default extension if no extension is present
+    if '.' not in output_file.split('/')[-1]:
+        output_file = output_file + default_extension
+
+    async def write_response(response):
+        with atomic_write(output_file, 'wb') as f:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                f.write(chunk)
+        return output_file
+
+    saved_file = await _make_request(url, params, write_response)
+
+    if saved_file is not None and not silent:
+        print(f"Data Successfully saved to {output_file}")
+
+    return saved_file
+
+
+async def _run_blocking(func, *args, **kwargs):
+    # Run file formatting and writing in the default executor so it doesn't stall the event loop
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+# ------------
+# OBSERVATIONS
+# ------------
+
+async def get_observations_page(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=True, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None):
+    """
+    Async version of windborne.get_observations_page.
+    """
+    params = build_observations_params(since=since, min_time=min_time, max_time=max_time, include_ids=include_ids, include_mission_name=include_mission_name, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/observations.json", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='observations')
+
+    return response
+
+
+async def get_super_observations_page(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None):
+    """
+    Async version of windborne.get_super_observations_page.
+    """
+    params = build_observations_params(since=since, min_time=min_time, max_time=max_time, include_ids=include_ids, include_mission_name=include_mission_name, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/super_observations.json", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='observations')
+
+    return response
+
+
+async def iterate_through_observations(get_page, args, exit_at_end=True, poll_interval=60):
+    """
+    Async generator that repeatedly awaits `get_page` with `args`, following the `next_since` cursor, and yields each page response.
+
+    Args:
+        get_page (coroutine function): Function to fetch a page of observations, eg aio.get_observations_page
+        args (dict): Arguments to pass to `get_page`
+        exit_at_end (bool): Whether to stop after fetching all observations or keep polling
+        poll_interval (float): Seconds to wait before polling again once there are no more pages
+    """
+    since = args.get('since', 0)
+
+    if args.get('min_time') is not None:
+        args['min_time'] = to_unix_timestamp(args['min_time'])
+        if since == 0:
+            since = args['min_time']
+
+    if args.get('max_time') is not None:
+        args['max_time'] = to_unix_timestamp(args['max_time'])
+
+    while True:
+        args = {**args, 'since': since}
+        response = await get_page(**args)
+        if not response:
+            print("Received null response from API. Retrying in 10 seconds...")
+            await asyncio.sleep(10)
+            continue
+
+        yield response
+
+        if not response['has_next_page']:
+            if exit_at_end:
+                break
+
+            await asyncio.sleep(poll_interval)
+            continue
+
+        since = response['next_since']
+
+
+def _observations_api_args(start_time, end_time=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None):
+    return {
+        'min_time': start_time,
+        'max_time': end_time,
+        'min_latitude': min_latitude,
+        'max_latitude': max_latitude,
+        'min_longitude': min_longitude,
+        'max_longitude': max_longitude,
+        'include_updated_at': include_updated_at,
+        'mission_id': mission_id,
+        'include_ids': True,
+        'include_mission_name': True
+    }
+
+
+async def iter_observations(start_time, end_time=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, pages=False, exit_at_end=True):
+    """
+    Async generator yielding observations between a start time and an optional end time.
+
+    Args:
+        start_time (str): Starting time of the range to fetch
+        end_time (str): Optional end time of the range to fetch
+        include_updated_at (bool): Include update timestamps in response.
+        mission_id (str): Filter observations by mission ID.
+        min_latitude (float): Minimum latitude boundary.
+        max_latitude (float): Maximum latitude boundary.
+        min_longitude (float): Minimum longitude boundary.
+        max_longitude (float): Maximum longitude boundary.
+        pages (bool): Yield the list of observations on each page instead of individual observations.
+        exit_at_end (bool): Whether to stop after fetching all observations or keep polling.
+    """
+    api_args = _observations_api_args(start_time, end_time=end_time, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    async for response in iterate_through_observations(get_observations_page, api_args, exit_at_end=exit_at_end):
+        observations = response.get('observations', [])
+        if pages:
+            yield observations
+        else:
+            for observation in observations:
+                yield observation
+
+
+async def iter_super_observations(start_time, end_time=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, include_updated_at=True, pages=False, exit_at_end=True):
+    """
+    Async generator yielding super observations between a start time and an optional end time.
+    Takes the same arguments as iter_observations.
+    """
+    api_args = _observations_api_args(start_time, end_time=end_time, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    async for response in iterate_through_observations(get_super_observations_page, api_args, exit_at_end=exit_at_end):
+        observations = response.get('observations', [])
+        if pages:
+            yield observations
+        else:
+            for observation in observations:
+                yield observation
+
+
+async def _get_observations_core(api_args, csv_headers, get_page, start_time=None, end_time=None, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True):
+    if output_format and not custom_save:
+        verify_observations_output_format(output_format)
+
+    if output_file and not custom_save:
+        verify_observations_output_format(output_file.split('.')[-1])
+
+    # Same saving as observations_api.get_observations_core: when we'll stop at the end, observations are spooled to disk
+    # and each file is written once at the end; when polling, each batch is saved as it comes, updating bucket files in place
+    prevent_overwrites = not exit_at_end
+    batch_size = 10_000
+
+    if start_time is not None:
+        start_time = to_unix_timestamp(start_time)
+
+    if end_time is not None:
+        end_time = to_unix_timestamp(end_time)
+
+    def save(observations_batch, prevent_overwrites=prevent_overwrites):
+        save_observations_batch(
+            observations_batch,
+            output_file=output_file,
+            output_format=output_format,
+            output_dir=output_dir,
+            start_time=start_time,
+            end_time=end_time,
+            bucket_hours=bucket_hours,
+            csv_headers=csv_headers,
+            custom_save=custom_save,
+            prevent_overwrites=prevent_overwrites,
+            verbose=verbose
+        )
+
+    def save_in_place(observations_batch):
+        save(observations_batch, prevent_overwrites=False)
+
+    spool = None
+    upserter = None
+    if exit_at_end:
+        spool = ObservationSpool(bucket_hours=None if output_file else bucket_hours)
+    elif not output_file:
+        upserter = ObservationUpserter(save_in_place, save, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir)
+
+    if spool is not None:
+        save_batch = spool.add
+    elif upserter is not None:
+        save_batch = upserter.add
+    else:
+        save_batch = save
+    batched_observations = []
+    processed_count = 0
+
+    try:
+        async for response in iterate_through_observations(get_page, api_args, exit_at_end=exit_at_end):
+            observations = response.get('observations', [])
+
+            if callback:
+                callback(response)
+            elif verbose:
+                print(f"Fetched page with {len(observations)} observation(s)")
+
+            batched_observations.extend(observations)
+            processed_count += len(observations)
+
+            if len(batched_observations) >= batch_size or not response['has_next_page']:
+                await _run_blocking(save_batch, batched_observations)
+                batched_observations = []
+
+        if spool is not None:
+            await _run_blocking(spool.save, save)
+    finally:
+        if spool is not None:
+            spool.close()
+        if upserter is not None:
+            upserter.close()
+
+    print(f"Processed {processed_count} observations")
+    return processed_count
+
+
+async def get_observations(start_time, end_time=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True):
+    """
+    Async version of windborne.get_observations.
+    Pages are fetched on the event loop; formatting and writing files runs in the default executor.
+    """
+    api_args = _observations_api_args(start_time, end_time=end_time, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    return await _get_observations_core(api_args, OBSERVATIONS_CSV_HEADERS, get_page=get_observations_page, start_time=start_time, end_time=end_time, output_file=output_file, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, callback=callback, custom_save=custom_save, exit_at_end=exit_at_end, verbose=verbose)
+
+
+async def poll_observations(**kwargs):
+    """
+    Async version of windborne.poll_observations. Runs until cancelled.
+    """
+    return await get_observations(**kwargs, exit_at_end=False)
+
+
+async def get_super_observations(start_time, end_time=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, include_updated_at=True, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True):
+    """
+    Async version of windborne.get_super_observations.
+    Pages are fetched on the event loop; formatting and writing files runs in the default executor.
+    """
+    api_args = _observations_api_args(start_time, end_time=end_time, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    return await _get_observations_core(api_args, SUPER_OBSERVATIONS_CSV_HEADERS, get_page=get_super_observations_page, start_time=start_time, end_time=end_time, output_file=output_file, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, callback=callback, custom_save=custom_save, exit_at_end=exit_at_end, verbose=verbose)
+
+
+async def poll_super_observations(**kwargs):
+    """
+    Async version of windborne.poll_super_observations. Runs until cancelled.
+    """
+    return await get_super_observations(**kwargs, exit_at_end=False)
+
+
+# ------------
+# METADATA
+# ------------
+
+async def _get_all_mission_pages(url):
+    page_size = 64
+    query_params = {
+        'page': 0,
+        'page_size': page_size
+    }
+
+    first_response = await make_api_request(url, params=query_params)
+    if not first_response:
+        return first_response, []
+
+    # Coalesced requests share their response between callers, so it's copied rather than added to
+    missions = list(first_response.get('missions', []))
+    num_fetched_missions = len(missions)
+
+    while num_fetched_missions == page_size:
+        query_params = {**query_params, 'page': query_params['page'] + 1}
+
+        page_response = await make_api_request(url, params=query_params)
+        if not page_response:
+            break
+
+        new_missions = page_response.get('missions', [])
+        num_fetched_missions = len(new_missions)
+
+        missions = missions + new_missions
+
+    return first_response, missions
+
+
+async def get_flying_missions(output_file=None):
+    """
+    Async version of windborne.get_flying_missions.
+    """
+    flying_missions_response, flying_missions = await _get_all_mission_pages(f"{DATA_API_BASE_URL}/flying_missions.json")
+
+    flying_missions = [{**mission, 'name': f"W-{mission['number']}"} if mission.get('number') else mission for mission in flying_missions]
+
+    if output_file:
+        save_arbitrary_response(output_file, flying_missions_response, csv_data_key='missions')
+
+    return flying_missions
+
+
+async def get_constellation_status(output_file=None):
+    """
+    Async version of windborne.get_constellation_status.
+    """
+    _, missions = await _get_all_mission_pages(f"{DATA_API_BASE_URL}/constellation_status.json")
+
+    if output_file:
+        save_arbitrary_response(output_file, {'missions': missions}, csv_data_key='missions')
+
+    return missions
+
+
+async def get_mission_launch_site(mission_id=None, output_file=None):
+    """
+    Async version of windborne.get_mission_launch_site.
+    """
+    if not mission_id:
+        print("Must provide mission ID")
+        return
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/missions/{mission_id}/launch_site.json")
+    if response is None:
+        return None
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='launch_site')
+
+    return response.get('launch_site')
+
+
+async def get_flying_mission(mission_id, verify_flying=True):
+    """
+    Async version of observations_api.get_flying_mission.
+    """
+    if not verify_flying and not mission_id.startswith('W-'):
+        return {
+            'id': mission_id,
+        }
+
+    flying_missions = await get_flying_missions()
+
+    for candidate in flying_missions:
+        if candidate.get('id') == mission_id or candidate.get('name') == mission_id:
+            return candidate
+
+    print(f"Provided mission ID '{mission_id}' does not belong to a mission that is currently flying.")
+
+    if flying_missions:
+        print("\nCurrently flying missions:\n")
+        print_table(flying_missions, keys=['id', 'name'], headers=['Mission ID', 'Mission Name'])
+    else:
+        print("No missions are currently flying.")
+
+    return None
+
+
+async def get_predicted_path(mission_id=None, output_file=None):
+    """
+    Async version of windborne.get_predicted_path.
+    """
+    if not mission_id:
+        print("To get the predicted flight path for a given mission you must provide a mission ID.")
+        return
+
+    mission = await get_flying_mission(mission_id)
+    if mission is None:
+        return
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/missions/{mission.get('id')}/predicted_path.json")
+    if response is None:
+        return
+
+    prediction = response.get('prediction') if isinstance(response, dict) else None
+
+    if output_file:
+        name = mission.get('name', mission_id)
+        save_track(output_file, {name: (prediction or [])}, time_key='time')
+
+    return prediction
+
+
+async def get_current_location(mission_id=None, output_file=None, verify_flying=True):
+    """
+    Async version of windborne.get_current_location.
+    """
+    if not mission_id:
+        print("To get the current location for a given mission you must provide a mission ID.")
+        return
+
+    mission = await get_flying_mission(mission_id, verify_flying=verify_flying)
+    if mission is None:
+        return
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/missions/{mission.get('id')}/current_location.json")
+    if response is None:
+        return
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key=None)
+
+    return response
+
+
+async def get_flight_path(mission_id=None, output_file=None):
+    """
+    Async version of windborne.get_flight_path.
+    """
+    if not mission_id:
+        print("A mission id is required to get a flight path")
+        return
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/missions/{mission_id}/flight_path.json")
+    if response is None:
+        return
+
+    if output_file:
+        save_track(output_file, {mission_id: response['flight_data']}, time_key='transmit_time')
+
+    return response.get('flight_data')
+
+
+async def get_soundings(mission_id=None, min_time=None, max_time=None, min_altitude=None, max_altitude=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, page=None, page_size=None, output_file=None):
+    """
+    Async version of windborne.get_soundings.
+    """
+    params = {
+        "mission_id": mission_id,
+        "min_time": to_unix_timestamp(min_time) if min_time else None,
+        "max_time": to_unix_timestamp(max_time) if max_time else None,
+        "min_altitude": min_altitude,
+        "max_altitude": max_altitude,
+        "min_latitude": min_latitude,
+        "max_latitude": max_latitude,
+        "min_longitude": min_longitude,
+        "max_longitude": max_longitude,
+        "page": page,
+        "page_size": page_size,
+    }
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/soundings", params=params)
+    if response is None:
+        return []
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='soundings')
+
+    return response.get('soundings', [])
+
+
+async def get_sounding(sounding_id, output_file=None):
+    """
+    Async version of windborne.get_sounding.
+    """
+    if not sounding_id:
+        print("Must provide a sounding ID.")
+        return {}
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/soundings/{sounding_id}")
+    if response is None:
+        return {}
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='data')
+
+    return response
+
+
+async def get_recent_asos_observations(station, hours=None, since=None, output_file=None):
+    """
+    Async version of windborne.get_recent_asos_observations.
+    """
+    if not station:
+        print("Must provide a station.")
+        return {}
+
+    params = {"station": station, "hours": hours, "since": since or None}
+
+    response = await make_api_request(f"{DATA_API_BASE_URL}/asos/recent", params=params)
+    if response is None:
+        return {}
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='observations')
+
+    return response
+
+
+# ------------
+# FORECASTS
+# ------------
+
+async def get_point_forecasts(coordinates=None, min_forecast_time=None, max_forecast_time=None, min_forecast_hour=None, max_forecast_hour=None, initialization_time=None, output_file=None, model='wm', stations=None):
+    """
+    Async version of windborne.get_point_forecasts.
+    """
+    params = _build_point_forecast_params(coordinates=coordinates, stations=stations, min_forecast_time=min_forecast_time, max_forecast_time=max_forecast_time, min_forecast_hour=min_forecast_hour, max_forecast_hour=max_forecast_hour, initialization_time=initialization_time)
+    if params is None:
+        return
+
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/point_forecast", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='forecasts')
+
+    return response
+
+
+async def get_point_forecasts_interpolated(coordinates, min_forecast_time=None, max_forecast_time=None, min_forecast_hour=None, max_forecast_hour=None, initialization_time=None, ens_member=None, variable=None, include_distribution=False, level=None, output_file=None, model='wm'):
+    """
+    Async version of windborne.get_point_forecasts_interpolated.
+    """
+    formatted_coordinates = _format_point_forecast_coordinates(coordinates)
+    if not formatted_coordinates:
+        print("To get interpolated points forecasts you must provide coordinates.")
+        return
+
+    params = {"coordinates": formatted_coordinates}
+
+    if min_forecast_time:
+        params["min_forecast_time"] = parse_time(min_forecast_time)
+    if max_forecast_time:
+        params["max_forecast_time"] = parse_time(max_forecast_time)
+    if min_forecast_hour:
+        params["min_forecast_hour"] = int(min_forecast_hour)
+    if max_forecast_hour:
+        params["max_forecast_hour"] = int(max_forecast_hour)
+    if initialization_time:
+        params["initialization_time"] = parse_time(initialization_time, init_time_flag=True)
+    if ens_member is not None:
+        params["ens_member"] = ens_member
+    if variable:
+        params["variable"] = variable
+    if include_distribution:
+        params["include_distribution"] = True
+    if level is not None:
+        params["level"] = int(level)
+
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/point_forecast/interpolated", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='forecasts')
+
+    return response
+
+
+async def get_initialization_times(ens_member=None, model='wm'):
+    """
+    Async version of windborne.get_initialization_times.
+    """
+    return await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/initialization_times", params={'ens_member': ens_member})
+
+
+async def get_archived_initialization_times(ens_member=None, model='wm', page_end=None):
+    """
+    Async version of windborne.get_archived_initialization_times.
+    """
+    params = {
+        'ens_member': ens_member,
+    }
+    if page_end:
+        params['page_end'] = parse_time(page_end)
+
+    return await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/initialization_times/archive", params=params)
+
+
+async def get_run_information(initialization_time=None, ens_member=None, model='wm'):
+    """
+    Async version of windborne.get_run_information.
+    """
+    params = {}
+    if initialization_time:
+        params['initialization_time'] = parse_time(initialization_time, init_time_flag=True)
+    if ens_member:
+        params['ens_member'] = ens_member
+
+    return await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/run_information", params=params)
+
+
+async def get_variables(model='wm'):
+    """
+    Async version of windborne.get_variables.
+    """
+    return await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/variables")
+
+
+async def get_available_stations(output_file=None, model='wm'):
+    """
+    Async version of windborne.get_available_stations.
+    """
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/point_forecast/stations")
+
+    if output_file:
+        save_arbitrary_response(output_file, response)
+
+    return response
+
+
+async def get_station_forecast(station_id, initialization_time=None, output_file=None, model='wm'):
+    """
+    Async version of windborne.get_station_forecast.
+    """
+    if not station_id:
+        print("To get a station forecast you must provide a station_id.")
+        return
+
+    params = {}
+    if initialization_time:
+        params['initialization_time'] = parse_time(initialization_time, init_time_flag=True)
+
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/point_forecast/stations/{station_id}", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='forecast')
+
+    return response
+
+
+async def get_interpolated_sounding(coordinates, time=None, initialization_time=None, forecast_hour=None, output_file=None, model='wm'):
+    """
+    Async version of windborne.get_interpolated_sounding.
+    """
+    if not coordinates:
+        print("To get an interpolated sounding you must provide coordinates.")
+        return
+
+    params = {"coordinates": coordinates.replace(" ", "")}
+
+    if time is None and (initialization_time is None or forecast_hour is None):
+        print("Error: you must provide either time or initialization_time and forecast_hour.")
+        return
+
+    if initialization_time is not None and forecast_hour is not None:
+        params["initialization_time"] = parse_time(initialization_time, init_time_flag=True)
+        params["forecast_hour"] = forecast_hour
+    elif time:
+        params["time"] = parse_time(time)
+
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/point_forecast/interpolated_sounding", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='data')
+
+    return response
+
+
+async def get_gridded_forecast(variable, time=None, initialization_time=None, forecast_hour=None, output_file=None, silent=False, ens_member=None, model='wm', level=None, include_distribution=False, include_members=False):
+    """
+    Async version of windborne.get_gridded_forecast.
+
+    Returns:
+        str | bytes | None: The path the file was saved to if output_file is provided, otherwise the raw file contents
+    """
+    request_params = _build_gridded_forecast_params(variable, time=time, initialization_time=initialization_time, forecast_hour=forecast_hour, ens_member=ens_member, level=level, include_distribution=include_distribution, include_members=include_members)
+    if request_params is None:
+        return
+
+    url = f"{FORECASTS_API_BASE_URL}/{model}/gridded"
+
+    if not output_file:
+        return await make_api_request(url, params=request_params, as_json=False)
+
+    if not silent:
+        print(f"Output URL found; downloading to {output_file}...")
+
+    return await download_and_save_output(output_file, url, params=request_params, silent=silent, default_extension=_default_gridded_forecast_extension(model))
+
+
+async def get_full_gridded_forecast(time=None, initialization_time=None, forecast_hour=None, output_file=None, silent=False, ens_member=None, model='wm', include_distribution=False, include_members=False):
+    """
+    Async version of windborne.get_full_gridded_forecast.
+    """
+    return await get_gridded_forecast(variable="all", time=time, initialization_time=initialization_time, forecast_hour=forecast_hour, output_file=output_file, silent=silent, ens_member=ens_member, model=model, include_distribution=include_distribution, include_members=include_members)
+
+
+async def get_tropical_cyclones(initialization_time=None, basin=None, output_file=None, model='wm'):
+    """
+    Async version of windborne.get_tropical_cyclones.
+    """
+    params = {}
+
+    if initialization_time:
+        params["initialization_time"] = parse_time(initialization_time, init_time_flag=True)
+
+    if basin:
+        if basin not in ['NA', 'EP', 'WP', 'NI', 'SI', 'AU', 'SP']:
+            print("Basin should be one of the following: NA, EP, WP, NI, SI, AU, SP")
+            return None
+        params["basin"] = basin
+
+    if output_file and not output_file.lower().endswith(TCS_SUPPORTED_FORMATS):
+        print("Unsupported file format.")
+        print_tc_supported_formats()
+        return None
+
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/tropical_cyclones", params=params)
+
+    if output_file:
+        if response == {}:
+            print("There are no active tropical cyclones for your request\n")
+        elif response is None:
+            print("Tropical cyclones have not yet been generated for this initialization time")
+        else:
+            save_track(output_file, response, require_ids=True)
+
+    return response
+
+
+async def get_population_weighted_hdds(initialization_time, ens_member=None, output_file=None, model='wm'):
+    """
+    Async version of windborne.get_population_weighted_hdds.
+    """
+    params = {
+        "initialization_time": initialization_time,
+        "ens_member": ens_member,
+    }
+    response = await make_api_request(f"{API_BASE_URL}/insights/v1/{model}/hdds", params=params)
+
+    if output_file and output_file.endswith('.csv') and response is not None:
+        save_degree_days_csv(output_file, response, 'hdd')
+
+    return response
+
+
+async def get_population_weighted_cdds(initialization_time, ens_member=None, output_file=None, model='wm'):
+    """
+    Async version of windborne.get_population_weighted_cdds.
+    """
+    params = {
+        "initialization_time": initialization_time,
+        "ens_member": ens_member,
+    }
+    response = await make_api_request(f"{API_BASE_URL}/insights/v1/{model}/cdds", params=params)
+
+    if output_file and output_file.endswith('.csv') and response is not None:
+        save_degree_days_csv(output_file, response, 'cdd')
+
+    return response
+
+
+async def get_calculation_times_degree_days(ens_member=None, model='wm'):
+    """
+    Async version of windborne.get_calculation_times_degree_days.
+    """
+    params = {}
+    if ens_member:
+        params["ens_member"] = ens_member
+
+    return await make_api_request(f"{API_BASE_URL}/insights/v1/{model}/calculation_times/degree_days", params=params)
+
+
+# ------------
+# ANALYSIS
+# ------------
+
+async def get_analysis_available_times(source='ecmwf_det_anl'):
+    """
+    Async version of windborne.get_analysis_available_times.
+    """
+    return await make_api_request(f"{FORECASTS_API_BASE_URL}/{source}/analysis/available_times")
+
+
+async def get_analysis_variables(source='ecmwf_det_anl'):
+    """
+    Async version of windborne.get_analysis_variables.
+    """
+    return await make_api_request(f"{FORECASTS_API_BASE_URL}/{source}/variables")
+
+
+async def get_interpolated_analysis(source='ecmwf_det_anl', coordinates=None, time=None, output_file=None):
+    """
+    Async version of windborne.get_interpolated_analysis.
+    """
+    formatted_coordinates = _format_point_forecast_coordinates(coordinates)
+    if not formatted_coordinates:
+        print("To get interpolated analysis you must provide coordinates.")
+        return
+
+    if not time:
+        print("To get interpolated analysis you must provide a time.")
+        return
+
+    params = {
+        "coordinates": formatted_coordinates,
+        "time": parse_time(time),
+    }
+
+    response = await make_api_request(f"{FORECASTS_API_BASE_URL}/{source}/analysis/interpolated", params=params)
+
+    if output_file:
+        save_arbitrary_response(output_file, response, csv_data_key='forecasts')
+
+    return response
+
+
+async def get_gridded_analysis(source='ecmwf_det_anl', variable=None, time=None, output_file=None, output_format=None):
+    """
+    Async version of windborne.get_gridded_analysis.
+
+    Returns:
+        str | bytes | None: The path the file was saved to if output_file is provided, otherwise the raw file contents
+    """
+    if not variable:
+        print("To get gridded analysis you must provide a variable.")
+        return
+    if not time:
+        print("To get gridded analysis you must provide a time.")
+        return
+
+    params = {
+        "variable": variable,
+        "time": parse_time(time),
+    }
+    if output_format:
+        params["format"] = output_format
+
+    url = f"{FORECASTS_API_BASE_URL}/{source}/analysis/gridded"
+
+    if not output_file:
+        return await make_api_request(url, params=params, as_json=False)
+
+    # zarr output is saved under exactly the name given, without adding an extension
+    if output_format == 'zarr' or output_file.endswith('.zarr'):
+        return await download_and_save_output(output_file, url, params=params, default_extension='')
+
+    return await download_and_save_output(output_file, url, params=params)
@@ -1,13 +1,41 @@
 import jwt
+import copy
 import time
 import requests
 import re
 import os
 import base64
+import threading
+import contextvars
+import functools
+import importlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .response_cache import get_response_cache
+from .retry import get_retry_policy, parse_retry_after
+from .rate_limit import get_rate_limiter
+from .single_flight import get_request_coalescer
+from .cassette import get_cassette, should_record, CassetteMissError
+from .hooks import emit, HOOK_EVENTS
+from .tracing import span, SPAN_HTTP_REQUEST, SPAN_JSON_DECODE
+from .json_backend import loads_response
 
 API_BASE_URL = "https://api.windbornesystems.com"
 AUTH_DOCS_URL = "https://api.windbornesystems.com/technical-guides/authentication/basic-auth/"
 
+# Connection pool defaults for each client's session
+# pool_connections is the number of hosts to keep pools for; pool_maxsize is the number of connections per host
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+# Signed JWTs are reused for up to this many seconds, and re-signed this many seconds before they would expire
+DEFAULT_TOKEN_VALIDITY_SECONDS = 60
+DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS = 10
+
+# Number of URLs to remember ETag / Last-Modified validators (and the parsed response) for
+DEFAULT_CONDITIONAL_CACHE_SIZE = 256
+
 
 def is_valid_uuid_v4(client_id):
     return re.fullmatch(r"[a-f0-9]{8}-[a-f0-9]{4}-4[a-f0-9]{3}-[89ab][a-f0-9]{3}-[a-f0-9]{12}", client_id) is not None
@@ -101,99 +129,784 @@ def verify_api_credentials(client_id, api_key):
         )
 
 
-VERIFIED_WB_CLIENT_ID = None
-VERIFIED_WB_API_KEY = None
-
 def get_verified_api_credentials():
-    global VERIFIED_WB_CLIENT_ID, VERIFIED_WB_API_KEY
+    """
+    The credentials of the client making requests (see WindborneClient), checked the first time they're used.
+    """
+    return get_current_client().get_credentials()
+
+
+# ------------
+# API BASE URL
+# ------------
+
+def configure_api_base_url(base_url=None):
+    """
+    Send requests for the WindBorne API to another server, such as a local windborne.mock_server.
+    Can also be set with the WB_API_BASE_URL environment variable. Call with no base_url to use the real API again.
+    Applies to the default client; other clients take a base_url when they're created.
+
+    Args:
+        base_url (str): The URL replacing API_BASE_URL, eg http://127.0.0.1:8765
+    """
+    get_default_client().base_url = base_url.rstrip('/') if base_url else None
+
+
+def resolve_api_url(url):
+    """
+    The URL a request for url is actually sent to, taking the base URL of the client making it into account.
+    """
+    return get_current_client().resolve_url(url)
+
+
+# ------------
+# SIGNED TOKENS
+# ------------
 
-    if VERIFIED_WB_CLIENT_ID is None or VERIFIED_WB_API_KEY is None:
-        VERIFIED_WB_CLIENT_ID, VERIFIED_WB_API_KEY = get_api_credentials()
-        verify_api_credentials(VERIFIED_WB_CLIENT_ID, VERIFIED_WB_API_KEY)
+_token_cache = {}
+_token_cache_lock = threading.Lock()
+_token_validity_seconds = DEFAULT_TOKEN_VALIDITY_SECONDS
+_token_refresh_margin_seconds = DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS
 
-    return VERIFIED_WB_CLIENT_ID, VERIFIED_WB_API_KEY
+
+def configure_token_cache(validity_seconds=DEFAULT_TOKEN_VALIDITY_SECONDS, refresh_margin_seconds=DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS):
+    """
+    Configure how long signed JWTs are reused before a new one is signed.
+
+    Args:
+        validity_seconds (float): How long a signed token may be reused. Set to 0 to sign a new token for every request.
+        refresh_margin_seconds (float): How long before the end of the validity window a token is re-signed.
+    """
+    global _token_validity_seconds, _token_refresh_margin_seconds
+
+    with _token_cache_lock:
+        _token_validity_seconds = validity_seconds
+        _token_refresh_margin_seconds = refresh_margin_seconds
+        _token_cache.clear()
+
+
+def clear_token_cache():
+    """
+    Drop all cached signed tokens, forcing the next request to sign a new one.
+    """
+    with _token_cache_lock:
+        _token_cache.clear()
 
 
-def make_api_request(url, params=None, as_json=True, retry_counter=0):
+def get_signed_token(client_id, api_key):
+    """
+    Get a signed JWT for the given credentials, reusing a cached one while it is still within its validity window.
+    Tokens are cached per (client_id, api_key) pair, so several sets of credentials can be used side by side.
+
+    Args:
+        client_id (str): The client ID to sign the token for
+        api_key (str): The API key used as the signing secret
+
+    Returns:
+        str: The signed token
+    """
+    cache_key = (client_id, api_key)
+    now = time.time()
+
+    # Fast path: reading a dict entry is atomic, so no lock is needed to check the cache
+    cached = _token_cache.get(cache_key)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+
+        signed_token = jwt.encode({
+            'client_id': client_id,
+            'iat': int(now),
+        }, api_key, algorithm='HS256')
+
+        reuse_seconds = _token_validity_seconds - _token_refresh_margin_seconds
+        if reuse_seconds > 0:
+            _token_cache[cache_key] = (signed_token, now + reuse_seconds)
+
+        return signed_token
+
+
+def invalidate_signed_token(client_id, api_key):
+    """
+    Remove the cached token for the given credentials, eg after the server rejected it.
+    """
+    with _token_cache_lock:
+        _token_cache.pop((client_id, api_key), None)
+
+
+# ------------
+# HTTP SESSION
+# ------------
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, keep_alive=True, adapter=None):
+    """
+    Create a requests.Session with a connection-pooling adapter mounted for both http and https.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Maximum number of connections kept alive per host.
+                            Set this to at least the number of threads making concurrent requests.
+        keep_alive (bool): Whether to reuse connections between requests. If False, every request closes its connection.
+        adapter (requests.adapters.HTTPAdapter): Optional custom adapter to mount instead of the default one.
+
+    Returns:
+        requests.Session: The configured session
+    """
+    session = requests.Session()
+
+    if adapter is None:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+# ------------
+# CLIENTS
+# ------------
+
+# Modules whose public functions are also available as WindborneClient methods, eg client.get_observations(...)
+CLIENT_API_MODULES = ('observations_api', 'forecasts_api')
+
+
+class WindborneClient:
+    """
+    Everything needed to talk to the WindBorne API: credentials, the server to talk to, a connection-pooled session,
+    request timeouts, and optionally its own response cache, rate limiter, retry policy and metrics.
+    Several clients can be used side by side in one process, eg for different accounts or environments.
+
+    The module-level functions (windborne.get_observations, ...) use the client made current by client.use(),
+    or the default client (see get_default_client) otherwise, which reads its credentials from WB_CLIENT_ID and WB_API_KEY.
+    The same functions are available as methods, which use the client they're called on:
+
+        client = WindborneClient(api_key='wb_...', timeout=30)
+        client.get_observations('2024-01-01 00:00:00', output_format='csv')
+
+    Clients are safe to share between threads.
+    """
+
+    def __init__(self, client_id=None, api_key=None, base_url=None, session=None, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 keep_alive=True, timeout=None, response_cache=None, rate_limiter=None, retry_policy=None, metrics=None):
+        """
+        Args:
+            client_id (str): The client ID. Read from WB_CLIENT_ID (along with api_key) if neither is given
+            api_key (str): The API key, or a combined wb_... key holding the client ID as well. Read from WB_API_KEY if neither is given
+            base_url (str): The server to send requests to instead of API_BASE_URL, eg a local windborne.mock_server.
+                            Defaults to WB_API_BASE_URL if set
+            session (requests.Session): A session to use instead of creating a pooled one
+            pool_connections (int): Number of per-host connection pools to cache (ignored if session is provided)
+            pool_maxsize (int): Maximum number of connections kept alive per host (ignored if session is provided)
+            keep_alive (bool): Whether to reuse connections between requests (ignored if session is provided)
+            timeout (float or tuple): Seconds to wait for the server to connect and send data, as for requests. No limit if None
+            response_cache (ResponseCache): The cache to use instead of the one configured with configure_response_cache, or False for none
+            rate_limiter (RateLimiter): The rate limiter to use instead of the one configured with configure_rate_limits, or False for none
+            retry_policy (RetryPolicy): The retry policy to use instead of the one configured with configure_retry_policy
+            metrics (MetricsRegistry): A registry to collect this client's request metrics into, besides any enabled with enable_metrics
+        """
+        if client_id is None and api_key is None:
+            self._credentials = None
+        else:
+            combined_credentials = parse_combined_api_key(api_key)
+            self._credentials = combined_credentials if combined_credentials is not None else (client_id, api_key)
+        self._credentials_verified = False
+
+        self.base_url = base_url.rstrip('/') if base_url else os.getenv('WB_API_BASE_URL')
+        self.timeout = timeout
+
+        self._response_cache = response_cache
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_is_owned = False
+        self._session_pool_maxsize = DEFAULT_POOL_MAXSIZE
+        if session is not None or pool_connections != DEFAULT_POOL_CONNECTIONS or pool_maxsize != DEFAULT_POOL_MAXSIZE or not keep_alive:
+            self.configure_session(session=session, pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive)
+
+        # Hooks called for this client's requests only, as well as the ones registered with register_hook
+        self.hooks = {event: () for event in HOOK_EVENTS}
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.install(client=self)
+
+    def __repr__(self):
+        return f"WindborneClient(base_url={self.resolve_url(API_BASE_URL)!r})"
+
+    # Credentials and URLs
+
+    def get_credentials(self):
+        """
+        Returns:
+            tuple: (client_id, api_key), checked the first time they're asked for (raising ValueError if they look wrong)
+        """
+        if not self._credentials_verified:
+            with self._lock:
+                if not self._credentials_verified:
+                    if self._credentials is None:
+                        self._credentials = get_api_credentials()
+                    verify_api_credentials(*self._credentials)
+                    self._credentials_verified = True
+
+        return self._credentials
+
+    def resolve_url(self, url):
+        """
+        The URL a request for url is actually sent to, taking base_url into account.
+        """
+        base_url = self.base_url
+        if base_url and url.startswith(API_BASE_URL):
+            return base_url + url[len(API_BASE_URL):]
+
+        return url
+
+    # Session
+
+    def configure_session(self, session=None, adapter=None, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, keep_alive=True):
+        """
+        Replace the session used by every API request of this client.
+
+        Either pass in your own requests.Session (optionally with an adapter to mount on it),
+        or pass pool settings to have a new pooled session created.
+
+        Args:
+            session (requests.Session): Optional session to use for all requests.
+            adapter (requests.adapters.HTTPAdapter): Optional adapter to mount for http and https.
+            pool_connections (int): Number of per-host connection pools to cache (ignored if session is provided).
+            pool_maxsize (int): Maximum number of connections kept alive per host (ignored if session is provided).
+            keep_alive (bool): Whether to reuse connections between requests (ignored if session is provided).
+
+        Returns:
+            requests.Session: The session that will be used from now on
+        """
+        if session is None:
+            new_session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive, adapter=adapter)
+            is_owned = True
+        else:
+            new_session = session
+            is_owned = False
+            if adapter is not None:
+                new_session.mount('https://', adapter)
+                new_session.mount('http://', adapter)
+
+        with self._lock:
+            previous_session, previous_is_owned = self._session, self._session_is_owned
+            self._session, self._session_is_owned = new_session, is_owned
+            # None marks a pool we didn't size ourselves, which ensure_pool_capacity leaves alone
+            self._session_pool_maxsize = pool_maxsize if session is None and adapter is None else None
+
+        # Only close sessions we created; a caller-provided session is theirs to manage
+        if previous_session is not None and previous_is_owned and previous_session is not new_session:
+            previous_session.close()
+
+        return new_session
+
+    def get_session(self):
+        """
+        Get this client's connection-pooled session, creating it on first use.
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = create_session()
+                    self._session_is_owned = True
+
+        return self._session
+
+    def ensure_pool_capacity(self, max_connections):
+        """
+        Make sure the session can keep at least max_connections connections alive per host,
+        so that running that many requests concurrently doesn't discard and reopen connections.
+        Sessions or adapters passed in through configure_session are left untouched.
+
+        Args:
+            max_connections (int): The number of concurrent requests that will be made
+        """
+        session = self.get_session()
+
+        with self._lock:
+            if self._session is not session or self._session_pool_maxsize is None or self._session_pool_maxsize >= max_connections:
+                return
+
+            adapter = requests.adapters.HTTPAdapter(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=max_connections)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session_pool_maxsize = max_connections
+
+    def close(self):
+        """
+        Close the session, if this client created it. It's recreated if the client is used again.
+        """
+        with self._lock:
+            session, is_owned = self._session, self._session_is_owned
+            self._session = None
+            self._session_pool_maxsize = DEFAULT_POOL_MAXSIZE
+
+        if session is not None and is_owned:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    # Request settings
+
+    @property
+    def response_cache(self):
+        if self._response_cache is False:
+            return None
+        return self._response_cache if self._response_cache is not None else get_response_cache()
+
+    @property
+    def rate_limiter(self):
+        if self._rate_limiter is False:
+            return None
+        return self._rate_limiter if self._rate_limiter is not None else get_rate_limiter()
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy if self._retry_policy is not None else get_retry_policy()
+
+    # Hooks
+
+    def register_hook(self, event, hook=None):
+        """
+        Like windborne.register_hook, but only for this client's requests.
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Unknown hook event {event!r}; expected one of {', '.join(HOOK_EVENTS)}")
+
+        if hook is None:
+            return lambda func: self.register_hook(event, func)
+
+        with self._lock:
+            # Replaced rather than appended to, so emitting never needs the lock
+            self.hooks = {**self.hooks, event: self.hooks[event] + (hook,)}
+
+        return hook
+
+    def unregister_hook(self, event, hook):
+        with self._lock:
+            self.hooks = {**self.hooks, event: tuple(registered for registered in self.hooks[event] if registered is not hook)}
+
+    # Making requests
+
+    @contextmanager
+    def use(self):
+        """
+        Make this the client used by module-level functions (windborne.get_observations, ...) within a with block.
+        This holds for the current thread or asyncio task only, so other threads can use other clients at the same time.
+        """
+        token = _current_client.set(self)
+        try:
+            yield self
+        finally:
+            _current_client.reset(token)
+
+    def request(self, url, params=None, as_json=True, stream=False, conditional=False, retry_policy=None):
+        """
+        Make an authenticated request to the WindBorne API with this client; see make_api_request.
+        """
+        with self.use():
+            return make_api_request(url, params=params, as_json=as_json, stream=stream, conditional=conditional, retry_policy=retry_policy)
+
+    def __getattr__(self, name):
+        # The public functions of the API modules, run with this client
+        if not name.startswith('_'):
+            for module_name in CLIENT_API_MODULES:
+                module = importlib.import_module(f".{module_name}", __package__)
+                function = getattr(module, name, None)
+                if callable(function) and getattr(function, '__module__', None) == module.__name__:
+                    @functools.wraps(function)
+                    def call_with_client(*args, **kwargs):
+                        with self.use():
+                            return function(*args, **kwargs)
+
+                    return call_with_client
+
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+
+_current_client = contextvars.ContextVar('windborne_client', default=None)
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Returns:
+        WindborneClient: The client module-level functions use outside of client.use(), created on first use
+    """
+    global _default_client
+
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = WindborneClient()
+
+    return _default_client
+
+
+def get_current_client():
+    """
+    Returns:
+        WindborneClient: The client made current with client.use(), or the default client
+    """
+    client = _current_client.get()
+    if client is None:
+        return get_default_client()
+
+    return client
+
+
+def configure_session(session=None, adapter=None, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, keep_alive=True):
+    """
+    Replace the session used by every API request of the default client; see WindborneClient.configure_session.
+
+    Returns:
+        requests.Session: The session that will be used from now on
+    """
+    return get_default_client().configure_session(session=session, adapter=adapter, pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive)
+
+
+def ensure_pool_capacity(max_connections):
+    """
+    Make sure the session of the client making requests can keep at least max_connections connections alive per host;
+    see WindborneClient.ensure_pool_capacity.
+    """
+    get_current_client().ensure_pool_capacity(max_connections)
+
+
+def get_session():
+    """
+    Get the connection-pooled session of the client making requests, creating it on first use.
+    requests sessions are safe to share between threads for simple GET requests; the underlying urllib3 pool is thread-safe.
+    """
+    return get_current_client().get_session()
+
+
+# --------------------
+# CONDITIONAL REQUESTS
+# --------------------
+
+# (client_id, url, params) -> (etag, last_modified, parsed response), least recently used first
+_conditional_cache = OrderedDict()
+_conditional_cache_lock = threading.Lock()
+_conditional_cache_size = DEFAULT_CONDITIONAL_CACHE_SIZE
+
+
+def configure_conditional_requests(max_entries=DEFAULT_CONDITIONAL_CACHE_SIZE):
+    """
+    Configure how many URLs conditional requests remember validators for. Set max_entries to 0 to disable them.
+    Clears any validators remembered so far.
+    """
+    global _conditional_cache_size
+
+    with _conditional_cache_lock:
+        _conditional_cache_size = max_entries
+        _conditional_cache.clear()
+
+
+def clear_conditional_cache():
+    with _conditional_cache_lock:
+        _conditional_cache.clear()
+
+
+def _request_key(client_id, url, params):
+    return client_id, url, tuple(sorted((str(key), str(value)) for key, value in (params or {}).items() if value is not None))
+
+
+def get_conditional_headers(cache_key):
+    """
+    The If-None-Match / If-Modified-Since headers to send for a previously seen response, if any.
+    """
+    with _conditional_cache_lock:
+        entry = _conditional_cache.get(cache_key)
+
+    if entry is None:
+        return {}
+
+    etag, last_modified, _ = entry
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    return headers
+
+
+def get_conditional_response(cache_key):
+    """
+    The parsed response remembered for a request, to return when the server replies 304 Not Modified.
+    Each call gets its own copy, so callers can modify what they get back without affecting later calls.
+    """
+    with _conditional_cache_lock:
+        entry = _conditional_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        _conditional_cache.move_to_end(cache_key)
+
+    return copy.deepcopy(entry[2])
+
+
+def remember_conditional_response(cache_key, response, parsed):
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return
+
+    with _conditional_cache_lock:
+        if _conditional_cache_size <= 0:
+            return
+
+        # A copy, since the caller is handed the original
+        _conditional_cache[cache_key] = (etag, last_modified, copy.deepcopy(parsed))
+        _conditional_cache.move_to_end(cache_key)
+        while len(_conditional_cache) > _conditional_cache_size:
+            _conditional_cache.popitem(last=False)
+
+
+def print_forbidden_error():
+    print("--------------------------------------")
+    print("We couldn't authenticate your request.")
+    print("--------------------------------------")
+    print("You likely don't have permission to access this resource.\n")
+    print("For questions, email data@windbornesystems.com.")
+
+
+def print_not_found_error(url, params, status_code, response_text):
+    print("-------------------------------------------------------")
+    print("Our server couldn't find the information you requested.")
+    print("-------------------------------------------------------")
+    print(f"URL: {url}")
+    print(f"Error: {status_code}")
+    print("-------------------------------------------------------")
+    if params:
+        print("\nParameters provided:")
+        for key, value in params.items():
+            print(f"  {key}: {value}")
+    else:
+        if 'missions/' in url:
+            mission_id = url.split('/missions/')[1].split('/')[0]
+            print(f"Mission ID provided: {mission_id}")
+            print(f"No mission found with id: {mission_id}")
+    print("-------------------------------------------------------")
+    print("Response text:")
+    print(response_text)
+
+
+def _response_size(response, stream):
+    # The size of the body as sent, without reading a streamed body to find out
+    content_length = response.headers.get('Content-Length')
+    if content_length and content_length.isdigit():
+        return int(content_length)
+
+    if not stream:
+        return len(response.content)
+
+    return None
+
+
+def make_api_request(url, params=None, as_json=True, retry_counter=0, stream=False, conditional=False, retry_policy=None):
     """
     Make an authenticated request to the WindBorne API.
 
     This uses a JWT under the hood
     While basic auth is supported, this method reduces the odds of an improper configuration accidentally leaking the keys
 
+    Connection errors, timeouts and retryable statuses (429, 502, 503, 504 by default) are retried according to the retry policy;
+    see configure_retry_policy. Requests are paced by the rate limiter, if one is configured; see configure_rate_limits.
+    Identical concurrent JSON requests share a single network call, and each gets its own copy of the result; see configure_request_coalescing.
+    Responses can be recorded and replayed offline; see configure_cassette.
+    Each attempt is reported to the hooks registered with register_hook (eg to collect metrics; see enable_metrics).
+    Requests are made with the current client (see WindborneClient.use), or the default client.
+
     :param url: The URL to make the request to
     :param params: The parameters to pass to the request
     :param as_json: Whether to return the response as JSON or as a requests.Response object
     :param retry_counter: The number of times the request has been retried
+    :param stream: Whether to defer downloading the response body (only meaningful when as_json is False)
+    :param conditional: Whether to send the validators (ETag / Last-Modified) of the last response for this URL and params,
+                        returning the previously parsed response if the server replies 304 Not Modified.
+                        Each call gets its own copy, so it can be modified freely. Only used when as_json is True
+    :param retry_policy: The RetryPolicy to use instead of the configured one
     :return:
     """
-    if retry_counter >= 5:
-        raise ConnectionError("Max retries to API reached.")
+    client = get_current_client()
+    url = client.resolve_url(url)
 
-    client_id, api_key = get_verified_api_credentials()
+    coalescer = get_request_coalescer()
+    if coalescer is not None and as_json and not stream:
+        client_id, _ = client.get_credentials()
+        key = (_request_key(client_id, url, params), conditional)
+        return coalescer.do(key, lambda: _make_api_request(client, url, params, as_json, retry_counter, stream, conditional, retry_policy))
 
-    signed_token = jwt.encode({
-        'client_id': client_id,
-        'iat': int(time.time()),
-    }, api_key, algorithm='HS256')
+    return _make_api_request(client, url, params, as_json, retry_counter, stream, conditional, retry_policy)
 
-    try:
-        if params:
-            response = requests.get(url, auth=(client_id, signed_token), params=params)
-        else:
-            response = requests.get(url, auth=(client_id, signed_token))
 
-        response.raise_for_status()
+def _make_api_request(client, url, params, as_json, retry_counter, stream, conditional, retry_policy):
+    if retry_policy is None:
+        retry_policy = client.retry_policy
 
-        if as_json:
-            return response.json()
-        else:
-            return response
-
-    except requests.exceptions.HTTPError as http_err:
-        if http_err.response.status_code == 403:
-            print("--------------------------------------")
-            print("We couldn't authenticate your request.")
-            print("--------------------------------------")
-            print("You likely don't have permission to access this resource.\n")
-            print("For questions, email data@windbornesystems.com.")
-        elif http_err.response.status_code in [404, 400]:
-            print("-------------------------------------------------------")
-            print("Our server couldn't find the information you requested.")
-            print("-------------------------------------------------------")
-            print(f"URL: {url}")
-            print(f"Error: {http_err.response.status_code}")
-            print("-------------------------------------------------------")
-            if params:
-                print("\nParameters provided:")
-                for key, value in params.items():
-                    print(f"  {key}: {value}")
+    if retry_counter >= retry_policy.max_attempts:
+        raise ConnectionError("Max retries to API reached.")
+
+    client_id, api_key = client.get_credentials()
+
+    # Record responses to, or replay them from, the cassette when one is in use (see configure_cassette).
+    # The response cache and conditional requests are bypassed so that responses are recorded as the server sent them
+    cassette = get_cassette()
+    cassette_key = None
+    if cassette is not None:
+        cassette_key = cassette.key_for(url, params)
+
+    # Serve immutable resources from the on-disk cache when it's enabled (see configure_response_cache)
+    cache = client.response_cache if cassette is None else None
+    cache_key = None
+    cache_ttl = None
+    if cache is not None:
+        cache_ttl = cache.ttl_for(url, params)
+        if cache_ttl is not None:
+            cache_key = cache.key_for(url, params, client_id)
+            started_at = time.perf_counter()
+            cached = cache.load(cache_key, as_json=as_json)
+            if cached is not None:
+                emit('after_response', url, client.hooks, params=params, attempt=retry_counter + 1, source='cache', status_code=200, elapsed=time.perf_counter() - started_at)
+                return cached
+
+    conditional_key = None
+    if conditional and as_json and cache_key is None and cassette is None:
+        conditional_key = _request_key(client_id, url, params)
+
+    retry_state = retry_policy.start(attempts=retry_counter)
+    attempt = retry_counter
+
+    while True:
+        attempt += 1
+        source = 'network'
+        recorded = None
+        if cassette_key is not None and cassette.mode != 'record':
+            recorded = cassette.play(cassette_key)
+            if recorded is None and cassette.mode == 'replay':
+                emit('on_error', url, client.hooks, params=params, attempt=attempt, source='cassette', error='not recorded')
+                raise CassetteMissError(f"No recorded response for {url} with params {params} in {cassette.directory}")
+            if recorded is not None:
+                source = 'cassette'
+
+        if recorded is None:
+            signed_token = get_signed_token(client_id, api_key)
+            session = client.get_session()
+
+            headers = None
+            if conditional_key is not None:
+                headers = get_conditional_headers(conditional_key)
+
+            # Wait our turn if this family of endpoints is rate limited (see configure_rate_limits)
+            rate_limiter = client.rate_limiter
+            if rate_limiter is not None:
+                rate_limiter.wait(url)
+
+        emit('before_request', url, client.hooks, params=params, attempt=attempt, source=source)
+        started_at = time.perf_counter()
+        response = None
+
+        try:
+            if recorded is not None:
+                response = recorded
+            else:
+                with span(SPAN_HTTP_REQUEST, url=url, attempt=attempt) as request_span:
+                    if params:
+                        response = session.get(url, auth=(client_id, signed_token), params=params, stream=stream, headers=headers, timeout=client.timeout)
+                    else:
+                        response = session.get(url, auth=(client_id, signed_token), stream=stream, headers=headers, timeout=client.timeout)
+                    request_span.set_attribute('status_code', response.status_code)
+
+                if cassette_key is not None and should_record(response.status_code):
+                    response = cassette.record(cassette_key, url, params, response)
+
+            emit('after_response', url, client.hooks, params=params, attempt=attempt, source=source, status_code=response.status_code,
+                 bytes=_response_size(response, stream), elapsed=time.perf_counter() - started_at)
+
+            response.raise_for_status()
+
+            if conditional_key is not None:
+                if response.status_code == 304:
+                    cached = get_conditional_response(conditional_key)
+                    if cached is not None:
+                        return cached
+
+                    # The validators were forgotten between sending the request and getting the reply; ask again for the full response
+                    continue
+
+                with span(SPAN_JSON_DECODE, url=url):
+                    parsed = loads_response(response)
+                remember_conditional_response(conditional_key, response, parsed)
+                return parsed
+
+            if cache_key is not None:
+                if stream:
+                    # Left unread so that downloads can be resumed; the file is cached once saved
+                    return cache.store_after_download(cache_key, response, ttl=cache_ttl)
+                return cache.store(cache_key, response, as_json=as_json, ttl=cache_ttl)
+
+            if as_json:
+                with span(SPAN_JSON_DECODE, url=url):
+                    return loads_response(response)
             else:
-                if 'missions/' in url:
-                    mission_id = url.split('/missions/')[1].split('/')[0]
-                    print(f"Mission ID provided: {mission_id}")
-                    print(f"No mission found with id: {mission_id}")
-            print("-------------------------------------------------------")
-            print("Response text:")
-            print(http_err.response.text)
+                return response
+
+        except requests.exceptions.HTTPError as http_err:
+            status_code = http_err.response.status_code
+            error = http_err
+            if status_code == 403:
+                # Don't keep reusing a token the server rejected
+                invalidate_signed_token(client_id, api_key)
+
+                emit('on_error', url, client.hooks, params=params, attempt=attempt, source=source, status_code=status_code, elapsed=time.perf_counter() - started_at, error=http_err)
+                print_forbidden_error()
+                return None
+            elif status_code in [404, 400]:
+                emit('on_error', url, client.hooks, params=params, attempt=attempt, source=source, status_code=status_code, elapsed=time.perf_counter() - started_at, error=http_err)
+                print_not_found_error(url, params, status_code, http_err.response.text)
+                return None
+            elif retry_policy.is_retryable_status(status_code):
+                underlying_error = f"{status_code} {http_err.response.reason}"
+                retry_after = parse_retry_after(http_err.response.headers.get('Retry-After'))
+            else:
+                emit('on_error', url, client.hooks, params=params, attempt=attempt, source=source, status_code=status_code, elapsed=time.perf_counter() - started_at, error=http_err)
+                # Re-raise the HTTP error instead of exiting
+                raise http_err
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError) as conn_err:
+            status_code = response.status_code if response is not None else None
+            error = conn_err
+            underlying_error = f"\n\n{conn_err}"
+            retry_after = None
+        except requests.exceptions.RequestException as req_err:
+            emit('on_error', url, client.hooks, params=params, attempt=attempt, source=source, elapsed=time.perf_counter() - started_at, error=req_err)
+            print(f"An error occurred\n\n{req_err}")
             return None
-        elif http_err.response.status_code == 502:
-            print(f"Temporary connection failure; sleeping for {2**retry_counter}s before retrying")
-            print(f"Underlying error: 502 Bad Gateway")
-            time.sleep(2**retry_counter)
-            return make_api_request(url, params, as_json, retry_counter + 1)
-        else:
-            # Re-raise the HTTP error instead of exiting
-            raise http_err
-    except requests.exceptions.ConnectionError as conn_err:
-        print(f"Temporary connection failure; sleeping for {2**retry_counter}s before retrying")
-        print(f"Underlying error: \n\n{conn_err}")
-        time.sleep(2**retry_counter)
-        return make_api_request(url, params, as_json, retry_counter + 1)
-    except requests.exceptions.Timeout as timeout_err:
-        print(f"Temporary connection failure; sleeping for {2**retry_counter}s before retrying")
-        print(f"Underlying error: \n\n{timeout_err}")
-        time.sleep(2**retry_counter)
-        return make_api_request(url, params, as_json, retry_counter + 1)
-    except requests.exceptions.RequestException as req_err:
-        print(f"An error occurred\n\n{req_err}")
+
+        elapsed = time.perf_counter() - started_at
+        delay = retry_state.next_delay(retry_after=retry_after)
+        if delay is None:
+            emit('on_error', url, client.hooks, params=params, attempt=attempt, source=source, status_code=status_code, elapsed=elapsed, error=error)
+            raise ConnectionError("Max retries to API reached.")
+
+        emit('on_retry', url, client.hooks, params=params, attempt=attempt, source=source, status_code=status_code, elapsed=elapsed, delay=delay, error=error)
+        print(f"Temporary connection failure; sleeping for {delay:.1f}s before retrying")
+        print(f"Underlying error: {underlying_error}")
+        time.sleep(delay)
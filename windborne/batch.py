@@ -0,0 +1,141 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .api_request import ensure_pool_capacity
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class BatchResult:
+    """
+    The outcome of a single call in a batch.
+
+    Attributes:
+        index (int): Position of the call in the list passed in
+        call (tuple): The normalized (func, args, kwargs) that was run
+        value: The return value of the call, or None if it raised
+        error (BaseException): The exception the call raised, or None if it succeeded
+    """
+
+    def __init__(self, index, call, value=None, error=None):
+        self.index = index
+        self.call = call
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return f"BatchResult(index={self.index}, value={self.value!r})"
+        return f"BatchResult(index={self.index}, error={self.error!r})"
+
+
+def normalize_call(call):
+    """
+    Turn a call spec into a (func, args, kwargs) tuple.
+
+    Supported specs:
+        func                              -> func()
+        (func, kwargs_dict)               -> func(**kwargs_dict)
+        (func, args_tuple_or_list)        -> func(*args)
+        (func, args, kwargs)              -> func(*args, **kwargs)
+        {'func': func, 'args': [...], 'kwargs': {...}}
+    """
+    if callable(call):
+        return call, (), {}
+
+    if isinstance(call, dict):
+        return call['func'], tuple(call.get('args', ())), dict(call.get('kwargs', {}))
+
+    if isinstance(call, (tuple, list)) and len(call) > 0 and callable(call[0]):
+        if len(call) == 1:
+            return call[0], (), {}
+        if len(call) == 2:
+            if isinstance(call[1], dict):
+                return call[0], (), dict(call[1])
+            return call[0], tuple(call[1]), {}
+        if len(call) == 3:
+            return call[0], tuple(call[1]), dict(call[2])
+
+    raise ValueError(f"Unsupported batch call spec: {call!r}")
+
+
+def _run_call(index, call):
+    func, args, kwargs = call
+    try:
+        return BatchResult(index, call, value=func(*args, **kwargs))
+    except (Exception, SystemExit) as error:
+        # Many API functions exit() on invalid input; report that as a failed item rather than stopping the batch
+        return BatchResult(index, call, error=error)
+
+
+def iter_batch(calls, max_workers=DEFAULT_MAX_WORKERS, ordered=False):
+    """
+    Run many independent calls on a pool of worker threads, yielding a BatchResult for each.
+    At most max_workers calls run at once. A call that raises does not stop the rest of the batch;
+    its exception is reported on its BatchResult instead.
+
+    All calls share the connection pool from api_request, which is grown to max_workers connections if needed.
+
+    Args:
+        calls (iterable): Call specs, see normalize_call. For example:
+                          [(windborne.get_station_forecast, {'station_id': station}) for station in stations]
+        max_workers (int): Maximum number of calls to run concurrently
+        ordered (bool): Yield results in input order instead of as they complete
+
+    Yields:
+        BatchResult: One per call
+    """
+    normalized_calls = [normalize_call(call) for call in calls]
+    if len(normalized_calls) == 0:
+        return
+
+    max_workers = max(1, min(max_workers, len(normalized_calls)))
+    ensure_pool_capacity(max_workers)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    # Each call runs in a copy of the caller's context, so it uses the same WindborneClient (see WindborneClient.use)
+    futures = [executor.submit(contextvars.copy_context().run, _run_call, index, call) for index, call in enumerate(normalized_calls)]
+
+    try:
+        if ordered:
+            for future in futures:
+                yield future.result()
+        else:
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        # If the caller stops iterating early (or is interrupted), don't start any calls that haven't begun yet
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def run_batch(calls, max_workers=DEFAULT_MAX_WORKERS, ordered=True, on_result=None):
+    """
+    Run many independent calls concurrently and return all of their results.
+    See iter_batch for details.
+
+    Args:
+        calls (iterable): Call specs, see normalize_call
+        max_workers (int): Maximum number of calls to run concurrently
+        ordered (bool): Return results in input order (True) or in the order they completed (False)
+        on_result (callable): Optional function called with each BatchResult as soon as it completes
+
+    Returns:
+        list: A BatchResult for every call
+    """
+    results = []
+
+    for result in iter_batch(calls, max_workers=max_workers, ordered=False):
+        if on_result is not None:
+            on_result(result)
+        results.append(result)
+
+    if ordered:
+        results.sort(key=lambda result: result.index)
+
+    return results
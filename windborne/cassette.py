@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .utils import atomic_write
+
+# record: always send requests, saving their responses. replay: only serve recorded responses, never touching the network.
+# once: serve recorded responses, recording those that are missing
+CASSETTE_MODES = ('record', 'replay', 'once')
+
+# Response headers kept alongside recorded bodies
+RECORDED_HEADERS = ('Content-Type', 'Content-Disposition', 'ETag', 'Last-Modified')
+
+RECORD_CHUNK_SIZE = 1024 * 1024
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised when replaying a request that was never recorded.
+    """
+
+
+def should_record(status_code):
+    # Transient failures would replay as permanent ones, so only final answers are recorded
+    return status_code < 500 and status_code != 429
+
+
+class Cassette:
+    """
+    A directory of recorded API responses, replayed in place of network requests.
+
+    Requests are matched on URL path and params, ignoring the host and credentials, so a cassette recorded against
+    the production API replays against any base URL (eg windborne.mock_server) and for any account.
+    Each entry is a body file plus a small JSON metadata file, written atomically.
+
+    Attributes:
+        played, recorded, misses (int): Counters since the cassette was created
+    """
+
+    def __init__(self, directory, mode='once'):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {', '.join(CASSETTE_MODES)}")
+
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        os.makedirs(self.directory, exist_ok=True)
+        self.mode = mode
+
+        self.played = 0
+        self.recorded = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+
+    def key_for(self, url, params=None):
+        normalized_params = sorted((str(key), str(value)) for key, value in (params or {}).items() if value is not None)
+        payload = json.dumps([urlsplit(url).path, normalized_params])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.body")
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def play(self, key):
+        """
+        Returns:
+            requests.Response: The recorded response, streaming its body from disk. None if it wasn't recorded
+        """
+        meta_path, body_path = self._paths(key)
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            body_file = open(body_path, 'rb')
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+
+        self._count('played')
+        return self._recorded_response(meta, body_file)
+
+    def record(self, key, url, params, response):
+        """
+        Save a response, consuming its body.
+
+        Returns:
+            requests.Response: An equivalent response streaming the recorded body, to be used in place of the original
+        """
+        meta_path, body_path = self._paths(key)
+
+        meta = {
+            'url': url,
+            'params': {str(name): str(value) for name, value in (params or {}).items() if value is not None},
+            'final_url': response.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            'recorded_at': time.time(),
+        }
+
+        try:
+            with atomic_write(body_path, 'wb') as f:
+                size = 0
+                for chunk in response.iter_content(chunk_size=RECORD_CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+        finally:
+            response.close()
+
+        meta['size'] = size
+        with atomic_write(meta_path, 'w') as f:
+            json.dump(meta, f, indent=4)
+
+        self._count('recorded')
+        return self._recorded_response(meta, open(body_path, 'rb'))
+
+    def _recorded_response(self, meta, body_file):
+        response = requests.Response()
+        response.status_code = meta['status_code']
+        response.reason = meta.get('reason')
+        response.url = meta.get('final_url') or meta['url']
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.headers['Content-Length'] = str(meta['size'])
+        response.raw = body_file
+        return response
+
+    def stats(self):
+        return {
+            'directory': self.directory,
+            'mode': self.mode,
+            'played': self.played,
+            'recorded': self.recorded,
+            'misses': self.misses,
+        }
+
+
+_cassette = None
+_cassette_configured = False
+_cassette_lock = threading.Lock()
+
+
+def configure_cassette(directory=None, mode='once'):
+    """
+    Record API responses to a directory and replay them instead of sending requests, for deterministic offline runs.
+    Applies to make_api_request; while a cassette is in use, the response cache and conditional requests are bypassed
+    so that every response is recorded as the server sent it. Call with no directory to stop using a cassette.
+    A cassette can also be enabled by setting the WB_CASSETTE_DIR (and optionally WB_CASSETTE_MODE) environment variables.
+
+    Args:
+        directory (str): Directory holding the recorded responses
+        mode (str): 'record' to always send requests and (re-)record them, 'replay' to only serve recorded responses
+                    (requests that weren't recorded raise CassetteMissError), or 'once' to replay what's recorded and
+                    record the rest
+
+    Returns:
+        Cassette: The new cassette, or None if disabled
+    """
+    global _cassette, _cassette_configured
+
+    with _cassette_lock:
+        _cassette = Cassette(directory, mode=mode) if directory else None
+        _cassette_configured = True
+
+    return _cassette
+
+
+def get_cassette():
+    """
+    Returns:
+        Cassette: The cassette used by make_api_request, or None if record/replay is disabled
+    """
+    global _cassette, _cassette_configured
+
+    if not _cassette_configured:
+        with _cassette_lock:
+            if not _cassette_configured:
+                directory = os.getenv('WB_CASSETTE_DIR')
+                if directory:
+                    _cassette = Cassette(directory, mode=os.getenv('WB_CASSETTE_MODE', 'once'))
+                _cassette_configured = True
+
+    return _cassette
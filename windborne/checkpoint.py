@@ -0,0 +1,63 @@
+import os
+import time
+
+from . import json_backend
+from .utils import atomic_write
+
+
+class CursorCheckpoint:
+    """
+    The cursor (since) of a run of observations, saved to a state file once everything before it has been saved,
+    so that an interrupted backfill or poller resumes there instead of starting over.
+
+    Delivery is at least once: observations after the last saved cursor are fetched again on resume,
+    including any that were saved just before the run stopped.
+
+    The state file also records the query it belongs to, and is ignored by runs of a different query.
+    """
+
+    def __init__(self, state_file, query):
+        self.state_file = state_file
+
+        # Compared with the saved query, which has been through JSON
+        self.query = json_backend.loads(json_backend.dumps(query, compact=True))
+
+    def load(self):
+        """
+        Returns:
+            The saved cursor, or None if there's no state file for this query
+        """
+        if not os.path.exists(self.state_file):
+            return None
+
+        try:
+            with open(self.state_file, 'rb') as f:
+                state = json_backend.loads(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Could not read state file {self.state_file} ({e}); starting from the beginning")
+            return None
+
+        if state.get('query') != self.query:
+            print(f"State file {self.state_file} is for a different query; starting from the beginning")
+            return None
+
+        return state.get('since')
+
+    def save(self, since):
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        state = {
+            'query': self.query,
+            'since': since,
+            'saved_at': time.time(),
+        }
+
+        # Written atomically, so a crash part way through leaves the previous cursor rather than a corrupt file
+        with atomic_write(self.state_file, 'w') as f:
+            f.write(json_backend.dumps(state, compact=True))
+
+    def clear(self):
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
@@ -1,58 +1,33 @@
 import argparse
-import json
+import atexit
 import sys
 
-from . import (
-    get_super_observations,
-    get_observations,
-
-    get_observations_page,
-    get_super_observations_page,
-
-    poll_super_observations,
-    poll_observations,
-
-    get_flying_missions,
-    get_mission_launch_site,
-    get_predicted_path,
-    get_current_location,
-    get_flight_path,
-    get_constellation_status,
-    get_soundings,
-    get_sounding,
-
-    get_recent_asos_observations,
-
-    get_point_forecasts,
-    get_point_forecasts_interpolated,
-    get_initialization_times,
-    get_archived_initialization_times,
-    get_run_information,
-    get_variables,
-    get_gridded_forecast,
-    get_tropical_cyclones,
-    get_population_weighted_hdds,
-    get_population_weighted_cdds,
-    get_calculation_times_degree_days,
-
-    get_available_stations,
-    get_station_forecast,
-    get_interpolated_sounding,
-
-    get_analysis_available_times,
-    get_analysis_variables,
-    get_interpolated_analysis,
-    get_gridded_analysis
-)
+from .profiling import profile_until_exit, DEFAULT_PROFILE_OUTPUT
 
 from pprint import pprint
 
+# Global flags taking a value, which command normalization must skip over
+GLOBAL_FLAGS_WITH_VALUES = ('--metrics-port', '--metrics-file', '--profile-output')
+
 def main():
     # Normalize command to use underscores before parsing (supports both dashes and underscores)
-    if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
-        sys.argv[1] = sys.argv[1].replace('-', '_')
+    # The command is the first argument that isn't a global flag (or a global flag's value)
+    skip_next = False
+    for i, arg in enumerate(sys.argv[1:], start=1):
+        if skip_next:
+            skip_next = False
+        elif arg in GLOBAL_FLAGS_WITH_VALUES:
+            skip_next = True
+        elif not arg.startswith('-'):
+            sys.argv[i] = arg.replace('-', '_')
+            break
 
     parser = argparse.ArgumentParser(description='WindBorne API Command Line Interface')
+    parser.add_argument('--compact-json', action='store_true', help='Write JSON output without indentation (smaller and faster for large outputs)')
+    parser.add_argument('--metrics-port', type=int, help='Serve request metrics in Prometheus format on this port of all interfaces (at /metrics) while the command runs')
+    parser.add_argument('--metrics-file', help='Write request metrics in Prometheus format to this file when the command exits')
+    parser.add_argument('--profile', action='store_true', help='Profile the command, then print the time spent in each stage (network wait, JSON decode, filter/sort, formatting, disk write) and save the profile')
+    parser.add_argument('--profile-output', default=DEFAULT_PROFILE_OUTPUT, help=f'With --profile, save the profile to PROFILE_OUTPUT.pstats and PROFILE_OUTPUT.collapsed (default: {DEFAULT_PROFILE_OUTPUT})')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
     ####################################################################################################################
@@ -63,6 +38,9 @@ def main():
     super_obs_parser.add_argument('start_time', help='Starting time (YYYY-MM-DD_HH:MM, "YYYY-MM-DD HH:MM:SS" or YYYY-MM-DDTHH:MM:SS.fffZ)')
     super_obs_parser.add_argument('end_time', help='End time (YYYY-MM-DD_HH:MM, "YYYY-MM-DD HH:MM:SS" or YYYY-MM-DDTHH:MM:SS.fffZ)', nargs='?', default=None)
     super_obs_parser.add_argument('-b', '--bucket-hours', type=float, default=6.0, help='Hours per bucket')
+    super_obs_parser.add_argument('-w', '--workers', type=int, default=1, help='Number of time shards (one per bucket) to fetch concurrently')
+    super_obs_parser.add_argument('--state-file', help='Save progress to this file after each batch is saved, and resume from it if the command is run again after being interrupted')
+    super_obs_parser.add_argument('--pipeline', action='store_true', help='Save files on a background thread while the next page is fetched')
     super_obs_parser.add_argument('-d', '--output-dir', help='Directory path where the separate files should be saved. If not provided, files will be saved in current directory.')
     super_obs_parser.add_argument('-m', '--mission-id', help='Filter by mission ID')
     super_obs_parser.add_argument('-ml', '--min-latitude', type=float, help='Minimum latitude filter')
@@ -82,6 +60,9 @@ def main():
     obs_parser.add_argument('-xg', '--max-longitude', type=float, help='Maximum longitude filter')
     obs_parser.add_argument('-u', '--include-updated-at', action='store_true', help='Include update timestamps')
     obs_parser.add_argument('-b', '--bucket-hours', type=float, default=6.0, help='Hours per bucket')
+    obs_parser.add_argument('-w', '--workers', type=int, default=1, help='Number of time shards (one per bucket) to fetch concurrently')
+    obs_parser.add_argument('--state-file', help='Save progress to this file after each batch is saved, and resume from it if the command is run again after being interrupted')
+    obs_parser.add_argument('--pipeline', action='store_true', help='Save files on a background thread while the next page is fetched')
     obs_parser.add_argument('-d', '--output-dir', help='Directory path where the separate files should be saved. If not provided, files will be saved in current directory.')
     obs_parser.add_argument('output', help='Save output to a single file (filename.csv, filename.json or filename.little_r) or to multiple files (csv, json, netcdf or little_r)')
 
@@ -120,6 +101,8 @@ def main():
     poll_super_obs_parser = subparsers.add_parser('poll_super_observations', help='Continuously polls for super observations and saves to files in specified format.')
     poll_super_obs_parser.add_argument('start_time', help='Starting time (YYYY-MM-DD_HH:MM, "YYYY-MM-DD HH:MM:SS" or YYYY-MM-DDTHH:MM:SS.fffZ)')
     poll_super_obs_parser.add_argument('-b', '--bucket-hours', type=float, default=6.0, help='Hours per bucket')
+    poll_super_obs_parser.add_argument('--state-file', help='Save progress to this file after each batch is saved, and resume from it if the command is run again after being interrupted')
+    poll_super_obs_parser.add_argument('--pipeline', action='store_true', help='Save files on a background thread while the next page is fetched')
     poll_super_obs_parser.add_argument('-d', '--output-dir', help='Directory path where the separate files should be saved. If not provided, files will be saved in current directory.')
     poll_super_obs_parser.add_argument('-m', '--mission-id', help='Filter observations by mission ID')
     poll_super_obs_parser.add_argument('output', help='Save output to multiple files (csv, json, netcdf or little_r)')
@@ -134,6 +117,8 @@ def main():
     poll_obs_parser.add_argument('-xg', '--max-longitude', type=float, help='Maximum longitude filter')
     poll_obs_parser.add_argument('-u', '--include-updated-at', action='store_true', help='Include update timestamps')
     poll_obs_parser.add_argument('-b', '--bucket-hours', type=float, default=6.0, help='Hours per bucket')
+    poll_obs_parser.add_argument('--state-file', help='Save progress to this file after each batch is saved, and resume from it if the command is run again after being interrupted')
+    poll_obs_parser.add_argument('--pipeline', action='store_true', help='Save files on a background thread while the next page is fetched')
     poll_obs_parser.add_argument('-d', '--output-dir', help='Directory path where the separate files should be saved. If not provided, files will be saved in current directory.')
     poll_obs_parser.add_argument('output', help='Save output to multiple files (csv, json, netcdf or little_r)')
 
@@ -257,6 +242,7 @@ def main():
     gridded_parser.add_argument('--include-distribution', action='store_true', help='Include percentiles, standard deviation, and thresholds when available (WM6 only)')
     gridded_parser.add_argument('--include-members', action='store_true', help='Include all ensemble members when available (WM6 only)')
     gridded_parser.add_argument('-m', '--model', default='wm', help='Forecast model (e.g., wm, wm4, wm-4.5-ens, ecmwf-det)')
+    gridded_parser.add_argument('--segments', type=int, default=1, help='Number of byte ranges to download in parallel')
 
     # OTHER
     # TCS
@@ -337,9 +323,71 @@ def main():
     analysis_gridded_parser.add_argument('output_file', help='Output file path')
     analysis_gridded_parser.add_argument('-s', '--source', default='ecmwf_det_anl', help='Analysis source (ecmwf_det_anl, ecmwf_ens_anl, era5)')
     analysis_gridded_parser.add_argument('-f', '--format', help='Output format (zarr or netcdf)')
+    analysis_gridded_parser.add_argument('--segments', type=int, default=1, help='Number of byte ranges to download in parallel')
 
     args = parser.parse_args()
 
+    if args.compact_json:
+        from .json_backend import configure_json_output
+        configure_json_output(compact=True)
+
+    if args.metrics_port is not None or args.metrics_file:
+        from .metrics import enable_metrics, start_metrics_server
+        registry = enable_metrics()
+        if args.metrics_port is not None:
+            start_metrics_server(port=args.metrics_port, host='0.0.0.0')
+            print(f"Serving metrics at http://localhost:{args.metrics_port}/metrics")
+        if args.metrics_file:
+            atexit.register(registry.write, args.metrics_file)
+
+    if args.profile:
+        profile_until_exit(args.profile_output)
+
+    # The API functions are imported once the command line is parsed, so that --help and usage errors don't wait for them
+    from . import (
+        get_super_observations,
+        get_observations,
+
+        get_observations_page,
+        get_super_observations_page,
+
+        poll_super_observations,
+        poll_observations,
+
+        get_flying_missions,
+        get_mission_launch_site,
+        get_predicted_path,
+        get_current_location,
+        get_flight_path,
+        get_constellation_status,
+        get_soundings,
+        get_sounding,
+
+        get_recent_asos_observations,
+
+        get_point_forecasts,
+        get_point_forecasts_interpolated,
+        get_initialization_times,
+        get_archived_initialization_times,
+        get_run_information,
+        get_variables,
+        get_gridded_forecast,
+        get_tropical_cyclones,
+        get_population_weighted_hdds,
+        get_population_weighted_cdds,
+        get_calculation_times_degree_days,
+
+        get_available_stations,
+        get_station_forecast,
+        get_interpolated_sounding,
+
+        get_analysis_available_times,
+        get_analysis_variables,
+        get_interpolated_analysis,
+        get_gridded_analysis
+    )
+    from . import json_backend
+
     ####################################################################################################################
     # DATA API FUNCTIONS CALLED
     ####################################################################################################################
@@ -370,7 +418,10 @@ def main():
             max_longitude=args.max_longitude,
             bucket_hours=args.bucket_hours,
             output_dir=output_dir,
-            output_format=output_format
+            output_format=output_format,
+            workers=args.workers,
+            pipeline=args.pipeline,
+            state_file=args.state_file
         )
 
     elif args.command == 'poll_super_observations':
@@ -382,7 +433,9 @@ def main():
             mission_id=args.mission_id,
             bucket_hours=args.bucket_hours,
             output_dir=output_dir,
-            output_format=output_format
+            output_format=output_format,
+            pipeline=args.pipeline,
+            state_file=args.state_file
         )
 
     elif args.command == 'poll_observations':
@@ -399,7 +452,9 @@ def main():
             max_longitude=args.max_longitude,
             bucket_hours=args.bucket_hours,
             output_dir=output_dir,
-            output_format=output_format
+            output_format=output_format,
+            pipeline=args.pipeline,
+            state_file=args.state_file
         )
 
     elif args.command == 'observations':
@@ -430,12 +485,15 @@ def main():
             output_file=output_file,
             bucket_hours=args.bucket_hours,
             output_dir=output_dir,
-            output_format=output_format
+            output_format=output_format,
+            workers=args.workers,
+            pipeline=args.pipeline,
+            state_file=args.state_file
         )
 
     elif args.command == 'observations_page':
         if not args.output:
-            print(json.dumps(get_observations_page(
+            print(json_backend.dumps(get_observations_page(
                 since=args.since,
                 min_time=args.min_time,
                 max_time=args.max_time,
@@ -447,7 +505,7 @@ def main():
                 max_latitude=args.max_latitude,
                 min_longitude=args.min_longitude,
                 max_longitude=args.max_longitude
-            ), indent=4))
+            )))
         else:
             get_observations_page(
                 since=args.since,
@@ -466,7 +524,7 @@ def main():
 
     elif args.command == 'super_observations_page':
         if not args.output:
-            print(json.dumps(get_super_observations_page(
+            print(json_backend.dumps(get_super_observations_page(
                 since=args.since,
                 min_time=args.min_time,
                 max_time=args.max_time,
@@ -478,7 +536,7 @@ def main():
                 max_latitude=args.max_latitude,
                 min_longitude=args.min_longitude,
                 max_longitude=args.max_longitude
-            ), indent=4))
+            )))
         else:
             get_super_observations_page(
                 since=args.since,
@@ -654,7 +712,7 @@ def main():
             print(f"\n       windborne gridded variable level time output_file")
             print(f"\n       windborne gridded variable level initialization_time forecast_hour output_file")
         elif len(args.args) == 3:
-            get_gridded_forecast(variable=args.args[0], time=args.args[1], output_file=args.args[2], ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members)
+            get_gridded_forecast(variable=args.args[0], time=args.args[1], output_file=args.args[2], ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members, download_segments=args.segments)
         elif len(args.args) == 4:
             # Support both historical form: variable initialization_time forecast_hour output
             # and alternate "variable level time output" form by detecting numeric level
@@ -676,9 +734,9 @@ def main():
 
             if is_level and looks_like_time(a2):
                 # Map to level/variable with time
-                get_gridded_forecast(variable=f"{a1}/{a0}", time=a2, output_file=a3, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members)
+                get_gridded_forecast(variable=f"{a1}/{a0}", time=a2, output_file=a3, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members, download_segments=args.segments)
             else:
-                get_gridded_forecast(variable=a0, initialization_time=a1, forecast_hour=a2, output_file=a3, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members)
+                get_gridded_forecast(variable=a0, initialization_time=a1, forecast_hour=a2, output_file=a3, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members, download_segments=args.segments)
         elif len(args.args) == 5:
             # Support historical variable level syntax:
             #   windborne gridded variable level initialization_time forecast_hour output_file
@@ -686,10 +744,10 @@ def main():
             try:
                 int(a1)
                 # Treat a1 as level
-                get_gridded_forecast(variable=f"{a1}/{a0}", initialization_time=a2, forecast_hour=a3, output_file=a4, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members)
+                get_gridded_forecast(variable=f"{a1}/{a0}", initialization_time=a2, forecast_hour=a3, output_file=a4, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members, download_segments=args.segments)
             except Exception:
                 # Fallback: treat like variable initialization_time forecast_hour output_file (ignore a1)
-                get_gridded_forecast(variable=a0, initialization_time=a2, forecast_hour=a3, output_file=a4, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members)
+                get_gridded_forecast(variable=a0, initialization_time=a2, forecast_hour=a3, output_file=a4, ens_member=args.ens_member, model=args.model, include_distribution=args.include_distribution, include_members=args.include_members, download_segments=args.segments)
         else:
             print("Too many arguments")
 
@@ -770,7 +828,8 @@ def main():
             variable=args.variable,
             time=args.time,
             output_file=args.output_file,
-            output_format=args.format
+            output_format=args.format,
+            download_segments=args.segments
         )
 
     else:
@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .api_request import get_current_client
+from .tracing import span, SPAN_DISK_WRITE
+from .utils import atomic_write
+
+# Segments are never split smaller than this, so small files are always downloaded in one request
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+# Progress is saved to the state file after roughly this many bytes, so an interrupted download resumes close to where it stopped
+PROGRESS_SAVE_INTERVAL = 16 * 1024 * 1024
+
+
+class DownloadVerificationError(Exception):
+    pass
+
+
+def is_resumable(response):
+    """
+    Whether a streamed response can be resumed with HTTP Range requests.
+    That requires a presigned file URL (reached through a redirect, so it can be re-requested without credentials),
+    a known length, and a server that accepts byte ranges on an unencoded body.
+    """
+    return (
+        len(response.history) > 0
+        and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        and response.headers.get('Content-Length') is not None
+        and response.headers.get('Content-Encoding', 'identity') == 'identity'
+    )
+
+
+def _split_segments(total_size, segment_count):
+    segment_size = -(-total_size // segment_count)
+    return [
+        [start, min(start + segment_size, total_size), 0]
+        for start in range(0, total_size, segment_size)
+    ]
+
+
+def _load_state(state_file, part_file, etag, total_size):
+    # A partial download can only be resumed if it is for the same version of the same file
+    if etag is None or not os.path.exists(state_file) or not os.path.exists(part_file):
+        return None
+
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if state.get('etag') != etag or state.get('size') != total_size or os.path.getsize(part_file) != total_size:
+        return None
+
+    return state
+
+
+def _save_state(state_file, state):
+    with atomic_write(state_file, 'w') as f:
+        json.dump(state, f)
+
+
+def _md5_from_etag(etag):
+    # S3 ETags of single-part uploads are the MD5 of the content; multipart ETags look like "<md5>-<parts>" and can't be checked this way
+    if etag is None:
+        return None
+
+    stripped = etag.strip('"')
+    if stripped.startswith('W/'):
+        return None
+
+    if re.fullmatch(r"[0-9a-f]{32}", stripped):
+        return stripped
+
+    return None
+
+
+def _file_md5(path, chunk_size):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download_resumable(response, output_file, chunk_size, segments=1, verify=True):
+    """
+    Download the body of a streamed response to output_file, resuming with HTTP Range requests if the connection drops.
+
+    Data is written to output_file + '.part', with progress tracked in output_file + '.part.json'.
+    If a previous attempt for the same file (same ETag and size) was interrupted, the download picks up where it stopped,
+    even across separate runs. Once complete, the size (and the MD5 for single-part S3 ETags) is verified and the file is moved into place.
+
+    Responses that can't be resumed (see is_resumable) are streamed to disk without range support.
+
+    Args:
+        response (requests.Response): The initial response, requested with stream=True
+        output_file (str): Path to save the file to
+        chunk_size (int): Number of bytes to read and write at a time
+        segments (int): Number of ranged segments to download in parallel
+        verify (bool): Whether to verify the MD5 against the ETag when possible
+    """
+    # Ranges are requested with the session, timeout and retry policy of the client making the download, also from worker threads
+    client = get_current_client()
+
+    if not is_resumable(response):
+        with atomic_write(output_file, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                with span(SPAN_DISK_WRITE):
+                    f.write(chunk)
+        return
+
+    url = response.url
+    total_size = int(response.headers['Content-Length'])
+    etag = response.headers.get('ETag')
+
+    part_file = output_file + '.part'
+    state_file = part_file + '.json'
+
+    state = _load_state(state_file, part_file, etag, total_size)
+    if state is None:
+        segment_count = max(1, min(segments, total_size // MIN_SEGMENT_SIZE))
+        state = {
+            'etag': etag,
+            'size': total_size,
+            'segments': _split_segments(total_size, segment_count) if total_size > 0 else [],
+        }
+
+        # Preallocate so each segment can write at its own offset
+        with open(part_file, 'wb') as f:
+            f.truncate(total_size)
+    else:
+        print(f"Resuming partial download of {output_file}")
+
+    state_lock = threading.Lock()
+    unsaved_bytes = [0]
+
+    def record_progress(segment, written):
+        with state_lock:
+            segment[2] += written
+            unsaved_bytes[0] += written
+            if unsaved_bytes[0] >= PROGRESS_SAVE_INTERVAL:
+                unsaved_bytes[0] = 0
+                _save_state(state_file, state)
+
+    def download_segment(segment, initial_response=None):
+        # Each segment resumes from where it stopped, as often as the retry policy allows.
+        # Retries are counted since the last time any data arrived, so long downloads aren't cut short by the policy's deadline
+        retry_state = client.retry_policy.start()
+        written_at_last_failure = segment[2]
+        while segment[0] + segment[2] < segment[1]:
+            offset = segment[0] + segment[2]
+
+            try:
+                if initial_response is not None and offset == 0:
+                    segment_response = initial_response
+                else:
+                    headers = {'Range': f"bytes={offset}-{segment[1] - 1}"}
+                    if etag is not None:
+                        headers['If-Range'] = etag
+                    segment_response = client.get_session().get(url, headers=headers, stream=True, timeout=client.timeout)
+                    segment_response.raise_for_status()
+
+                    # 200 instead of 206 means the server ignored the range, which is only usable from the very start
+                    if segment_response.status_code != 206 and offset != 0:
+                        segment_response.close()
+                        raise DownloadVerificationError(f"Server did not honor the byte range request for {output_file}; the file may have changed")
+                initial_response = None
+
+                with open(part_file, 'r+b') as f:
+                    f.seek(offset)
+                    remaining = segment[1] - offset
+                    for chunk in segment_response.iter_content(chunk_size=chunk_size):
+                        chunk = chunk[:remaining]
+                        with span(SPAN_DISK_WRITE):
+                            f.write(chunk)
+                            f.flush()
+                        record_progress(segment, len(chunk))
+                        remaining -= len(chunk)
+                        if remaining <= 0:
+                            break
+                segment_response.close()
+
+                if segment[0] + segment[2] < segment[1]:
+                    raise requests.exceptions.ChunkedEncodingError("Connection closed before the segment was complete")
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError, requests.exceptions.Timeout) as err:
+                if segment[2] > written_at_last_failure:
+                    retry_state = client.retry_policy.start()
+                    written_at_last_failure = segment[2]
+
+                delay = retry_state.next_delay()
+                if delay is None:
+                    raise
+
+                print(f"Download interrupted at byte {segment[0] + segment[2]}; sleeping for {delay:.1f}s before resuming")
+                print(f"Underlying error: \n\n{err}")
+                time.sleep(delay)
+
+    pending_segments = [segment for segment in state['segments'] if segment[0] + segment[2] < segment[1]]
+
+    try:
+        if len(pending_segments) == 1:
+            download_segment(pending_segments[0], initial_response=response)
+        elif len(pending_segments) > 1:
+            client.ensure_pool_capacity(len(pending_segments))
+            with ThreadPoolExecutor(max_workers=len(pending_segments)) as executor:
+                futures = [executor.submit(download_segment, segment) for segment in pending_segments]
+                for future in futures:
+                    future.result()
+    except DownloadVerificationError:
+        # The partial data can't be trusted, so start over next time
+        for path in [part_file, state_file]:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    except BaseException:
+        # Keep the partial file and its progress so the next attempt can resume
+        with state_lock:
+            _save_state(state_file, state)
+        raise
+    finally:
+        response.close()
+
+    if sum(segment[2] for segment in state['segments']) != total_size:
+        raise DownloadVerificationError(f"Downloaded size of {output_file} does not match the expected {total_size} bytes")
+
+    expected_md5 = _md5_from_etag(etag)
+    if verify and expected_md5 is not None and _file_md5(part_file, chunk_size) != expected_md5:
+        os.remove(part_file)
+        if os.path.exists(state_file):
+            os.remove(state_file)
+        raise DownloadVerificationError(f"Checksum of {output_file} does not match its ETag; the download was corrupted")
+
+    os.replace(part_file, output_file)
+    if os.path.exists(state_file):
+        os.remove(state_file)
+
+
+class _SavedFileReader:
+    """
+    File-like body for a response that was already saved to disk. The file is only opened once read, so unused responses don't hold it open.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self.closed = False
+
+    def read(self, size=-1):
+        if self.closed:
+            return b''
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+
+        data = self._file.read(size)
+        if not data:
+            self.close()
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self.closed = True
+
+
+def saved_file_response(response, path):
+    """
+    Build a response whose body is read back from the file a streamed response was saved to,
+    since saving used up the original body.
+
+    Returns:
+        requests.Response: A copy of the response, with its content read from path
+    """
+    saved = requests.Response()
+    saved.status_code = response.status_code
+    saved.reason = response.reason
+    saved.url = response.url
+    saved.history = response.history
+    saved.encoding = response.encoding
+    saved.request = response.request
+    saved.headers = requests.structures.CaseInsensitiveDict(response.headers)
+    saved.headers.pop('Content-Encoding', None)
+    saved.headers['Content-Length'] = str(os.path.getsize(path))
+    saved.raw = _SavedFileReader(path)
+    return saved
@@ -7,11 +7,17 @@ from .utils import (
 )
 
 from .api_request import make_api_request, API_BASE_URL
+from .downloads import download_resumable, saved_file_response
+from .response_cache import cache_downloaded_file
+from .tracing import span, SPAN_DOWNLOAD
 from .track_formatting import save_track
 
 FORECASTS_API_BASE_URL = f"{API_BASE_URL}/forecasts/v1"
 TCS_SUPPORTED_FORMATS = ('.csv', '.json', '.geojson', '.gpx', '.kml', '.little_r')
 
+# Gridded files are streamed to disk in chunks of this many bytes, so memory use doesn't grow with file size
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 # Run information
 def get_run_information(initialization_time=None, ens_member=None, print_response=False, model='wm'):
@@ -25,7 +31,8 @@ def get_run_information(initialization_time=None, ens_member=None, print_respons
         model (str, optional): Forecast model (e.g., wm, wm4, wm4-intra, ecmwf-det)
 
     Returns:
-        dict: API response containing initialization_time, forecast_zero, in_progress, and available list
+        dict: API response containing initialization_time, forecast_zero, in_progress, and available list.
+              Requested conditionally, so unchanged run information isn't downloaded again; each call returns its own copy
     """
 
     params = {}
@@ -34,7 +41,7 @@ def get_run_information(initialization_time=None, ens_member=None, print_respons
     if ens_member:
         params['ens_member'] = ens_member
 
-    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/run_information", params=params)
+    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/run_information", params=params, conditional=True)
 
     if print_response and response is not None:
         print("Initialization time:", response.get('initialization_time'))
@@ -187,26 +194,7 @@ def _looks_like_station_query(query):
     return False
 
 
-# Point forecasts
-def get_point_forecasts(coordinates=None, min_forecast_time=None, max_forecast_time=None, min_forecast_hour=None, max_forecast_hour=None, initialization_time=None, output_file=None, print_response=False, model='wm', stations=None):
-    """
-    Get point forecasts from the API.
-
-    Args:
-        coordinates (str, list, optional): Coordinates in the format "latitude,longitude"
-                                           or a list of tuples, lists, or dictionaries with keys 'latitude' and 'longitude'
-        stations (str, list, optional): ICAO station IDs as a semicolon-delimited string
-                                        (e.g. "PANC;KJFK") or a list of station IDs
-        min_forecast_time (str, optional): Minimum forecast time in ISO 8601 format (YYYY-MM-DDTHH:00:00)
-        max_forecast_time (str, optional): Maximum forecast time in ISO 8601 format (YYYY-MM-DDTHH:00:00)
-        min_forecast_hour (int, optional): Minimum forecast hour
-        max_forecast_hour (int, optional): Maximum forecast hour
-        initialization_time (str, optional): Initialization time in ISO 8601 format (YYYY-MM-DDTHH:00:00)
-        output_file (str, optional): Path to save the response data
-                                      Supported formats: .json, .csv
-        print_response (bool, optional): Whether to print the response data
-    """
-
+def _build_point_forecast_params(coordinates=None, stations=None, min_forecast_time=None, max_forecast_time=None, min_forecast_hour=None, max_forecast_hour=None, initialization_time=None):
     raw_coordinates = coordinates
     raw_stations = stations
 
@@ -218,15 +206,15 @@ def get_point_forecasts(coordinates=None, min_forecast_time=None, max_forecast_t
 
     formatted_coordinates = _format_point_forecast_coordinates(raw_coordinates)
     if raw_coordinates is not None and formatted_coordinates is None:
-        return
+        return None
 
     formatted_stations = _format_point_forecast_stations(raw_stations)
     if raw_stations is not None and formatted_stations is None:
-        return
+        return None
 
     if not formatted_coordinates and not formatted_stations:
         print("To get point forecasts you must provide coordinates or stations.")
-        return
+        return None
 
     params = {}
     if formatted_coordinates:
@@ -243,8 +231,37 @@ def get_point_forecasts(coordinates=None, min_forecast_time=None, max_forecast_t
     if max_forecast_hour:
         params["max_forecast_hour"] = int(max_forecast_hour)
     if initialization_time:
-        initialization_time = parse_time(initialization_time,init_time_flag=True)
-        params["initialization_time"] = initialization_time
+        params["initialization_time"] = parse_time(initialization_time, init_time_flag=True)
+
+    return params
+
+
+# Point forecasts
+def get_point_forecasts(coordinates=None, min_forecast_time=None, max_forecast_time=None, min_forecast_hour=None, max_forecast_hour=None, initialization_time=None, output_file=None, print_response=False, model='wm', stations=None):
+    """
+    Get point forecasts from the API.
+
+    Args:
+        coordinates (str, list, optional): Coordinates in the format "latitude,longitude"
+                                           or a list of tuples, lists, or dictionaries with keys 'latitude' and 'longitude'
+        stations (str, list, optional): ICAO station IDs as a semicolon-delimited string
+                                        (e.g. "PANC;KJFK") or a list of station IDs
+        min_forecast_time (str, optional): Minimum forecast time in ISO 8601 format (YYYY-MM-DDTHH:00:00)
+        max_forecast_time (str, optional): Maximum forecast time in ISO 8601 format (YYYY-MM-DDTHH:00:00)
+        min_forecast_hour (int, optional): Minimum forecast hour
+        max_forecast_hour (int, optional): Maximum forecast hour
+        initialization_time (str, optional): Initialization time in ISO 8601 format (YYYY-MM-DDTHH:00:00)
+        output_file (str, optional): Path to save the response data
+                                      Supported formats: .json, .csv
+        print_response (bool, optional): Whether to print the response data
+    """
+
+    params = _build_point_forecast_params(coordinates=coordinates, stations=stations, min_forecast_time=min_forecast_time, max_forecast_time=max_forecast_time, min_forecast_hour=min_forecast_hour, max_forecast_hour=max_forecast_hour, initialization_time=initialization_time)
+    if params is None:
+        return
+
+    formatted_coordinates = params.get("coordinates")
+    formatted_stations = params.get("stations")
 
     if print_response:
         print("Generating point forecast...")
@@ -283,25 +300,7 @@ def _default_gridded_forecast_extension(model):
     return '.nc'
 
 
-def get_gridded_forecast(variable, time=None, initialization_time=None, forecast_hour=None, output_file=None, silent=False, ens_member=None, model='wm', level=None, include_distribution=False, include_members=False):
-    """
-    Get gridded forecast data from the API.
-    Note that this is primarily meant to be used internally by the other functions in this module.
-
-    Args:
-        time (str, optional): Date in either ISO 8601 format (YYYY-MM-DDTHH:00:00)
-                    or compact format (YYYYMMDDHH). May be used instead of initialization_time and forecast_hour.
-        initialization_time (str, optional): Date in either ISO 8601 format (YYYY-MM-DDTHH:00:00)
-                    or compact format (YYYYMMDDHH). May be used in conjunction with forecast_hour instead of time.
-        forecast_hour (int, optional): The forecast hour to get the forecast for. May be used in conjunction with initialization_time instead of time.
-        variable (str): The variable you want the forecast for
-        level (int, optional): The level you want the forecast for
-        output_file (str, optional): Path to save the response data
-                                      Supported formats: .nc
-        include_distribution (bool, optional): Include percentiles, standard deviation, and thresholds when available (WM6 only)
-        include_members (bool, optional): Include all ensemble members when available (WM6 only)
-    """
-
+def _build_gridded_forecast_params(variable, time=None, initialization_time=None, forecast_hour=None, ens_member=None, level=None, include_distribution=False, include_members=False):
     # backwards compatibility for time and variable order swap
     if time in ['temperature_2m', 'dewpoint_2m', 'wind_u_10m', 'wind_v_10m', '500/wind_u', '500/wind_v', '500/temperature', '850/temperature', 'pressure_msl', '500/geopotential', '850/geopotential', 'FULL']:
         variable, time = time, variable
@@ -309,7 +308,7 @@ def get_gridded_forecast(variable, time=None, initialization_time=None, forecast
     # require either time or initialization_time and forecast_hour
     if time is None and (initialization_time is None or forecast_hour is None):
         print("Error: you must provide either time or initialization_time and forecast_hour.")
-        return
+        return None
     elif time is not None and initialization_time is not None and forecast_hour is not None:
         print("Warning: time, initialization_time, forecast_hour all provided; using initialization_time and forecast_hour.")
 
@@ -339,7 +338,38 @@ def get_gridded_forecast(variable, time=None, initialization_time=None, forecast
     if include_members:
         request_params['include_members'] = True
 
-    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/gridded", params=request_params, as_json=False)
+    return request_params
+
+
+def get_gridded_forecast(variable, time=None, initialization_time=None, forecast_hour=None, output_file=None, silent=False, ens_member=None, model='wm', level=None, include_distribution=False, include_members=False, download_segments=1):
+    """
+    Get gridded forecast data from the API.
+    Note that this is primarily meant to be used internally by the other functions in this module.
+
+    Args:
+        time (str, optional): Date in either ISO 8601 format (YYYY-MM-DDTHH:00:00)
+                    or compact format (YYYYMMDDHH). May be used instead of initialization_time and forecast_hour.
+        initialization_time (str, optional): Date in either ISO 8601 format (YYYY-MM-DDTHH:00:00)
+                    or compact format (YYYYMMDDHH). May be used in conjunction with forecast_hour instead of time.
+        forecast_hour (int, optional): The forecast hour to get the forecast for. May be used in conjunction with initialization_time instead of time.
+        variable (str): The variable you want the forecast for
+        level (int, optional): The level you want the forecast for
+        output_file (str, optional): Path to save the response data
+                                      Supported formats: .nc
+        include_distribution (bool, optional): Include percentiles, standard deviation, and thresholds when available (WM6 only)
+        include_members (bool, optional): Include all ensemble members when available (WM6 only)
+        download_segments (int, optional): Number of byte ranges to download in parallel
+
+    Returns:
+        requests.Response | None: The response. If output_file is provided and the download succeeded, its content is read from the saved file,
+            since downloading used up the original body. Otherwise it's the unread streamed response, whose content is only downloaded once accessed
+    """
+
+    request_params = _build_gridded_forecast_params(variable, time=time, initialization_time=initialization_time, forecast_hour=forecast_hour, ens_member=ens_member, level=level, include_distribution=include_distribution, include_members=include_members)
+    if request_params is None:
+        return
+
+    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/gridded", params=request_params, as_json=False, stream=True)
 
     if response is None:
         return None
@@ -347,12 +377,13 @@ def get_gridded_forecast(variable, time=None, initialization_time=None, forecast
     if output_file:
         if not silent:
             print(f"Output URL found; downloading to {output_file}...")
-        default_extension = _default_gridded_forecast_extension(model)
-        download_and_save_output(output_file, response, default_extension=default_extension)
+        output_file = _with_default_extension(output_file, _default_gridded_forecast_extension(model))
+        if download_and_save_output(output_file, response, segments=download_segments):
+            return saved_file_response(response, output_file)
 
     return response
 
-def get_full_gridded_forecast(time=None, initialization_time=None, forecast_hour=None, output_file=None, silent=False, ens_member=None, model='wm', include_distribution=False, include_members=False):
+def get_full_gridded_forecast(time=None, initialization_time=None, forecast_hour=None, output_file=None, silent=False, ens_member=None, model='wm', include_distribution=False, include_members=False, download_segments=1):
     """
     Get gridded forecast data for all variables from the API.
 
@@ -369,9 +400,10 @@ def get_full_gridded_forecast(time=None, initialization_time=None, forecast_hour
         model (str, optional): The model to get the forecast for
         include_distribution (bool, optional): Include percentiles, standard deviation, and thresholds when available (WM6 only)
         include_members (bool, optional): Include all ensemble members when available (WM6 only)
+        download_segments (int, optional): Number of byte ranges to download in parallel
     """
 
-    return get_gridded_forecast(variable="all", time=time, initialization_time=initialization_time, forecast_hour=forecast_hour, output_file=output_file, silent=silent, ens_member=ens_member, model=model, include_distribution=include_distribution, include_members=include_members)
+    return get_gridded_forecast(variable="all", time=time, initialization_time=initialization_time, forecast_hour=forecast_hour, output_file=output_file, silent=silent, ens_member=ens_member, model=model, include_distribution=include_distribution, include_members=include_members, download_segments=download_segments)
 
 
 def get_tropical_cyclones(initialization_time=None, basin=None, output_file=None, print_response=False, model='wm'):
@@ -451,13 +483,14 @@ def get_initialization_times(print_response=False, ens_member=None, model='wm'):
     """
     Get available WeatherMesh initialization times (also known as cycle times).
 
-    Returns dict with keys "latest", "available", and "in_progress"
+    Returns dict with keys "latest", "available", and "in_progress".
+    Requested conditionally, so unchanged times aren't downloaded again; each call returns its own copy
     """
 
     params = {
         'ens_member': ens_member,
     }
-    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/initialization_times", params=params)
+    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{model}/initialization_times", params=params, conditional=True)
 
     if print_response:
         print("Latest initialization time:", response['latest'])
@@ -499,27 +532,41 @@ def print_tc_supported_formats():
         print(f"  - {fmt}")
 
 
-def download_and_save_output(output_file, response, silent=False, default_extension='.nc'):
+def _with_default_extension(output_file, default_extension):
+    # Add default extension if no extension is present
+    if '.' not in output_file.split('/')[-1]:
+        return output_file + default_extension
+    return output_file
+
+
+def download_and_save_output(output_file, response, silent=False, default_extension='.nc', chunk_size=None, segments=1):
     """
     Downloads a forecast output from a presigned S3 url contained in a response and saves it to a file.
+    The body is streamed to a partial file in chunks and moved into place once complete,
+    so peak memory stays constant regardless of file size and a failed download never leaves a truncated output_file.
+    Dropped connections are resumed with byte range requests, and an interrupted download is picked up again
+    the next time the same file is requested (see downloads.download_resumable).
 
     Args:
         output_file (str): Path where to save the output file
-        response (str): Response that contains the S3 url to download the data from
+        response (requests.Response): Response (ideally requested with stream=True) that contains the data
         default_extension (str): Extension to add when output_file has no extension
+        chunk_size (int): Number of bytes to read and write at a time. Defaults to DOWNLOAD_CHUNK_SIZE
+        segments (int): Number of byte ranges to download in parallel. Only used for large files on servers that support ranges
 
     Returns:
         bool: True if successful, False otherwise
     """
+    output_file = _with_default_extension(output_file, default_extension)
 
-    # Add default extension if no extension is present
-    if '.' not in output_file.split('/')[-1]:
-        output_file = output_file + default_extension
+    if chunk_size is None:
+        chunk_size = DOWNLOAD_CHUNK_SIZE
 
     try:
-        # Save the content directly to file
-        with open(output_file, 'wb') as f:
-            f.write(response.content)
+        with span(SPAN_DOWNLOAD, file=output_file):
+            download_resumable(response, output_file, chunk_size, segments=segments)
+
+        cache_downloaded_file(response, output_file)
 
         if not silent:
             print(f"Data Successfully saved to {output_file}")
@@ -534,6 +581,54 @@ def download_and_save_output(output_file, response, silent=False, default_extens
         if not silent:
             print(f"Error processing the file: {e}")
         return False
+    finally:
+        response.close()
+
+def save_degree_days_csv(output_file, response, degree_days_key):
+    """
+    Save a population-weighted HDD or CDD response as a CSV with one row per region and one column per date.
+
+    Args:
+        output_file (str): Path of the CSV file to write
+        response (dict): The API response
+        degree_days_key (str): Key holding the degree day values, either 'hdd' or 'cdd'
+    """
+    import csv
+
+    dates = response['dates']
+    degree_days_map = response.get(degree_days_key, {})
+
+    keys = list(degree_days_map.keys())
+    is_date_keyed = False
+    if len(keys) > 0 and isinstance(keys[0], str):
+        import re
+        is_date_keyed = re.match(r"^\d{4}-\d{2}-\d{2}", keys[0]) is not None
+
+    if is_date_keyed:
+        region_set = set()
+        for date in dates:
+            if isinstance(degree_days_map.get(date), dict):
+                region_set.update(degree_days_map[date].keys())
+        regions = sorted(region_set)
+        with open(output_file, 'w') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Region'] + dates)
+            for region in regions:
+                row = [region]
+                for date in dates:
+                    value = ''
+                    if isinstance(degree_days_map.get(date), dict):
+                        value = degree_days_map[date].get(region, '')
+                    row.append(value)
+                writer.writerow(row)
+    else:
+        regions = sorted(degree_days_map.keys())
+        with open(output_file, 'w') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Region'] + dates)
+            for region in regions:
+                writer.writerow([region] + [degree_days_map.get(region, {}).get(date, '') for date in dates])
+
 
 def get_population_weighted_hdds(initialization_time, ens_member=None, output_file=None, print_response=False, model='wm'):
     """
@@ -547,41 +642,7 @@ def get_population_weighted_hdds(initialization_time, ens_member=None, output_fi
     
     if output_file:
         if output_file.endswith('.csv'):
-            import csv
-
-            dates = response['dates']
-            hdd_map = response.get('hdd', {})
-
-            keys = list(hdd_map.keys())
-            is_date_keyed = False
-            if len(keys) > 0 and isinstance(keys[0], str):
-                import re
-                is_date_keyed = re.match(r"^\d{4}-\d{2}-\d{2}", keys[0]) is not None
-
-            if is_date_keyed:
-                region_set = set()
-                for date in dates:
-                    if isinstance(hdd_map.get(date), dict):
-                        region_set.update(hdd_map[date].keys())
-                regions = sorted(region_set)
-                with open(output_file, 'w') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Region'] + dates)
-                    for region in regions:
-                        row = [region]
-                        for date in dates:
-                            value = ''
-                            if isinstance(hdd_map.get(date), dict):
-                                value = hdd_map[date].get(region, '')
-                            row.append(value)
-                        writer.writerow(row)
-            else:
-                regions = sorted(hdd_map.keys())
-                with open(output_file, 'w') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Region'] + dates)
-                    for region in regions:
-                        writer.writerow([region] + [hdd_map.get(region, {}).get(date, '') for date in dates])
+            save_degree_days_csv(output_file, response, 'hdd')
     
     if print_response:
         dates = response['dates']
@@ -623,41 +684,7 @@ def get_population_weighted_cdds(initialization_time, ens_member=None, output_fi
     
     if output_file:
         if output_file.endswith('.csv'):
-            import csv
-
-            dates = response['dates']
-            cdd_map = response.get('cdd', {})
-
-            keys = list(cdd_map.keys())
-            is_date_keyed = False
-            if len(keys) > 0 and isinstance(keys[0], str):
-                import re
-                is_date_keyed = re.match(r"^\d{4}-\d{2}-\d{2}", keys[0]) is not None
-
-            if is_date_keyed:
-                region_set = set()
-                for date in dates:
-                    if isinstance(cdd_map.get(date), dict):
-                        region_set.update(cdd_map[date].keys())
-                regions = sorted(region_set)
-                with open(output_file, 'w') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Region'] + dates)
-                    for region in regions:
-                        row = [region]
-                        for date in dates:
-                            value = ''
-                            if isinstance(cdd_map.get(date), dict):
-                                value = cdd_map[date].get(region, '')
-                            row.append(value)
-                        writer.writerow(row)
-            else:
-                regions = sorted(cdd_map.keys())
-                with open(output_file, 'w') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Region'] + dates)
-                    for region in regions:
-                        writer.writerow([region] + [cdd_map.get(region, {}).get(date, '') for date in dates])
+            save_degree_days_csv(output_file, response, 'cdd')
     
     if print_response:
         dates = response['dates']
@@ -825,7 +852,7 @@ def get_interpolated_analysis(source='ecmwf_det_anl', coordinates=None, time=Non
     return response
 
 
-def get_gridded_analysis(source='ecmwf_det_anl', variable=None, time=None, output_file=None, output_format=None):
+def get_gridded_analysis(source='ecmwf_det_anl', variable=None, time=None, output_file=None, output_format=None, download_segments=1):
     """
     Get gridded analysis data for a variable.
 
@@ -835,9 +862,11 @@ def get_gridded_analysis(source='ecmwf_det_anl', variable=None, time=None, outpu
         time (str): Time to retrieve data for (ISO 8601)
         output_file (str): Path to save output file (.nc or .zarr)
         output_format (str, optional): Output format (zarr or netcdf)
+        download_segments (int, optional): Number of byte ranges to download in parallel
 
     Returns:
-        Response object or None
+        requests.Response | None: The response. If output_file is provided and the download succeeded, its content is read from the saved file,
+            since downloading used up the original body. Otherwise it's the unread streamed response, whose content is only downloaded once accessed
     """
     if not variable:
         print("To get gridded analysis you must provide a variable.")
@@ -853,18 +882,18 @@ def get_gridded_analysis(source='ecmwf_det_anl', variable=None, time=None, outpu
     if output_format:
         params["format"] = output_format
 
-    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{source}/analysis/gridded", params=params, as_json=False)
+    response = make_api_request(f"{FORECASTS_API_BASE_URL}/{source}/analysis/gridded", params=params, as_json=False, stream=True)
 
     if response is None:
         return None
 
     if output_file:
-        if output_format == 'zarr' or output_file.endswith('.zarr'):
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
-            print(f"Data Successfully saved to {output_file}")
-        else:
-            download_and_save_output(output_file, response)
+        # zarr output is saved under exactly the name given, without adding an extension
+        if output_format != 'zarr' and not output_file.endswith('.zarr'):
+            output_file = _with_default_extension(output_file, '.nc')
+
+        if download_and_save_output(output_file, response, segments=download_segments):
+            return saved_file_response(response, output_file)
 
     return response
 
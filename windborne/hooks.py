@@ -0,0 +1,128 @@
+import re
+import threading
+from urllib.parse import urlsplit
+
+# before_request: an attempt is about to be sent
+# after_response: a response arrived (from the network, response cache or cassette), whatever its status
+# on_retry: an attempt failed and will be retried after `delay` seconds
+# on_error: the request failed for good
+HOOK_EVENTS = ('before_request', 'after_response', 'on_retry', 'on_error')
+
+# Path segments following these hold ids, which are replaced by {id} in endpoint names
+_ID_COLLECTIONS = {'missions', 'soundings', 'stations'}
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+
+def endpoint_name(url):
+    """
+    The path of an API URL with ids replaced by {id}, eg /observations/v1/missions/{id}/flight_path.json,
+    so that requests to the same endpoint share one name (and metrics labels stay few).
+    """
+    segments = urlsplit(url).path.split('/')
+    for i, segment in enumerate(segments):
+        if _UUID.match(segment) or (i > 0 and segments[i - 1] in _ID_COLLECTIONS):
+            segments[i] = '{id}'
+
+    return '/'.join(segments)
+
+
+class RequestEvent:
+    """
+    What a hook is called with.
+
+    Attributes:
+        event (str): One of HOOK_EVENTS
+        url (str): The URL requested
+        endpoint (str): The URL's path with ids replaced by {id}; see endpoint_name
+        params (dict): The query parameters
+        attempt (int): 1 for the first attempt, 2 for the first retry, ...
+        source (str): Where the response came from: 'network', 'cache' or 'cassette'
+        status_code (int): The response status, if there was a response
+        bytes (int): The size of the response body, if known (bodies that are streamed are only known by Content-Length)
+        elapsed (float): Seconds the attempt took, for after_response, on_retry and on_error
+        delay (float): Seconds until the next attempt, for on_retry
+        error: The exception or description of what went wrong, for on_retry and on_error
+    """
+
+    __slots__ = ('event', 'url', 'endpoint', 'params', 'attempt', 'source', 'status_code', 'bytes', 'elapsed', 'delay', 'error')
+
+    def __init__(self, event, url, params=None, attempt=1, source='network', status_code=None, bytes=None, elapsed=None, delay=None, error=None):
+        self.event = event
+        self.url = url
+        self.endpoint = endpoint_name(url)
+        self.params = params
+        self.attempt = attempt
+        self.source = source
+        self.status_code = status_code
+        self.bytes = bytes
+        self.elapsed = elapsed
+        self.delay = delay
+        self.error = error
+
+    def __repr__(self):
+        return f"RequestEvent(event={self.event!r}, endpoint={self.endpoint!r}, attempt={self.attempt}, status_code={self.status_code}, elapsed={self.elapsed})"
+
+
+_hooks = {event: () for event in HOOK_EVENTS}
+_hooks_lock = threading.Lock()
+
+
+def register_hook(event, hook=None):
+    """
+    Call hook(RequestEvent) on every request lifecycle event of the given kind, for make_api_request and windborne.aio.
+    Hooks run synchronously on the requesting thread, so they should be quick; exceptions they raise are printed and ignored.
+    Can be used as a decorator: @register_hook('after_response')
+
+    Args:
+        event (str): One of before_request, after_response, on_retry or on_error
+        hook (callable): The function to call
+
+    Returns:
+        callable: The hook, so that it can be unregistered later
+    """
+    if event not in HOOK_EVENTS:
+        raise ValueError(f"Unknown hook event {event!r}; expected one of {', '.join(HOOK_EVENTS)}")
+
+    if hook is None:
+        return lambda func: register_hook(event, func)
+
+    with _hooks_lock:
+        # Replaced rather than appended to, so emitting never needs the lock
+        _hooks[event] = _hooks[event] + (hook,)
+
+    return hook
+
+
+def unregister_hook(event, hook):
+    with _hooks_lock:
+        _hooks[event] = tuple(registered for registered in _hooks[event] if registered is not hook)
+
+
+def clear_hooks():
+    with _hooks_lock:
+        for event in HOOK_EVENTS:
+            _hooks[event] = ()
+
+
+def has_hooks(event):
+    return bool(_hooks[event])
+
+
+def emit(event, url, client_hooks=None, **fields):
+    """
+    Call the hooks registered for event, then those of the client making the request (client_hooks, by event).
+    Nothing is built unless a hook is registered.
+    """
+    hooks = _hooks[event]
+    if client_hooks is not None and client_hooks[event]:
+        hooks = hooks + client_hooks[event]
+
+    if not hooks:
+        return
+
+    request_event = RequestEvent(event, url, **fields)
+    for hook in hooks:
+        try:
+            hook(request_event)
+        except Exception as e:
+            print(f"Error in {event} hook {getattr(hook, '__name__', hook)}: {e}")
@@ -0,0 +1,101 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The library used to parse and serialize JSON, chosen once at import: orjson if it's installed, otherwise the standard library
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Indentation of JSON written by the library, unless compact output is enabled.
+# orjson can only indent by 2, so indented output always comes from the standard library and looks the same whichever backend is installed
+JSON_INDENT = 4
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+_compact_output = False
+
+
+def configure_json_output(compact=False):
+    """
+    Choose how JSON files (observations, tracks, saved responses) are written.
+
+    Args:
+        compact (bool): Write JSON without indentation or spaces. Files are smaller and, with orjson installed,
+                        much faster to write. Otherwise JSON is indented by JSON_INDENT spaces
+    """
+    global _compact_output
+    _compact_output = compact
+
+
+def is_compact_output():
+    return _compact_output
+
+
+def loads(data):
+    """
+    Parse JSON from str or bytes using the fastest available backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def loads_response(response):
+    """
+    Parse the JSON body of a requests.Response, like response.json() but with the fastest available backend.
+    """
+    try:
+        return loads(response.content)
+    except ValueError:
+        # Bodies orjson can't handle (eg non UTF-8 encodings) get requests' own decoding and error reporting
+        return response.json()
+
+
+def _dumps_compact_bytes(obj):
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Types orjson doesn't support (eg integers beyond 64 bits) fall back to the standard library
+            pass
+
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj, compact=None):
+    """
+    Serialize obj to a JSON string, compact or indented according to configure_json_output unless compact is given.
+    """
+    if compact is None:
+        compact = _compact_output
+
+    if compact:
+        return _dumps_compact_bytes(obj).decode('utf-8')
+
+    return json.dumps(obj, indent=JSON_INDENT)
+
+
+def dump(obj, f, compact=None):
+    """
+    Write obj as JSON to the text file f, compact or indented according to configure_json_output unless compact is given.
+    """
+    if compact is None:
+        compact = _compact_output
+
+    if not compact:
+        json.dump(obj, f, indent=JSON_INDENT)
+        return
+
+    data = _dumps_compact_bytes(obj)
+
+    # Write the UTF-8 bytes straight to the underlying binary buffer when possible, skipping a decode and re-encode
+    buffer = getattr(f, 'buffer', None)
+    if buffer is not None and (f.encoding or '').lower().replace('-', '') == 'utf8':
+        f.flush()
+        buffer.write(data)
+    else:
+        f.write(data.decode('utf-8'))
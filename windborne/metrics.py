@@ -0,0 +1,307 @@
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .hooks import register_hook, unregister_hook
+from .utils import atomic_write
+
+# Upper bounds (in seconds) of the request latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DEFAULT_METRICS_PORT = 9464
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_METRIC_HELP = {
+    'windborne_requests_total': ('counter', "Responses received, by endpoint, status and source (network, cache or cassette)"),
+    'windborne_response_bytes_total': ('counter', "Bytes of response bodies received, by endpoint"),
+    'windborne_retries_total': ('counter', "Attempts that failed and were retried, by endpoint and reason"),
+    'windborne_request_errors_total': ('counter', "Requests that failed for good, by endpoint and reason"),
+    'windborne_request_duration_seconds': ('histogram', "Time taken by each attempt, by endpoint"),
+}
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _error_reason(event):
+    if event.status_code is not None:
+        return str(event.status_code)
+    if isinstance(event.error, BaseException):
+        return type(event.error).__name__
+    return str(event.error)
+
+
+class Histogram:
+    """
+    Counts of observed values falling under each bucket's upper bound, plus their sum, like a Prometheus histogram.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """
+        Returns:
+            list: (upper bound, observations at or under it) pairs, ending with (inf, count)
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms of API requests, labelled by endpoint (see windborne.hooks.endpoint_name).
+    Thread-safe. Fed by request hooks once install()ed; see enable_metrics.
+    """
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        self.latency_buckets = latency_buckets
+
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._installed_hooks = []
+        self._installed_unregister = unregister_hook
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.latency_buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # Hooks
+
+    def _after_response(self, event):
+        self.inc('windborne_requests_total', (('endpoint', event.endpoint), ('status', event.status_code), ('source', event.source)))
+        if event.bytes:
+            self.inc('windborne_response_bytes_total', (('endpoint', event.endpoint),), event.bytes)
+        if event.elapsed is not None and event.source == 'network':
+            self.observe('windborne_request_duration_seconds', (('endpoint', event.endpoint),), event.elapsed)
+
+    def _on_retry(self, event):
+        self.inc('windborne_retries_total', (('endpoint', event.endpoint), ('reason', _error_reason(event))))
+        if event.status_code is None and event.elapsed is not None:
+            # Attempts that failed without a response still took time
+            self.observe('windborne_request_duration_seconds', (('endpoint', event.endpoint),), event.elapsed)
+
+    def _on_error(self, event):
+        self.inc('windborne_request_errors_total', (('endpoint', event.endpoint), ('reason', _error_reason(event))))
+
+    def install(self, client=None):
+        """
+        Register hooks feeding this registry with every request, or only with the requests of client (a WindborneClient).
+        """
+        if self._installed_hooks:
+            return
+
+        register = client.register_hook if client is not None else register_hook
+        self._installed_unregister = client.unregister_hook if client is not None else unregister_hook
+        self._installed_hooks = [
+            ('after_response', register('after_response', self._after_response)),
+            ('on_retry', register('on_retry', self._on_retry)),
+            ('on_error', register('on_error', self._on_error)),
+        ]
+
+    def uninstall(self):
+        for event, hook in self._installed_hooks:
+            self._installed_unregister(event, hook)
+        self._installed_hooks = []
+
+    # Export
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {'counters': [{'name', 'labels', 'value'}], 'histograms': [{'name', 'labels', 'count', 'sum', 'buckets'}]}
+        """
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items(), key=lambda item: (item[0][0], str(item[0][1])))
+            ]
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'buckets': [[bound, count] for bound, count in histogram.cumulative_counts()],
+                }
+                for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: (item[0][0], str(item[0][1])))
+            ]
+
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_prometheus(self):
+        """
+        Returns:
+            str: The metrics in the Prometheus text exposition format
+        """
+        snapshot = self.snapshot()
+
+        series = {}
+        for counter in snapshot['counters']:
+            series.setdefault(counter['name'], []).append(f"{counter['name']}{_format_labels(counter['labels'].items())} {_format_value(counter['value'])}")
+
+        for histogram in snapshot['histograms']:
+            name = histogram['name']
+            labels = list(histogram['labels'].items())
+            lines = series.setdefault(name, [])
+            for bound, count in histogram['buckets']:
+                lines.append(f"{name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+
+        output = []
+        for name, lines in series.items():
+            metric_type, help_text = _METRIC_HELP.get(name, ('untyped', name))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(lines)
+
+        return '\n'.join(output) + '\n' if output else ''
+
+    def write(self, path):
+        """
+        Write the metrics in Prometheus text format to path, atomically (eg for node_exporter's textfile collector).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with atomic_write(path, 'w') as f:
+            f.write(self.to_prometheus())
+
+
+_metrics_registry = None
+_metrics_lock = threading.Lock()
+
+
+def enable_metrics(registry=None):
+    """
+    Start collecting request metrics: counts by endpoint and status, bytes received, retries, errors and latency histograms.
+
+    Args:
+        registry (MetricsRegistry): The registry to collect into. A new one is created if omitted
+
+    Returns:
+        MetricsRegistry: The registry now collecting metrics; see get_metrics_text and start_metrics_server
+    """
+    global _metrics_registry
+
+    with _metrics_lock:
+        if _metrics_registry is not None and _metrics_registry is not registry:
+            _metrics_registry.uninstall()
+
+        _metrics_registry = registry if registry is not None else MetricsRegistry()
+        _metrics_registry.install()
+
+    return _metrics_registry
+
+
+def disable_metrics():
+    global _metrics_registry
+
+    with _metrics_lock:
+        if _metrics_registry is not None:
+            _metrics_registry.uninstall()
+        _metrics_registry = None
+
+
+def get_metrics_registry():
+    """
+    Returns:
+        MetricsRegistry: The registry collecting metrics, or None if metrics aren't enabled
+    """
+    return _metrics_registry
+
+
+def get_metrics_text():
+    """
+    Returns:
+        str: The collected metrics in Prometheus text format, or an empty string if metrics aren't enabled
+    """
+    registry = _metrics_registry
+    if registry is None:
+        return ''
+
+    return registry.to_prometheus()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+
+        body = get_metrics_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port=DEFAULT_METRICS_PORT, host='127.0.0.1'):
+    """
+    Serve the collected metrics for Prometheus to scrape at http://host:port/metrics, from a background thread.
+    Enables metrics if they aren't already.
+
+    Args:
+        port (int): Port to listen on
+        host (str): Address to listen on. Use '0.0.0.0' to accept scrapes from other hosts
+
+    Returns:
+        ThreadingHTTPServer: The server; call shutdown() on it to stop serving
+    """
+    if _metrics_registry is None:
+        enable_metrics()
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='windborne-metrics-server', daemon=True).start()
+    return server
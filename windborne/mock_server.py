@@ -0,0 +1,466 @@
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote
+
+from .api_request import configure_api_base_url, resolve_api_url, API_BASE_URL
+from .cassette import Cassette
+
+DEFAULT_PAGE_SIZE = 10_000
+DEFAULT_OBSERVATIONS_PER_HOUR = 3600
+DEFAULT_NUM_MISSIONS = 10
+DEFAULT_FORECAST_HOURS = 24
+DEFAULT_GRIDDED_FILE_SIZE = 16 * 1024 * 1024
+
+# Gridded files are this block repeated, so any byte range can be served without holding the file in memory
+_FILE_BLOCK = bytes(range(256)) * 4096
+
+_GRIDDED_PATH = re.compile(r"/forecasts/v1/([^/]+)(/analysis)?/gridded$")
+_POINT_FORECAST_PATH = re.compile(r"/forecasts/v1/([^/]+)/point_forecast(/interpolated)?$")
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def _uuid(number):
+    digits = f"{number:032x}"
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def _seconds(timestamp):
+    # Cursors are integers in nanoseconds, which the client tells apart from timestamps in seconds by their size
+    value = float(timestamp or 0)
+    if value > 4_000_000_000:
+        value /= 1_000_000_000
+    return value
+
+
+def _nanoseconds(seconds):
+    return int(round(seconds * 1_000_000_000))
+
+
+def synthetic_observation(index, observation_interval=3600 / DEFAULT_OBSERVATIONS_PER_HOUR, num_missions=DEFAULT_NUM_MISSIONS,
+                          include_ids=True, include_mission_name=True, include_updated_at=False):
+    """
+    The index-th observation of the mock server's synthetic dataset, taken at index * observation_interval seconds
+    by one of num_missions missions in turn. The same index always gives the same observation.
+    """
+    mission = index % num_missions
+    timestamp = index * observation_interval
+
+    observation = {
+        'timestamp': timestamp,
+        'latitude': round(((index * 7919) % 17900) / 100 - 89.5, 4),
+        'longitude': round(((index * 104729) % 35900) / 100 - 179.5, 4),
+        'altitude': 10000.0 + index % 5000,
+        'humidity': float(index % 100),
+        'pressure': 250.0 + index % 500,
+        'specific_humidity': round((index % 1000) / 100, 2),
+        'speed_u': round(math.sin(index) * 20, 2),
+        'speed_v': round(math.cos(index) * 20, 2),
+        'temperature': round(-60 + index % 80 + 0.5, 1),
+        'mission_id': _uuid(mission + 1),
+    }
+    if include_ids:
+        observation['id'] = _uuid(index)
+    if include_mission_name:
+        observation['mission_name'] = f"W-{1000 + mission}"
+    if include_updated_at:
+        observation['updated_at'] = timestamp
+
+    return observation
+
+
+def _file_md5(size):
+    md5 = hashlib.md5()
+    full_blocks, remainder = divmod(size, len(_FILE_BLOCK))
+    for _ in range(full_blocks):
+        md5.update(_FILE_BLOCK)
+    md5.update(_FILE_BLOCK[:remainder])
+    return md5.hexdigest()
+
+
+class MockAPIServer:
+    """
+    A local stand-in for the WindBorne API serving synthetic (or recorded) data, for benchmarks and load tests
+    that shouldn't touch production. It needs no credentials, although the client still sends them.
+
+    Served endpoints:
+        - observation and super observation pages, paged with since/min_time/max_time and filtered by mission_id
+          (the bounding box filters are ignored). There are observations_per_hour observations each hour, round-robin
+          between num_missions missions, up to the current time. next_since is in nanoseconds
+        - flying missions and constellation status
+        - point forecasts (also interpolated), hourly for forecast_hours hours
+        - gridded forecasts and analyses, which redirect to a file of gridded_file_size bytes served with Range support
+          and an MD5 ETag, like the real API's storage
+
+    If cassette_dir is given, responses recorded there (see configure_cassette) are served in preference to synthetic ones.
+
+    Latency and failures can be injected: each request is delayed by latency plus up to latency_jitter seconds, fails with
+    one of error_statuses with probability error_rate, and has its connection dropped halfway through the body with
+    probability disconnect_rate.
+
+    Use as a context manager to start the server and point the client at it:
+
+        with MockAPIServer(latency=0.05) as server:
+            windborne.get_observations('2024-01-01 00:00:00', '2024-01-02 00:00:00', output_format='csv')
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, cassette_dir=None, latency=0.0, latency_jitter=0.0, error_rate=0.0, error_statuses=(503,),
+                 retry_after=None, disconnect_rate=0.0, page_size=DEFAULT_PAGE_SIZE, observations_per_hour=DEFAULT_OBSERVATIONS_PER_HOUR,
+                 num_missions=DEFAULT_NUM_MISSIONS, forecast_hours=DEFAULT_FORECAST_HOURS, gridded_file_size=DEFAULT_GRIDDED_FILE_SIZE, seed=0):
+        self.host = host
+        self.port = port
+        self.cassette = Cassette(cassette_dir, mode='replay') if cassette_dir else None
+
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.disconnect_rate = disconnect_rate
+
+        self.page_size = page_size
+        self.observation_interval = 3600 / observations_per_hour
+        self.num_missions = num_missions
+        self.forecast_hours = forecast_hours
+        self.gridded_file_size = gridded_file_size
+
+        self.requests_served = 0
+        self.errors_injected = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._file_etag = None
+        self._server = None
+        self._thread = None
+        self._previous_base_url = None
+
+    @property
+    def url(self):
+        if self._server is None:
+            raise RuntimeError("The mock server isn't running")
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        server = self
+
+        class Handler(_MockAPIHandler):
+            mock = server
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        # A short poll interval so that stop() returns promptly
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, name='windborne-mock-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        self._previous_base_url = resolve_api_url(API_BASE_URL)
+        configure_api_base_url(self.url)
+        return self
+
+    def __exit__(self, *exc_info):
+        configure_api_base_url(self._previous_base_url if self._previous_base_url != API_BASE_URL else None)
+        self.stop()
+
+    # Fault injection
+
+    def _next_fault(self):
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+
+            status = None
+            if self.error_rate and self._random.random() < self.error_rate:
+                status = self._random.choice(self.error_statuses)
+                self.errors_injected += 1
+
+            disconnect = bool(self.disconnect_rate) and status is None and self._random.random() < self.disconnect_rate
+            if disconnect:
+                self.errors_injected += 1
+
+        return delay, status, disconnect
+
+    # Synthetic data
+
+    def observations_page(self, params):
+        interval = self.observation_interval
+
+        lower = max(_seconds(params.get('since')), _seconds(params.get('min_time')))
+        upper = min(_seconds(params['max_time']) if params.get('max_time') else math.inf, time.time())
+
+        first_index = math.ceil(round(lower / interval, 6))
+        last_index = math.floor(upper / interval)
+
+        step = 1
+        mission_id = params.get('mission_id')
+        if mission_id:
+            missions = [m for m in range(self.num_missions) if _uuid(m + 1) == mission_id]
+            if not missions:
+                return {'observations': [], 'has_next_page': False, 'next_since': _nanoseconds(lower)}
+
+            step = self.num_missions
+            first_index += (missions[0] - first_index) % self.num_missions
+
+        include_ids = params.get('include_ids') in ('True', 'true', '1')
+        include_mission_name = params.get('include_mission_name') in ('True', 'true', '1')
+        include_updated_at = params.get('include_updated_at') in ('True', 'true', '1')
+
+        page_end = min(last_index + 1, first_index + self.page_size * step)
+        observations = [
+            synthetic_observation(index, interval, self.num_missions, include_ids, include_mission_name, include_updated_at)
+            for index in range(first_index, page_end, step)
+        ]
+
+        next_index = first_index + len(observations) * step
+        return {
+            'observations': observations,
+            'has_next_page': next_index <= last_index,
+            'next_since': _nanoseconds(next_index * interval),
+        }
+
+    def missions_page(self, params):
+        page = int(params.get('page', 0))
+        page_size = int(params.get('page_size', 64))
+        numbers = range(self.num_missions)[page * page_size:(page + 1) * page_size]
+
+        return {
+            'missions': [{'id': _uuid(mission + 1), 'number': 1000 + mission, 'name': f"W-{1000 + mission}"} for mission in numbers]
+        }
+
+    def point_forecast(self, params):
+        locations = [location for location in (params.get('coordinates') or '').split(';') if location]
+        locations += [station for station in (params.get('stations') or '').split(';') if station]
+
+        initialization_time = None
+        if params.get('initialization_time'):
+            try:
+                initialization_time = datetime.fromisoformat(params['initialization_time'].replace('Z', '+00:00'))
+            except ValueError:
+                pass
+        if initialization_time is None:
+            initialization_time = datetime.fromtimestamp(time.time() // 21600 * 21600, timezone.utc)
+        if initialization_time.tzinfo is None:
+            initialization_time = initialization_time.replace(tzinfo=timezone.utc)
+
+        start_hour = int(params.get('min_forecast_hour') or 0)
+        end_hour = int(params.get('max_forecast_hour') or self.forecast_hours)
+
+        forecasts = []
+        for location_index, _ in enumerate(locations):
+            forecast = []
+            for hour in range(start_hour, end_hour + 1):
+                forecast_time = datetime.fromtimestamp(initialization_time.timestamp() + hour * 3600, timezone.utc)
+                forecast.append({
+                    'time': forecast_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'temperature_2m': round(15 + 10 * math.sin((hour + location_index) / 24 * 2 * math.pi), 2),
+                    'dewpoint_2m': round(8 + 5 * math.sin((hour + location_index) / 24 * 2 * math.pi), 2),
+                    'wind_u_10m': round(5 * math.cos(hour / 12), 2),
+                    'wind_v_10m': round(5 * math.sin(hour / 12), 2),
+                    'precipitation': round(max(0.0, math.sin(hour / 5)), 2),
+                    'pressure_msl': round(1013 + 5 * math.cos(hour / 24), 1),
+                })
+            forecasts.append(forecast)
+
+        return {'initialization_time': initialization_time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'forecasts': forecasts}
+
+    def file_etag(self):
+        with self._lock:
+            if self._file_etag is None:
+                self._file_etag = f'"{_file_md5(self.gridded_file_size)}"'
+            return self._file_etag
+
+
+class _MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    mock = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        split = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(split.query).items()}
+
+        delay, status, disconnect = self.mock._next_fault()
+        if delay:
+            time.sleep(delay)
+
+        if status is not None:
+            headers = {'Retry-After': str(self.mock.retry_after)} if self.mock.retry_after is not None else {}
+            self._send_json(status, {'error': 'Injected failure'}, headers=headers)
+            return
+
+        self._disconnect = disconnect
+
+        if self.mock.cassette is not None and self._send_recorded(split.path, params):
+            return
+
+        self._route(split.path, params)
+
+    def _route(self, path, params):
+        mock = self.mock
+
+        if path in ('/observations/v1/observations.json', '/observations/v1/super_observations.json'):
+            self._send_json(200, mock.observations_page(params))
+        elif path in ('/observations/v1/flying_missions.json', '/observations/v1/constellation_status.json'):
+            self._send_json(200, mock.missions_page(params))
+        elif _POINT_FORECAST_PATH.match(path):
+            self._send_json(200, mock.point_forecast(params))
+        elif _GRIDDED_PATH.match(path):
+            name = '_'.join(quote(str(value), safe='') for _, value in sorted(params.items())) or 'gridded'
+            location = f"/files{path}/{name}.nc"
+            self._send_body(302, b'', headers={'Location': location})
+        elif path.startswith('/files/'):
+            self._send_file()
+        else:
+            self._send_json(404, {'error': f"Not found: {path}"})
+
+    def _send_recorded(self, path, params):
+        recorded = self.mock.cassette.play(self.mock.cassette.key_for(path, params))
+        if recorded is None:
+            return False
+
+        with recorded.raw as body_file:
+            body = body_file.read()
+
+        headers = {name: value for name, value in recorded.headers.items() if name.lower() != 'content-length'}
+        self._send_body(recorded.status_code, body, headers=headers)
+        return True
+
+    def _send_json(self, status, value, headers=None):
+        self._send_body(status, json.dumps(value).encode('utf-8'), headers={'Content-Type': 'application/json', **(headers or {})})
+
+    def _send_body(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if getattr(self, '_disconnect', False) and body:
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+    def _send_file(self):
+        size = self.mock.gridded_file_size
+        etag = self.mock.file_etag()
+        start, end = 0, size - 1
+        status = 200
+
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and (if_range is None or if_range == etag):
+            match = _RANGE.match(range_header.strip())
+            if match and (match.group(1) or match.group(2)):
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                else:
+                    start = max(0, size - int(match.group(2)))
+
+                if start > end:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f"bytes */{size}")
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                status = 206
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-netcdf')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(length))
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        self.end_headers()
+
+        if getattr(self, '_disconnect', False):
+            length //= 2
+            self.close_connection = True
+
+        block = memoryview(_FILE_BLOCK)
+        position = start
+        remaining = length
+        try:
+            while remaining > 0:
+                offset = position % len(_FILE_BLOCK)
+                chunk = block[offset:offset + min(remaining, len(_FILE_BLOCK) - offset)]
+                self.wfile.write(chunk)
+                position += len(chunk)
+                remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m windborne.mock_server', description="Serve a local stand-in for the WindBorne API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cassette-dir', help="Serve responses recorded in this directory when available")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to delay each response")
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="Up to this many extra seconds of random delay")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probability of failing a request")
+    parser.add_argument('--error-status', type=int, action='append', help="Status of injected failures (repeatable, default 503)")
+    parser.add_argument('--retry-after', type=float, help="Retry-After seconds sent with injected failures")
+    parser.add_argument('--disconnect-rate', type=float, default=0.0, help="Probability of dropping the connection halfway through a response")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--observations-per-hour', type=int, default=DEFAULT_OBSERVATIONS_PER_HOUR)
+    parser.add_argument('--missions', type=int, default=DEFAULT_NUM_MISSIONS)
+    parser.add_argument('--gridded-file-size', type=int, default=DEFAULT_GRIDDED_FILE_SIZE, help="Size in bytes of gridded files")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockAPIServer(
+        host=args.host,
+        port=args.port,
+        cassette_dir=args.cassette_dir,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_statuses=args.error_status or (503,),
+        retry_after=args.retry_after,
+        disconnect_rate=args.disconnect_rate,
+        page_size=args.page_size,
+        observations_per_hour=args.observations_per_hour,
+        num_missions=args.missions,
+        gridded_file_size=args.gridded_file_size,
+        seed=args.seed
+    ).start()
+
+    print(f"Mock WindBorne API listening on {server.url}")
+    print(f"Point the client at it with: export WB_API_BASE_URL={server.url}")
+
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,48 +1,56 @@
 import time
 import os
-from datetime import datetime, timezone, timedelta
+import itertools
+import glob
+import math
+import threading
+import contextvars
+import collections
+import shutil
+import tempfile
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import csv
-import json
 
-from .api_request import make_api_request, API_BASE_URL
+from .api_request import make_api_request, ensure_pool_capacity, API_BASE_URL
 from .observation_formatting import format_little_r, convert_to_netcdf
 from .utils import to_unix_timestamp, save_arbitrary_response, print_table
 from .track_formatting import save_track
+from .streaming_json import StreamedPage
+from .checkpoint import CursorCheckpoint
+from .tracing import span, SPAN_PAGE, SPAN_BATCH_CALLBACK, SPAN_FILTER_SORT, SPAN_SAVE_FILE, SPAN_FORMAT, SPAN_DISK_WRITE
+from . import json_backend
 
 DATA_API_BASE_URL = f"{API_BASE_URL}/observations/v1"
 
-# ------------
-# CORE RESOURCES
-# ------------
+# Headers for CSV files
+OBSERVATIONS_CSV_HEADERS = [
+    "timestamp", "id", "time", "latitude", "longitude", "altitude", "humidity",
+    "pressure", "specific_humidity", "speed_u", "speed_v", "temperature", "mission_name", "mission_id"
+]
 
-def get_observations_page(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=True, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None):
-    """
-    Retrieves observations page based on specified filters including geographical bounds.
+SUPER_OBSERVATIONS_CSV_HEADERS = [
+    "timestamp", "id", "time", "latitude", "longitude", "altitude", "humidity",
+    "mission_name", "pressure", "specific_humidity", "speed_u", "speed_v", "temperature",
+    "mission_id", "updated_at"
+]
 
-    Args:
-        since (str): Filter observations after this timestamp.
+# Hours of buckets, counting back from the newest observation, that a poller keeps in order to save updates to their observations in place
+DEFAULT_UPSERT_WINDOW_HOURS = 48
 
-        min_time (str): Minimum timestamp for observations.
-        max_time (str): Maximum timestamp for observations.
-        include_ids (bool): Include observation IDs in response.
-        include_mission_name (bool): Include mission names in response.
-        include_updated_at (bool): Include update timestamps in response.
-        mission_id (str): Filter observations by mission ID.
-        min_latitude (float): Minimum latitude boundary.
-        max_latitude (float): Maximum latitude boundary.
-        min_longitude (float): Minimum longitude boundary.
-        max_longitude (float): Maximum longitude boundary.
+# Batches that can wait to be saved when pipelining, before fetching pauses for saving to catch up
+PIPELINE_QUEUE_SIZE = 2
 
-        output_file (str): Optional path to save the response data.
-                           If provided, saves the data in CSV format.
+# ------------
+# CORE RESOURCES
+# ------------
 
-    Returns:
-        dict: The API response containing filtered observations.
+def build_observations_params(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None):
+    """
+    Builds the query parameters shared by the observations and super observations page endpoints.
+    Date strings are converted to Unix timestamps and unset filters are dropped.
     """
-
-    url = f"{DATA_API_BASE_URL}/observations.json"
-    
-    # Convert date strings to Unix timestamps
     params = {}
     if since:
         params["since"] = to_unix_timestamp(since)
@@ -67,8 +75,57 @@ def get_observations_page(since=None, min_time=None, max_time=None, include_ids=
     if include_updated_at:
         params["include_updated_at"] = True
 
-    params = {k: v for k, v in params.items() if v is not None}
-    
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def stream_page(url, params):
+    """
+    Request a page of (super) observations and return it as a StreamedPage, which parses observations as they download.
+
+    Returns:
+        StreamedPage: The page, or None if the request failed
+    """
+    response = make_api_request(url, params=params, as_json=False, stream=True)
+    if response is None:
+        return None
+
+    return StreamedPage(response)
+
+
+def get_observations_page(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=True, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None, stream=False):
+    """
+    Retrieves observations page based on specified filters including geographical bounds.
+
+    Args:
+        since (str): Filter observations after this timestamp.
+
+        min_time (str): Minimum timestamp for observations.
+        max_time (str): Maximum timestamp for observations.
+        include_ids (bool): Include observation IDs in response.
+        include_mission_name (bool): Include mission names in response.
+        include_updated_at (bool): Include update timestamps in response.
+        mission_id (str): Filter observations by mission ID.
+        min_latitude (float): Minimum latitude boundary.
+        max_latitude (float): Maximum latitude boundary.
+        min_longitude (float): Minimum longitude boundary.
+        max_longitude (float): Maximum longitude boundary.
+
+        output_file (str): Optional path to save the response data.
+                           If provided, saves the data in CSV format.
+        stream (bool): Return a StreamedPage that parses observations as they download instead of the whole page at once.
+                       Not supported together with output_file.
+
+    Returns:
+        dict: The API response containing filtered observations (or a StreamedPage if stream is set).
+    """
+
+    url = f"{DATA_API_BASE_URL}/observations.json"
+
+    params = build_observations_params(since=since, min_time=min_time, max_time=max_time, include_ids=include_ids, include_mission_name=include_mission_name, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
+
+    if stream and not output_file:
+        return stream_page(url, params)
+
     response = make_api_request(url, params=params)
 
     if output_file:
@@ -77,7 +134,7 @@ def get_observations_page(since=None, min_time=None, max_time=None, include_ids=
     return response
 
 
-def get_super_observations_page(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None):
+def get_super_observations_page(since=None, min_time=None, max_time=None, include_ids=None, include_mission_name=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None, stream=False):
     """
     Retrieves super observations page based on specified filters including geographical bounds.
 
@@ -95,38 +152,19 @@ def get_super_observations_page(since=None, min_time=None, max_time=None, includ
         max_longitude (float): Maximum longitude boundary.
         output_file (str): Optional path to save the response data.
                            If provided, saves the data in CSV format.
+        stream (bool): Return a StreamedPage that parses super observations as they download instead of the whole page at once.
+                       Not supported together with output_file.
 
     Returns:
-        dict: The API response containing filtered super observations.
+        dict: The API response containing filtered super observations (or a StreamedPage if stream is set).
     """
 
     url = f"{DATA_API_BASE_URL}/super_observations.json"
 
-    params = {}
-    if since:
-        params["since"] = to_unix_timestamp(since)
-    if min_time:
-        params["min_time"] = to_unix_timestamp(min_time)
-    if max_time:
-        params["max_time"] = to_unix_timestamp(max_time)
-    if mission_id:
-        params["mission_id"] = mission_id
-    if min_latitude is not None:
-        params["min_latitude"] = min_latitude
-    if max_latitude is not None:
-        params["max_latitude"] = max_latitude
-    if min_longitude is not None:
-        params["min_longitude"] = min_longitude
-    if max_longitude is not None:
-        params["max_longitude"] = max_longitude
-    if include_ids:
-        params["include_ids"] = True
-    if include_mission_name:
-        params["include_mission_name"] = True
-    if include_updated_at:
-        params["include_updated_at"] = True
+    params = build_observations_params(since=since, min_time=min_time, max_time=max_time, include_ids=include_ids, include_mission_name=include_mission_name, include_updated_at=include_updated_at, mission_id=mission_id, min_latitude=min_latitude, max_latitude=max_latitude, min_longitude=min_longitude, max_longitude=max_longitude)
 
-    params = {k: v for k, v in params.items() if v is not None}
+    if stream and not output_file:
+        return stream_page(url, params)
 
     response = make_api_request(url, params=params)
     if output_file:
@@ -136,15 +174,16 @@ def get_super_observations_page(since=None, min_time=None, max_time=None, includ
 
 
 def save_observations_batch(observations, output_file, output_format, output_dir, start_time=None, end_time=None, bucket_hours=6.0, csv_headers=None, custom_save=None, prevent_overwrites=False, verbose=True):
-    filtered_observations = observations
-    if start_time is not None:
-        filtered_observations = [obs for obs in observations if float(obs['timestamp']) >= start_time]
+    with span(SPAN_FILTER_SORT, observations=len(observations)):
+        filtered_observations = observations
+        if start_time is not None:
+            filtered_observations = [obs for obs in observations if float(obs['timestamp']) >= start_time]
 
-    if end_time is not None:
-        filtered_observations = [obs for obs in observations if float(obs['timestamp']) <= end_time]
+        if end_time is not None:
+            filtered_observations = [obs for obs in filtered_observations if float(obs['timestamp']) <= end_time]
 
-    # Sort by timestamp
-    sorted_observations = sorted(filtered_observations, key=lambda x: float(x['timestamp']))
+        # Sort by timestamp
+        sorted_observations = sorted(filtered_observations, key=lambda x: float(x['timestamp']))
 
     if output_file:
         if custom_save is not None:
@@ -187,29 +226,50 @@ def save_observations_to_file(sorted_observations, output_file, csv_headers=None
         if len(sorted_observations) > 10_000:
             print("This may take a while...")
 
-    if output_file.endswith('.nc'):
-        first_obs_timestamp = float(sorted_observations[0]['timestamp'])
-        convert_to_netcdf(sorted_observations, first_obs_timestamp, output_file)
+    with span(SPAN_SAVE_FILE, file=output_file, observations=len(sorted_observations)):
+        if output_file.endswith('.nc'):
+            first_obs_timestamp = float(sorted_observations[0]['timestamp'])
+            with span(SPAN_FORMAT, format='netcdf'):
+                convert_to_netcdf(sorted_observations, first_obs_timestamp, output_file)
 
-    elif output_file.endswith('.json'):
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(sorted_observations, f, indent=4)
+        elif output_file.endswith('.json'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json_backend.dump(sorted_observations, f)
 
-    elif output_file.endswith('.csv'):
-        with open(output_file, mode='w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=csv_headers)
-            writer.writeheader()
-            writer.writerows(sorted_observations)
+        elif output_file.endswith('.csv'):
+            with open(output_file, mode='w', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=csv_headers)
+                writer.writeheader()
+                writer.writerows(sorted_observations)
 
-    elif output_file.endswith('.little_r'):
-        little_r_records = format_little_r(sorted_observations)
-        with open(output_file, 'w') as file:
-            file.write('\n'.join(little_r_records))
+        elif output_file.endswith('.little_r'):
+            with span(SPAN_FORMAT, format='little_r'):
+                little_r_records = format_little_r(sorted_observations)
+            with span(SPAN_DISK_WRITE), open(output_file, 'w') as file:
+                file.write('\n'.join(little_r_records))
 
     if verbose: 
         print(f"Saved {len(sorted_observations)} {'observation' if len(sorted_observations) == 1 else 'observations'} to {output_file}")
 
 
+def bucket_file_name(mission_name, bucket_index, bucket_hours, output_format):
+    """
+    Returns:
+        str: The name of the file for a mission's observations in the bucket starting bucket_index * bucket_hours after the epoch
+    """
+    bucket_start = datetime.fromtimestamp(bucket_index * bucket_hours * 60 * 60, tz=timezone.utc)
+
+    file_name = f"WindBorne_{mission_name}_%04d-%02d-%02d_%02d_%dh" % (
+        bucket_start.year, bucket_start.month, bucket_start.day,
+        bucket_start.hour, bucket_hours)
+
+    extension = f".{output_format}"
+    if output_format == 'netcdf':
+        extension = '.nc'
+
+    return file_name + extension
+
+
 def save_observations_batch_in_buckets(sorted_observations, output_format, output_dir, bucket_hours=6.0, csv_headers=None, custom_save=None, prevent_overwrites=False, verbose=True):
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
@@ -228,44 +288,248 @@ def save_observations_batch_in_buckets(sorted_observations, output_format, outpu
 
         by_mission[mission_id].append(observation)
 
+    bucket_seconds = bucket_hours * 60 * 60
     for mission_id, accumulated_observations in by_mission.items():
         mission_name = mission_names[mission_id]
-        start_index = 0
-        earliest_time = accumulated_observations[0]['timestamp']
-        curtime = earliest_time - earliest_time % (bucket_hours * 60 * 60)
 
-        for i in range(len(accumulated_observations)):
-            segment = None
-            if accumulated_observations[i]['timestamp'] - curtime > bucket_hours * 60 * 60:
-                segment = accumulated_observations[start_index:i]
+        # Observations are sorted, so each bucket's observations are consecutive.
+        # Buckets start at multiples of bucket_hours, so a bucket's file is the same however the observations were batched
+        for bucket_index, segment in itertools.groupby(accumulated_observations, key=lambda observation: float(observation['timestamp']) // bucket_seconds):
+            segment = list(segment)
+            output_file = os.path.join(output_dir or '.', bucket_file_name(mission_name, bucket_index, bucket_hours, output_format))
+            if custom_save is not None:
+                custom_save(segment, output_file)
+            else:
+                save_observations_to_file(segment, output_file, csv_headers=csv_headers, prevent_overwrites=prevent_overwrites, verbose=verbose)
+
 
-            if i == len(accumulated_observations) - 1:
-                segment = accumulated_observations[start_index:]
+class ObservationSpool:
+    """
+    Holds fetched observations on disk until they're saved, grouped by the time bucket they belong in (or all together, without bucket_hours),
+    so that fetching a long time range doesn't hold all of it in memory.
+    save() then reads back and saves one bucket at a time, so memory is bounded by the largest bucket rather than the whole range.
 
-            if segment is None:
+    Observations added more than once (eg fetched again after resuming) are saved once, in the version added last.
+
+    By default the spool is in a temporary directory, removed by close(). Given a directory, it's kept until clear(),
+    and observations spooled there by an earlier, interrupted run are picked up.
+    Use as a context manager to close it afterwards.
+    """
+
+    def __init__(self, bucket_hours=None, directory=None):
+        self.bucket_seconds = bucket_hours * 60 * 60 if bucket_hours else None
+        self.count = 0
+        self.persistent = directory is not None
+        self.directory = directory if directory is not None else tempfile.mkdtemp(prefix='windborne-spool-')
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._keys = set()
+        for name in os.listdir(self.directory):
+            if not name.endswith('.jsonl'):
                 continue
 
-            bucket_start = datetime.fromtimestamp(curtime, tz=timezone.utc)
+            # A run killed part way through adding a batch leaves its line unfinished; later batches go on lines of their own
+            path = os.path.join(self.directory, name)
+            with open(path, 'rb+') as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+
+            self._keys.add(int(name[:-len('.jsonl')]))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.jsonl")
+
+    def add(self, observations):
+        groups = {}
+        for observation in observations:
+            key = int(float(observation['timestamp']) // self.bucket_seconds) if self.bucket_seconds else 0
+            groups.setdefault(key, []).append(observation)
+
+        # Each line is a JSON list of observations, appended in the order they arrived
+        for key, group in groups.items():
+            with open(self._path(key), 'a', encoding='utf-8') as f:
+                f.write(json_backend.dumps(group, compact=True) + '\n')
+            self._keys.add(key)
+
+        self.count += len(observations)
+
+    def read(self, key):
+        observations = {}
+        with open(self._path(key), 'rb') as f:
+            for line in f:
+                try:
+                    group = json_backend.loads(line)
+                except ValueError:
+                    # The unfinished batch of an interrupted run, which was fetched again
+                    continue
+
+                for observation in group:
+                    # Keeps the position of the first copy and the contents of the last
+                    observations[observation.get('id') or id(observation)] = observation
+
+        return list(observations.values())
+
+    def keys(self):
+        """
+        Returns:
+            list: The buckets with observations spooled, in time order, as bucket start times divided by the bucket length
+        """
+        return sorted(self._keys)
 
-            file_name = f"WindBorne_{mission_name}_%04d-%02d-%02d_%02d_%dh" % (
-                bucket_start.year, bucket_start.month, bucket_start.day,
-                bucket_start.hour, bucket_hours)
+    def save(self, save_batch):
+        """
+        Call save_batch with the observations of each bucket in turn, in time order.
+        """
+        for key in self.keys():
+            save_batch(self.read(key))
 
-            extension = f".{output_format}"
-            if output_format == 'netcdf':
-                extension = '.nc'
+    def discard(self, key):
+        if key in self._keys:
+            os.remove(self._path(key))
+            self._keys.discard(key)
 
-            output_file = os.path.join(output_dir or '.', file_name + extension)
-            if custom_save is not None:
-                custom_save(segment, output_file)
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._keys = set()
+
+    def close(self):
+        if not self.persistent:
+            self.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def observation_version(observation):
+    """
+    Returns:
+        A value that changes whenever the observation is updated: its updated_at if included, otherwise a hash of its values
+    """
+    updated_at = observation.get('updated_at')
+    if updated_at is not None:
+        return updated_at
+
+    return hash(json_backend.dumps(observation, compact=True))
+
+
+class ObservationUpserter:
+    """
+    Saves a poller's batches so that each bucket's files hold every observation once, in its latest version,
+    rather than observations delivered again (the last page when it's polled again, or updates with include_updated_at) going to extra .1, .2, ... files.
+
+    Observations are spooled by bucket (see ObservationSpool), and the files of the buckets and missions a batch changed are rewritten from the spool
+    with save_batch. Observations already saved in the same version are dropped without rewriting anything.
+
+    Only the buckets within window_hours of the newest observation are kept, so memory and disk use stay bounded however long it polls.
+    Observations for older buckets, and for buckets whose files were written by an earlier run, go to new files with save_new_files as before.
+
+    Without save_batch (eg for a single output_file, which can't be rewritten for every batch), nothing is rewritten:
+    new and changed observations go to new files with save_new_files, and those delivered again unchanged are dropped.
+    """
+
+    def __init__(self, save_batch, save_new_files, bucket_hours=6.0, output_format=None, output_dir=None, window_hours=DEFAULT_UPSERT_WINDOW_HOURS, directory=None):
+        self.save_batch = save_batch
+        self.save_new_files = save_new_files
+        self.bucket_hours = bucket_hours
+        self.bucket_seconds = bucket_hours * 60 * 60
+        self.output_format = output_format
+        self.output_dir = output_dir
+        self.window_buckets = max(1, int(math.ceil(window_hours / bucket_hours)))
+
+        self.spool = ObservationSpool(bucket_hours=bucket_hours, directory=directory)
+        self._versions = {}
+        self._new_file_buckets = set()
+        self._oldest_key = None
+
+        # Pick up where an interrupted run left off, when the spool was kept (see get_observations_core's state_file)
+        for key in self.spool.keys():
+            self._versions[key] = {observation['id']: observation_version(observation) for observation in self.spool.read(key) if observation.get('id') is not None}
+        self._evict()
+
+    def _has_files_from_earlier_run(self, key):
+        # The first time this run sees a bucket, its files can only have been written by an earlier one
+        if self.output_format is None:
+            return False
+
+        pattern = os.path.join(glob.escape(self.output_dir or '.'), bucket_file_name('*', key, self.bucket_hours, self.output_format))
+        return bool(glob.glob(pattern))
+
+    def _evict(self):
+        if not self._versions:
+            return
+
+        oldest_key = max(self._versions) - self.window_buckets + 1
+        for key in [key for key in self._versions if key < oldest_key]:
+            del self._versions[key]
+            self._new_file_buckets.discard(key)
+            self.spool.discard(key)
+
+        self._oldest_key = max(oldest_key, self._oldest_key) if self._oldest_key is not None else oldest_key
+
+    def add(self, observations):
+        changed = {}
+        new_files = []
+        saved_unspooled = []
+        for observation in observations:
+            key = int(float(observation['timestamp']) // self.bucket_seconds)
+            if self._oldest_key is not None and key < self._oldest_key:
+                new_files.append(observation)
+                continue
+
+            if key not in self._versions:
+                self._versions[key] = {}
+                if self._has_files_from_earlier_run(key):
+                    self._new_file_buckets.add(key)
+
+            observation_id = observation.get('id')
+            if observation_id is not None:
+                versions = self._versions[key]
+                version = observation_version(observation)
+                if versions.get(observation_id) == version:
+                    continue
+                versions[observation_id] = version
+
+            if self.save_batch is None:
+                new_files.append(observation)
+                saved_unspooled.append(observation)
+            elif key in self._new_file_buckets:
+                new_files.append(observation)
             else:
-                save_observations_to_file(segment, output_file, csv_headers=csv_headers, prevent_overwrites=prevent_overwrites, verbose=verbose)
+                changed.setdefault(key, []).append(observation)
+
+        self.spool.add([observation for group in changed.values() for observation in group])
 
-            start_index = i
-            curtime += timedelta(hours=bucket_hours).seconds
+        for key in sorted(changed):
+            missions = {observation['mission_id'] for observation in changed[key]}
+            self.save_batch([observation for observation in self.spool.read(key) if observation['mission_id'] in missions])
 
+        if new_files:
+            self.save_new_files(new_files)
 
-def get_observations_core(api_args, csv_headers, get_page, start_time=None, end_time=None, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True):
+        # Without save_batch the spool only records what was saved, so it's added to afterwards; a run interrupted in between saves them again when resumed
+        if saved_unspooled:
+            self.spool.add(saved_unspooled)
+
+        self._evict()
+
+    def close(self):
+        self.spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def get_observations_core(api_args, csv_headers, get_page, start_time=None, end_time=None, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True, stream=False, workers=1, pipeline=False, state_file=None):
     """
     Fetches observations or superobservations between a start time and an optional end time and saves to files in specified format.
     Files are broken up into time buckets, with filenames containing the time at the mid-point of the bucket.
@@ -291,6 +555,13 @@ def get_observations_core(api_args, csv_headers, get_page, start_time=None, end_
                              This allows custom processing or saving in custom formats.
         custom_save (callable): Optional function to save observations in a custom format.
         exit_at_end (bool): Whether to exit after fetching all observations or keep polling.
+        stream (bool): Parse pages as they download, so memory stays flat however large the pages are.
+        workers (int): Number of time shards to fetch concurrently when exit_at_end is set; see fetch_observations_in_shards.
+        pipeline (bool): Save each batch on a background thread while the next page is fetched; see iterate_through_observations.
+        state_file (str): Save the cursor here after each batch is saved, and resume from it; see CursorCheckpoint.
+                          Fetched observations are spooled to state_file.spool: until the files are written when exit_at_end is set,
+                          and while their buckets can still be updated when polling (see ObservationUpserter),
+                          so a resumed poller doesn't save observations again that the interrupted one already saved.
     """
     if output_format and not custom_save:
         verify_observations_output_format(output_format)
@@ -298,9 +569,9 @@ def get_observations_core(api_args, csv_headers, get_page, start_time=None, end_
     if output_file and not custom_save:
         verify_observations_output_format(output_file.split('.')[-1])
 
-    # When we don't clear batches, we can safely overwrite the output files; this is nice
-    # However, it also holds everything in memory, so we should only do this when we're not going to run indefinitely
-    clear_batches = not exit_at_end
+    # When we're going to stop at the end, observations are spooled to disk and each file is written once at the end, so we can safely overwrite the output files.
+    # When polling indefinitely, each batch is saved as it comes; files are only rewritten in place by ObservationUpserter, which knows their contents
+    prevent_overwrites = not exit_at_end
     batch_size = 10_000
     if not batch_size: # save less frequently
         batch_size = 100_000
@@ -311,7 +582,7 @@ def get_observations_core(api_args, csv_headers, get_page, start_time=None, end_
     if end_time is not None:
         end_time = to_unix_timestamp(end_time)
 
-    def save_with_context(observations_batch):
+    def save_with_context(observations_batch, prevent_overwrites=prevent_overwrites):
         save_observations_batch(
             observations_batch,
             output_file=output_file,
@@ -322,37 +593,209 @@ def get_observations_core(api_args, csv_headers, get_page, start_time=None, end_
             bucket_hours=bucket_hours,
             csv_headers=csv_headers,
             custom_save=custom_save,
-            prevent_overwrites=clear_batches,
+            prevent_overwrites=prevent_overwrites,
             verbose=verbose
         )
 
-    result = iterate_through_observations(get_page, api_args, callback=callback, batch_callback=save_with_context, exit_at_end=exit_at_end, clear_batches=clear_batches, batch_size=batch_size)
+    checkpoint = None
+    resume_since = None
+    if state_file:
+        checkpoint = CursorCheckpoint(state_file, {
+            'endpoint': get_page.__name__,
+            'args': api_args,
+            'exit_at_end': exit_at_end,
+            'output_file': output_file,
+            'output_format': output_format,
+            'output_dir': output_dir,
+            'bucket_hours': bucket_hours,
+        })
+
+        resume_since = checkpoint.load()
+        if resume_since is not None:
+            print(f"Resuming from the cursor saved in {state_file}")
+            api_args = {**api_args, 'since': resume_since}
+
+        if workers > 1:
+            print("Resuming needs a single cursor, so observations will be fetched with one worker")
+            workers = 1
+
+    # With a state file, spooled observations outlive an interrupted run, so that resuming still saves (or updates) what was fetched before
+    spool_directory = None
+    if checkpoint is not None:
+        spool_directory = f"{state_file}.spool"
+        if resume_since is None:
+            # Left by a run of a different query
+            shutil.rmtree(spool_directory, ignore_errors=True)
+
+    if workers > 1 and exit_at_end:
+        if end_time is None:
+            end_time = int(time.time())
+
+        result = fetch_observations_in_shards(
+            get_page, api_args, start_time, end_time, save_with_context,
+            shard_hours=bucket_hours, workers=workers, collect_all=bool(output_file), callback=callback, stream=stream
+        )
+    elif exit_at_end:
+        with ObservationSpool(bucket_hours=None if output_file else bucket_hours, directory=spool_directory) as spool:
+            result = iterate_through_observations(get_page, api_args, callback=callback, batch_callback=spool.add, exit_at_end=True, batch_size=batch_size, stream=stream, pipeline=pipeline, checkpoint=checkpoint)
+            spool.save(save_with_context)
+
+            # The run is complete, so running it again starts over
+            if checkpoint is not None:
+                spool.clear()
+                checkpoint.clear()
+    elif output_file:
+        # A single file would have to be rewritten whole for every batch, so each batch goes to a file of its own, without observations already saved
+        with ObservationUpserter(None, save_with_context, bucket_hours=bucket_hours, directory=spool_directory) as upserter:
+            result = iterate_through_observations(get_page, api_args, callback=callback, batch_callback=upserter.add, exit_at_end=False, batch_size=batch_size, stream=stream, pipeline=pipeline, checkpoint=checkpoint)
+    else:
+        def save_in_place(observations_batch):
+            save_with_context(observations_batch, prevent_overwrites=False)
+
+        with ObservationUpserter(save_in_place, save_with_context, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, directory=spool_directory) as upserter:
+            result = iterate_through_observations(get_page, api_args, callback=callback, batch_callback=upserter.add, exit_at_end=False, batch_size=batch_size, stream=stream, pipeline=pipeline, checkpoint=checkpoint)
+
     if isinstance(result, int):
         print(f"Processed {result} observations")
 
     return result
 
 
-def iterate_through_observations(get_page, args, callback=None, batch_callback=None, exit_at_end=True, batch_size=10_000, clear_batches=True):
+class BatchWriter:
+    """
+    Calls batch_callback with batches on a background thread, so that the next page is fetched while the last batch is saved.
+    At most queue_size batches wait to be saved; put() blocks beyond that, so memory stays bounded when saving is the slower stage.
+    With replace_pending, each batch supersedes those still waiting (eg when every batch holds everything fetched so far), so only the latest is saved.
+    An error raised by batch_callback is raised again from the next put() or from close().
+    """
+
+    def __init__(self, batch_callback, queue_size=PIPELINE_QUEUE_SIZE, replace_pending=False):
+        self.batch_callback = batch_callback
+        self.queue_size = queue_size
+        self.replace_pending = replace_pending
+
+        self._pending = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._error = None
+
+        # Saving runs with the caller's client and other context variables
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run,), name='windborne-batch-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+
+                if not self._pending:
+                    return
+
+                batch = self._pending.popleft()
+                self._condition.notify_all()
+
+            try:
+                self.batch_callback(batch)
+            except BaseException as e:
+                with self._condition:
+                    self._error = e
+                    self._pending.clear()
+                    self._condition.notify_all()
+                return
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def put(self, batch):
+        with self._condition:
+            if self.replace_pending:
+                self._pending.clear()
+
+            while len(self._pending) >= self.queue_size and self._error is None:
+                self._condition.wait()
+
+            self._raise_error()
+            self._pending.append(batch)
+            self._condition.notify_all()
+
+    def close(self):
+        """
+        Wait for the pending batches to be saved and stop the thread.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+        self._raise_error()
+
+
+class ObservationPage:
+    """
+    A page of (super) observations from iterate_observation_pages.
+
+    Iterate over it for its observations, which are parsed as they download when the page is streamed.
+    Once iterated, `response` holds the page's other values (has_next_page, next_since, ...).
+    If the download was interrupted part way, `interruption` holds the error instead and the page is fetched again.
     """
-    Repeatedly calls `get_page` with `args`
-    For each page fetched, it calls `callback` with the full response
-    Every `batch_size` observations fetched, it calls `batch_callback` with the batched observations (if provided)
-    Returns an array of all observations fetched if no batch_callback is provided
+
+    def __init__(self, page, since):
+        self.since = since
+        self.count = 0
+        self.response = None
+        self.interruption = None
+        self._observations = self._iterate(page)
+
+    def _iterate(self, page):
+        if not isinstance(page, StreamedPage):
+            self.response = page
+            self.count = len(page.get('observations', []))
+            yield from page.get('observations', [])
+            return
+
+        try:
+            for observation in page:
+                self.count += 1
+                yield observation
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.interruption = e
+            return
+
+        self.response = page.fields
+
+    def __iter__(self):
+        return self._observations
+
+    @property
+    def has_next_page(self):
+        return self.response['has_next_page']
+
+    @property
+    def next_since(self):
+        return self.response['next_since']
+
+
+def iterate_observation_pages(get_page, args, exit_at_end=True, stream=False):
+    """
+    Generator that repeatedly calls `get_page` with `args`, following the `next_since` cursor, and yields each page as an ObservationPage.
+    Only the page being iterated is held in memory (with `stream`, only the observations not yet parsed out of it),
+    so memory stays flat however long the time range.
+
+    Pages that fail are fetched again after 10 seconds. An interrupted streamed page is fetched again from the start,
+    so the observations yielded before the interruption may be yielded again.
 
     Args:
         get_page (callable): Function to fetch a page of observations
         args (dict): Arguments to pass to `get_page`
-        callback (callable): Function to call with each page of observations
-        batch_callback (callable): Function to call with a batch of observations
-        exit_at_end (bool): Whether to exit after fetching all observations or keep polling
-        batch_size (int): Number of observations to accumulate before calling `batch_callback`
-        clear_batches (bool): Whether to clear the batched observations after calling `batch_callback`
+        exit_at_end (bool): Whether to stop after fetching all observations or keep polling
+        stream (bool): Whether to stream pages; `get_page` must accept stream=True
     """
-
-    batched_observations = []
+    args = dict(args)
     since = args.get('since', 0)
-    processed_count = 0
 
     if args.get('min_time') is not None:
         args['min_time'] = to_unix_timestamp(args['min_time'])
@@ -364,52 +807,265 @@ def iterate_through_observations(get_page, args, callback=None, batch_callback=N
 
     while True:
         args = {**args, 'since': since}
-        response = get_page(**args)
+        with span(SPAN_PAGE, since=since, stream=stream) as page_span:
+            if stream:
+                response = get_page(**args, stream=True)
+            else:
+                response = get_page(**args)
+
+            if response and not stream:
+                page_span.set_attribute('observations', len(response.get('observations', [])))
+
         if not response:
             print("Received null response from API. Retrying in 10 seconds...")
             time.sleep(10)
             continue
 
-        observations = response.get('observations', [])
+        page = ObservationPage(response, since)
+        yield page
 
-        if callback:
-            callback(response)
+        # The consumer may not have read to the end of a streamed page, but next_since comes after the observations
+        for _ in page:
+            pass
+
+        if page.interruption is not None:
+            print(f"Page download was interrupted ({page.interruption}). Retrying in 10 seconds...")
+            time.sleep(10)
+            continue
+
+        if not page.has_next_page:
+            print("No more data available.")
+            if exit_at_end:
+                return
+
+            time.sleep(60)
+            continue
+
+        since = page.next_since
+
+
+def iterate_through_observations(get_page, args, callback=None, batch_callback=None, exit_at_end=True, batch_size=10_000, clear_batches=True, stream=False, pipeline=False, checkpoint=None):
+    """
+    Repeatedly calls `get_page` with `args`
+    For each page fetched, it calls `callback` with the full response
+    Every `batch_size` observations fetched, it calls `batch_callback` with the batched observations (if provided)
+    Returns an array of all observations fetched if no batch_callback is provided
+
+    With `stream`, pages are parsed as they download (see StreamedPage), so observations reach `batch_callback`
+    before the rest of the page has arrived and a page is never held in memory as a whole.
+
+    With `pipeline`, `batch_callback` runs on a background thread (see BatchWriter) while the next page is fetched,
+    so a run takes as long as the slower of fetching and saving rather than their sum.
+
+    Args:
+        get_page (callable): Function to fetch a page of observations
+        args (dict): Arguments to pass to `get_page`
+        callback (callable): Function to call with each page of observations
+        batch_callback (callable): Function to call with a batch of observations
+        exit_at_end (bool): Whether to exit after fetching all observations or keep polling
+        batch_size (int): Number of observations to accumulate before calling `batch_callback`
+        clear_batches (bool): Whether to clear the batched observations after calling `batch_callback`
+        stream (bool): Whether to stream pages; `get_page` must accept stream=True
+        pipeline (bool): Whether to call `batch_callback` on a background thread while the next page is fetched
+        checkpoint (CursorCheckpoint): Where to save the cursor to resume from once each batch has been through `batch_callback`
+    """
+
+    batched_observations = []
+    processed_count = 0
+    cursor = None
+
+    def save_batch(batch, cursor):
+        with span(SPAN_BATCH_CALLBACK, observations=len(batch)):
+            batch_callback(batch)
+
+        # Everything fetched before cursor has now been saved, so a resumed run can start there
+        if checkpoint is not None:
+            checkpoint.save(cursor)
+
+    # Without clear_batches each batch holds everything so far, so a newer one makes those still waiting redundant
+    writer = BatchWriter(lambda pending: save_batch(*pending), replace_pending=not clear_batches) if batch_callback and pipeline else None
+
+    def flush(batch, cursor):
+        if writer is None:
+            save_batch(batch, cursor)
+        elif clear_batches:
+            writer.put((batch, cursor))
         else:
-            if since is not None:
-                since_timestamp = since
+            # The batch keeps growing after this, while the writer may still be saving it
+            writer.put((list(batch), cursor))
+
+    try:
+        for page in iterate_observation_pages(get_page, args, exit_at_end=exit_at_end, stream=stream):
+            # The page's observations are only kept if the page callback needs them
+            observations = []
+            for observation in page:
+                batched_observations.append(observation)
+                if callback:
+                    observations.append(observation)
+
+                # Streamed pages aren't held whole, so batches are saved as they fill rather than at the end of the page.
+                # Without clear_batches every call rewrites everything batched so far, so that waits for the end of the page.
+                # The rest of the page isn't saved yet, so a resumed run fetches this page again
+                if stream and batch_callback and clear_batches and len(batched_observations) >= batch_size:
+                    flush(batched_observations, page.since)
+                    batched_observations = []
+
+            if page.interruption is not None:
+                # Observations from the interrupted part of the page may be delivered again when it's refetched
+                continue
+
+            if callback:
+                callback({**page.response, 'observations': observations})
+            elif page.since is not None:
+                since_timestamp = page.since
                 if since_timestamp > 4_000_000_000: # in nanoseconds rather than seconds
                     since_timestamp /= 1_000_000_000
                 since_dt = datetime.fromtimestamp(since_timestamp, timezone.utc)
-                print(f"Fetched page with {len(observations)} observation(s) updated {since_dt} or later")
+                print(f"Fetched page with {page.count} observation(s) updated {since_dt} or later")
+
+            processed_count += page.count
 
-        batched_observations.extend(observations)
+            # Where the next page starts; the last page is polled again from its start
+            cursor = page.next_since if page.has_next_page else page.since
 
-        processed_count += len(observations)
+            if batch_callback and (len(batched_observations) >= batch_size or not page.has_next_page):
+                flush(batched_observations, cursor)
+                if clear_batches:
+                    batched_observations = []
 
-        if batch_callback and (len(batched_observations) >= batch_size or not response['has_next_page']):
-            batch_callback(batched_observations)
+        if batch_callback and len(batched_observations) > 0:
+            flush(batched_observations, cursor)
             if clear_batches:
                 batched_observations = []
+    finally:
+        if writer is not None:
+            writer.close()
 
-        if not response['has_next_page']:
-            print("No more data available.")
-            if exit_at_end:
-                break
+    if batch_callback:
+        return processed_count
+    else:
+        return batched_observations
 
-            time.sleep(60)
+
+def iterate_observations(get_page, args, pages=False, exit_at_end=True, stream=False):
+    """
+    Generator yielding the observations from iterate_observation_pages one at a time, or with `pages`, the list of observations on each page.
+    """
+    for page in iterate_observation_pages(get_page, args, exit_at_end=exit_at_end, stream=stream):
+        if not pages:
+            yield from page
             continue
 
-        since = response['next_since']
+        observations = list(page)
+        # An interrupted page is fetched again, so its observations come with the complete page
+        if page.interruption is None:
+            yield observations
 
-    if batch_callback and len(batched_observations) > 0:
-        batch_callback(batched_observations)
-        if clear_batches:
-            batched_observations = []
 
-    if batch_callback:
-        return processed_count
-    else:
-        return batched_observations
+def split_time_range(start_time, end_time, shard_hours):
+    """
+    Split [start_time, end_time] into consecutive shards cut at multiples of shard_hours since the epoch,
+    so that with shard_hours equal to the bucket size no bucket spans two shards.
+
+    Returns:
+        list: (shard_start, shard_end) pairs of unix timestamps. Each covers shard_start <= t < shard_end, except the last, which includes end_time
+    """
+    # Whole seconds, as the API's time filters take
+    shard_seconds = int(shard_hours * 60 * 60)
+    shards = []
+    shard_start = start_time
+    while True:
+        shard_end = (shard_start // shard_seconds + 1) * shard_seconds
+        if shard_end > end_time:
+            shards.append((shard_start, end_time))
+            return shards
+
+        shards.append((shard_start, shard_end))
+        shard_start = shard_end
+
+
+def fetch_observations_in_shards(get_page, args, start_time, end_time, batch_callback, shard_hours=6.0, workers=4, collect_all=False, callback=None, stream=False):
+    """
+    Fetch the observations between start_time and end_time as time shards (see split_time_range), paginating several shards at once,
+    each with its own cursor.
+
+    Each shard's observations are de-duplicated by id and passed to `batch_callback` once the shard is complete, one shard at a time.
+    With shards aligned to the output buckets, each bucket file is written once, from a single shard.
+    With `collect_all`, the observations of every shard are instead passed to `batch_callback` together at the end (eg to save a single file).
+
+    Args:
+        get_page (callable): Function to fetch a page of observations
+        args (dict): Arguments to pass to `get_page`; min_time and max_time are set per shard
+        start_time (int): Start of the time range, as a unix timestamp
+        end_time (int): End of the time range (inclusive), as a unix timestamp
+        batch_callback (callable): Function to call with the observations of each shard
+        shard_hours (float): Shard size in hours, usually the bucket size
+        workers (int): Number of shards to fetch concurrently
+        collect_all (bool): Whether to call `batch_callback` once with all observations instead of once per shard
+        callback (callable): Function to call with each page of observations; calls are never concurrent
+        stream (bool): Whether to stream pages; see iterate_through_observations
+
+    Returns:
+        int: The number of observations fetched
+    """
+    shards = split_time_range(start_time, end_time, shard_hours)
+    workers = max(1, min(workers, len(shards)))
+    print(f"Fetching {len(shards)} time {'shard' if len(shards) == 1 else 'shards'} with {workers} {'worker' if workers == 1 else 'workers'}")
+
+    callback_lock = threading.Lock()
+    save_lock = threading.Lock()
+
+    def locked_callback(response):
+        with callback_lock:
+            callback(response)
+
+    def fetch_shard(shard_start, shard_end, is_last):
+        shard_args = {**args, 'since': 0, 'min_time': shard_start, 'max_time': shard_end}
+        observations = iterate_through_observations(get_page, shard_args, callback=locked_callback if callback else None, exit_at_end=True, stream=stream)
+
+        # The API's time filters include both ends, so observations on a cut are only kept by the shard starting there.
+        # Observations delivered more than once (eg when a streamed page is refetched) are kept once, in their latest version
+        by_id = {}
+        for observation in observations:
+            timestamp = float(observation['timestamp'])
+            if timestamp < shard_start or (timestamp > shard_end if is_last else timestamp >= shard_end):
+                continue
+            by_id[observation.get('id') or id(observation)] = observation
+
+        return list(by_id.values())
+
+    def run_shard(index):
+        shard_start, shard_end = shards[index]
+        observations = fetch_shard(shard_start, shard_end, index == len(shards) - 1)
+        if not collect_all and observations:
+            with save_lock:
+                batch_callback(observations)
+
+        return observations
+
+    ensure_pool_capacity(workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    # Each shard runs in a copy of the caller's context, so it uses the same WindborneClient
+    futures = [executor.submit(contextvars.copy_context().run, run_shard, index) for index in range(len(shards))]
+
+    processed_count = 0
+    collected = []
+    try:
+        for future in futures:
+            observations = future.result()
+            processed_count += len(observations)
+            if collect_all:
+                collected.extend(observations)
+    finally:
+        # If a shard failed (or we were interrupted), don't start the shards that haven't begun
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    if collect_all and collected:
+        batch_callback(collected)
+
+    return processed_count
 
 
 def verify_observations_output_format(output_format):
@@ -423,7 +1079,7 @@ def verify_observations_output_format(output_format):
 
     exit(1)
 
-def get_observations(start_time, end_time=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True):
+def get_observations(start_time, end_time=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True, stream=False, workers=1, pipeline=False, state_file=None):
     """
     Fetches observations between a start time and an optional end time and saves to files in specified format.
     Files are broken up into time buckets, with filenames containing the time at the mid-point of the bucket.
@@ -452,13 +1108,15 @@ def get_observations(start_time, end_time=None, include_updated_at=None, mission
         custom_save (callable): Optional function to save observations in a custom format.
         exit_at_end (bool): Whether to exit after fetching all observations or keep polling.
         verbose (bool): Whether to print saving information.
+        stream (bool): Parse pages as they download instead of all at once, keeping memory flat for large pages.
+        workers (int): Fetch this many time shards (one per bucket) concurrently, each with its own cursor, to speed up backfills of long ranges.
+                       Each bucket's files are written once its shard is complete. Only used when exit_at_end is set.
+        pipeline (bool): Save files on a background thread while the next page is fetched, so downloading and saving overlap.
+        state_file (str): Optional path of a file to save progress to after each batch is saved. If the run is interrupted,
+                          running it again with the same state file resumes from there rather than from start_time.
     """
 
-    # Headers for CSV files
-    csv_headers = [
-        "timestamp", "id", "time", "latitude", "longitude", "altitude", "humidity",
-        "pressure", "specific_humidity", "speed_u", "speed_v", "temperature", "mission_name", "mission_id"
-    ]
+    csv_headers = OBSERVATIONS_CSV_HEADERS
 
     api_args = {
         'min_time': start_time,
@@ -473,13 +1131,15 @@ def get_observations(start_time, end_time=None, include_updated_at=None, mission
         'include_mission_name': True
     }
 
-    return get_observations_core(api_args, csv_headers, get_page=get_observations_page, start_time=start_time, end_time=end_time, output_file=output_file, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, callback=callback, custom_save=custom_save, exit_at_end=exit_at_end, verbose=verbose)
+    return get_observations_core(api_args, csv_headers, get_page=get_observations_page, start_time=start_time, end_time=end_time, output_file=output_file, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, callback=callback, custom_save=custom_save, exit_at_end=exit_at_end, verbose=verbose, stream=stream, workers=workers, pipeline=pipeline, state_file=state_file)
 
 def poll_observations(**kwargs):
     """
     Continuously polls for observations and saves to files in specified format.
     Will run indefinitely until interrupted.
     Same as get_observations, but runs in an infinite loop.
+    Each observation is saved once: bucket files are rewritten in place as observations in them arrive or are updated,
+    rather than observations delivered again going to extra .1, .2, ... files (see ObservationUpserter).
     """
 
     # Print warning about infinite loop
@@ -492,7 +1152,44 @@ def poll_observations(**kwargs):
 
     get_observations(**kwargs, exit_at_end=False)
 
-def get_super_observations(start_time, end_time=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, include_updated_at=True, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True):
+def iter_observations(start_time, end_time=None, include_updated_at=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, pages=False, exit_at_end=True, stream=False):
+    """
+    Generator yielding observations between a start time and an optional end time, fetching each page only once the previous one has been consumed.
+    Memory stays flat however long the time range, as only one page is held at a time.
+    Observations come in the order they were last updated rather than sorted by time.
+
+    Args:
+        start_time (str): A date string, supporting formats YYYY-MM-DD HH:MM:SS, YYYY-MM-DD_HH:MM and ISO strings,
+                          representing the starting time of fetching data.
+        end_time (str): Optional. A date string, supporting formats YYYY-MM-DD HH:MM:SS, YYYY-MM-DD_HH:MM and ISO strings,
+                        representing the end time of fetching data. If not provided, current time is used as end time.
+        include_updated_at (bool): Include update timestamps in response.
+        mission_id (str): Filter observations by mission ID.
+        min_latitude (float): Minimum latitude boundary.
+        max_latitude (float): Maximum latitude boundary.
+        min_longitude (float): Minimum longitude boundary.
+        max_longitude (float): Maximum longitude boundary.
+        pages (bool): Yield the list of observations on each page instead of individual observations.
+        exit_at_end (bool): Whether to stop after fetching all observations or keep polling.
+        stream (bool): Parse pages as they download, so individual observations are yielded before the rest of their page has arrived.
+                       If a download is interrupted, the page is fetched again and its first observations may be yielded twice.
+    """
+    api_args = {
+        'min_time': start_time,
+        'max_time': end_time,
+        'min_latitude': min_latitude,
+        'max_latitude': max_latitude,
+        'min_longitude': min_longitude,
+        'max_longitude': max_longitude,
+        'include_updated_at': include_updated_at,
+        'mission_id': mission_id,
+        'include_ids': True,
+        'include_mission_name': True
+    }
+
+    return iterate_observations(get_observations_page, api_args, pages=pages, exit_at_end=exit_at_end, stream=stream)
+
+def get_super_observations(start_time, end_time=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, include_updated_at=True, output_file=None, bucket_hours=6.0, output_format=None, output_dir=None, callback=None, custom_save=None, exit_at_end=True, verbose=True, stream=False, workers=1, pipeline=False, state_file=None):
     """
     Fetches super observations between a start time and an optional end time and saves to files in specified format.
     Files are broken up into time buckets, with filenames containing the time at the mid-point of the bucket.
@@ -519,12 +1216,14 @@ def get_super_observations(start_time, end_time=None, mission_id=None, min_latit
         custom_save (callable): Optional function to save observations in a custom format.
         exit_at_end (bool): Whether to exit after fetching all observations or keep polling.
         verbose (bool): Whether to print saving information.
+        stream (bool): Parse pages as they download instead of all at once, keeping memory flat for large pages.
+        workers (int): Fetch this many time shards (one per bucket) concurrently, each with its own cursor, to speed up backfills of long ranges.
+                       Each bucket's files are written once its shard is complete. Only used when exit_at_end is set.
+        pipeline (bool): Save files on a background thread while the next page is fetched, so downloading and saving overlap.
+        state_file (str): Optional path of a file to save progress to after each batch is saved. If the run is interrupted,
+                          running it again with the same state file resumes from there rather than from start_time.
     """
-    csv_headers = [
-        "timestamp", "id", "time", "latitude", "longitude", "altitude", "humidity",
-        "mission_name", "pressure", "specific_humidity", "speed_u", "speed_v", "temperature",
-        "mission_id", "updated_at"
-    ]
+    csv_headers = SUPER_OBSERVATIONS_CSV_HEADERS
 
     api_args = {
         'min_time': start_time,
@@ -539,13 +1238,15 @@ def get_super_observations(start_time, end_time=None, mission_id=None, min_latit
         'include_mission_name': True
     }
 
-    return get_observations_core(api_args, csv_headers, get_page=get_super_observations_page, start_time=start_time, end_time=end_time, output_file=output_file, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, callback=callback, custom_save=custom_save, exit_at_end=exit_at_end, verbose=verbose)
+    return get_observations_core(api_args, csv_headers, get_page=get_super_observations_page, start_time=start_time, end_time=end_time, output_file=output_file, bucket_hours=bucket_hours, output_format=output_format, output_dir=output_dir, callback=callback, custom_save=custom_save, exit_at_end=exit_at_end, verbose=verbose, stream=stream, workers=workers, pipeline=pipeline, state_file=state_file)
 
 def poll_super_observations(**kwargs):
     """
     Continuously polls for super observations and saves to files in specified format.
     Will run indefinitely until interrupted.
     Same as get_super_observations, but runs in an infinite loop.
+    Each super observation is saved once: bucket files are rewritten in place as observations in them arrive or are updated,
+    rather than observations delivered again going to extra .1, .2, ... files (see ObservationUpserter).
     """
 
     # Print warning about infinite loop
@@ -558,6 +1259,26 @@ def poll_super_observations(**kwargs):
 
     get_super_observations(**kwargs, exit_at_end=False)
 
+def iter_super_observations(start_time, end_time=None, mission_id=None, min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None, include_updated_at=True, pages=False, exit_at_end=True, stream=False):
+    """
+    Generator yielding super observations between a start time and an optional end time, one page at a time.
+    Takes the same arguments as iter_observations.
+    """
+    api_args = {
+        'min_time': start_time,
+        'max_time': end_time,
+        'mission_id': mission_id,
+        'min_latitude': min_latitude,
+        'max_latitude': max_latitude,
+        'min_longitude': min_longitude,
+        'max_longitude': max_longitude,
+        'include_updated_at': include_updated_at,
+        'include_ids': True,
+        'include_mission_name': True
+    }
+
+    return iterate_observations(get_super_observations_page, api_args, pages=pages, exit_at_end=exit_at_end, stream=stream)
+
 
 # ------------
 # METADATA
@@ -584,7 +1305,9 @@ def get_flying_missions(output_file=None, print_results=False):
     }
 
     url = f"{DATA_API_BASE_URL}/flying_missions.json"
-    flying_missions_response = make_api_request(url, params=query_params)
+
+    # Pages are requested conditionally, so unchanged pages aren't re-downloaded when polling
+    flying_missions_response = make_api_request(url, params=query_params, conditional=True)
 
     flying_missions = flying_missions_response.get("missions", [])
     num_fetched_missions = len(flying_missions) 
@@ -592,7 +1315,7 @@ def get_flying_missions(output_file=None, print_results=False):
     while num_fetched_missions == page_size:
         query_params['page'] += 1
 
-        new_missions = make_api_request(url, params=query_params).get('missions', [])
+        new_missions = make_api_request(url, params=query_params, conditional=True).get('missions', [])
         num_fetched_missions = len(new_missions)
         
         flying_missions += new_missions
@@ -626,7 +1349,7 @@ def get_flying_missions(output_file=None, print_results=False):
             print("No missions are currently flying.")
 
     if output_file:
-        save_arbitrary_response(output_file, flying_missions_response, csv_data_key='missions')
+        save_arbitrary_response(output_file, {**flying_missions_response, 'missions': flying_missions}, csv_data_key='missions')
     
     return flying_missions
 
@@ -842,7 +1565,9 @@ def get_constellation_status(output_file=None, print_results=False):
     }
 
     url = f"{DATA_API_BASE_URL}/constellation_status.json"
-    constellation_response = make_api_request(url, params=query_params)
+
+    # Requested conditionally for cheap polling; see get_flying_missions
+    constellation_response = make_api_request(url, params=query_params, conditional=True)
 
     if not constellation_response:
         if print_results:
@@ -856,7 +1581,7 @@ def get_constellation_status(output_file=None, print_results=False):
     while num_fetched_missions == page_size:
         query_params['page'] += 1
 
-        page_response = make_api_request(url, params=query_params)
+        page_response = make_api_request(url, params=query_params, conditional=True)
         if not page_response:
             break
 
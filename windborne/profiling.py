@@ -0,0 +1,163 @@
+import atexit
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from .tracing import (
+    add_span_listener, remove_span_listener,
+    SPAN_PAGE, SPAN_HTTP_REQUEST, SPAN_DOWNLOAD, SPAN_JSON_DECODE, SPAN_FILTER_SORT, SPAN_SAVE_FILE, SPAN_FORMAT, SPAN_DISK_WRITE
+)
+
+# Stages of the report, and the spans whose exclusive time counts towards each.
+# Pages and downloads are mostly spent reading the response once their nested spans are taken out, so they count as network wait.
+# CSV and JSON are written to disk as they're formatted, so that time counts as formatting
+PROFILE_STAGES = (
+    ('network wait', (SPAN_HTTP_REQUEST, SPAN_PAGE, SPAN_DOWNLOAD)),
+    ('JSON decode', (SPAN_JSON_DECODE,)),
+    ('filter/sort', (SPAN_FILTER_SORT,)),
+    ('formatting', (SPAN_FORMAT, SPAN_SAVE_FILE)),
+    ('disk write', (SPAN_DISK_WRITE,)),
+)
+
+DEFAULT_PROFILE_OUTPUT = 'windborne_profile'
+
+# Seconds between stack samples for the collapsed-stack output
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+class Profiler:
+    """
+    Profiles a run of the library: time spent in each stage of the pipeline (from tracing spans),
+    a cProfile of the calling thread and periodic stack samples of all threads.
+
+    Start it with start(), stop it with stop(), then see report() and write(output_base).
+    """
+
+    def __init__(self, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self.sample_interval = sample_interval
+
+        self.span_seconds = Counter()
+        self.span_counts = Counter()
+        self.stack_samples = Counter()
+        self.started_at = None
+        self.elapsed = None
+
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+
+    def _on_span(self, span):
+        with self._lock:
+            self.span_seconds[span.name] += span.self_duration
+            self.span_counts[span.name] += 1
+
+    def _sample_stacks(self):
+        sampler_id = threading.get_ident()
+        while not self._stop_sampling.wait(self.sample_interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self.stack_samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        add_span_listener(self._on_span)
+
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_stacks, name='windborne-profiler', daemon=True)
+        self._sampler.start()
+
+        self.started_at = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self.started_at
+
+        self._stop_sampling.set()
+        self._sampler.join()
+        remove_span_listener(self._on_span)
+
+    def stage_seconds(self):
+        """
+        Returns:
+            list: (stage, seconds) pairs in pipeline order, ending with time not spent in any traced stage
+        """
+        with self._lock:
+            span_seconds = dict(self.span_seconds)
+
+        stages = [(stage, sum(span_seconds.get(name, 0.0) for name in span_names)) for stage, span_names in PROFILE_STAGES]
+
+        # Spans on other threads (eg parallel download segments) overlap the main thread's, so this can't go below zero
+        other = max(0.0, self.elapsed - sum(span_seconds.values()))
+        stages.append(('other', other))
+
+        return stages
+
+    def report(self):
+        """
+        Returns:
+            str: A table of the time spent in each stage
+        """
+        lines = [f"{'Stage':<14} {'Seconds':>10} {'Share':>7}"]
+        for stage, seconds in self.stage_seconds():
+            share = seconds / self.elapsed * 100 if self.elapsed else 0.0
+            lines.append(f"{stage:<14} {seconds:>10.3f} {share:>6.1f}%")
+        lines.append(f"{'total':<14} {self.elapsed:>10.3f}")
+
+        return '\n'.join(lines)
+
+    def write(self, output_base=DEFAULT_PROFILE_OUTPUT):
+        """
+        Write output_base.pstats (for pstats or snakeviz) and output_base.collapsed (for flamegraph.pl or speedscope).
+
+        Returns:
+            tuple: The paths of the two files
+        """
+        directory = os.path.dirname(output_base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        pstats_file = output_base + '.pstats'
+        self._profile.dump_stats(pstats_file)
+
+        collapsed_file = output_base + '.collapsed'
+        with open(collapsed_file, 'w') as f:
+            for stack, count in sorted(self.stack_samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        return pstats_file, collapsed_file
+
+
+def profile_until_exit(output_base=DEFAULT_PROFILE_OUTPUT):
+    """
+    Start profiling, and print the stage breakdown and write the profile files when the process exits.
+
+    Returns:
+        Profiler: The running profiler
+    """
+    profiler = Profiler()
+
+    def finish():
+        profiler.stop()
+        pstats_file, collapsed_file = profiler.write(output_base)
+
+        print("\n-----------------------------------------------------")
+        print(profiler.report())
+        print(f"\nProfile saved to {pstats_file} (pstats) and {collapsed_file} (collapsed stacks)")
+
+    atexit.register(finish)
+    profiler.start()
+    return profiler
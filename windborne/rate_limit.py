@@ -0,0 +1,179 @@
+import os
+import struct
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Requests are grouped into families by the first segment of their URL path, each with its own budget
+ENDPOINT_FAMILIES = ('observations', 'forecasts', 'insights')
+
+# Bucket state shared between processes: tokens available and the time they were last updated
+_STATE_FORMAT = 'dd'
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+
+def _refill(tokens, updated_at, now, rate, burst):
+    return min(burst, tokens + max(0.0, now - updated_at) * rate)
+
+
+class TokenBucket:
+    """
+    A token bucket allowing `rate` requests per second on average, with bursts of up to `burst` requests.
+    Thread-safe.
+
+    Tokens are reserved rather than waited for: reserve() takes a token immediately, possibly going into debt,
+    and returns how long the caller must wait before using it. Concurrent callers are therefore spaced evenly at the
+    allowed rate, and the same bucket works for both threads (time.sleep) and asyncio (asyncio.sleep).
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Returns:
+            float: Seconds to wait before the reserved request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = _refill(self._tokens, self._updated_at, now, self.rate, self.burst) - tokens
+            self._updated_at = now
+
+            return max(0.0, -self._tokens / self.rate)
+
+
+class FileTokenBucket:
+    """
+    A token bucket whose state lives in a small file, so that every process on the host using the same path
+    shares one budget. Access is serialized with an exclusive file lock (POSIX only). See TokenBucket.
+    """
+
+    def __init__(self, path, rate, burst=None):
+        if fcntl is None:
+            raise RuntimeError("Rate limits shared between processes require file locking, which is only supported on POSIX systems.")
+
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+
+                # Wall-clock time, since monotonic clocks aren't comparable between processes
+                now = time.time()
+
+                state = os.pread(fd, _STATE_SIZE, 0)
+                if len(state) == _STATE_SIZE:
+                    available, updated_at = struct.unpack(_STATE_FORMAT, state)
+                    available = _refill(available, updated_at, now, self.rate, self.burst)
+                else:
+                    available = self.burst
+
+                available -= tokens
+                os.pwrite(fd, struct.pack(_STATE_FORMAT, available, now), 0)
+            finally:
+                # Closing the file releases the lock
+                os.close(fd)
+
+        return max(0.0, -available / self.rate)
+
+
+def endpoint_family(url):
+    """
+    The budget family of an API URL (observations, forecasts or insights), or None for other URLs.
+    """
+    path_segments = urlsplit(url).path.strip('/').split('/')
+    if path_segments and path_segments[0] in ENDPOINT_FAMILIES:
+        return path_segments[0]
+
+    return None
+
+
+class RateLimiter:
+    """
+    Paces requests according to per-endpoint-family token buckets.
+
+    Args:
+        buckets (dict): Maps an endpoint family (observations, forecasts, insights) to a TokenBucket or FileTokenBucket.
+                        Families without a bucket (and URLs outside any family) aren't limited.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = dict(buckets)
+
+    def reserve(self, url):
+        """
+        Returns:
+            float: Seconds to wait before sending a request to url
+        """
+        bucket = self.buckets.get(endpoint_family(url))
+        if bucket is None:
+            return 0.0
+
+        return bucket.reserve()
+
+    def wait(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_limiter = None
+
+
+def configure_rate_limits(observations=None, forecasts=None, insights=None, burst=None, shared_dir=None):
+    """
+    Limit how many requests per second make_api_request (and windborne.aio) send to each family of endpoints.
+    Requests over the limit wait their turn instead of being sent and throttled by the server.
+    Call with no limits to disable rate limiting.
+
+    Args:
+        observations (float): Requests per second to observation endpoints. None for no limit
+        forecasts (float): Requests per second to forecast endpoints. None for no limit
+        insights (float): Requests per second to insights endpoints. None for no limit
+        burst (int): Requests that may be sent at once before pacing starts. Defaults to one second's worth
+        shared_dir (str): Directory for bucket state shared by every process on this host using the same directory.
+                          If omitted, limits apply to this process only
+
+    Returns:
+        RateLimiter: The new limiter, or None if rate limiting is disabled
+    """
+    global _rate_limiter
+
+    rates = {'observations': observations, 'forecasts': forecasts, 'insights': insights}
+
+    buckets = {}
+    for family, rate in rates.items():
+        if rate is None:
+            continue
+
+        if shared_dir:
+            buckets[family] = FileTokenBucket(os.path.join(shared_dir, f"{family}.bucket"), rate, burst=burst)
+        else:
+            buckets[family] = TokenBucket(rate, burst=burst)
+
+    _rate_limiter = RateLimiter(buckets) if buckets else None
+    return _rate_limiter
+
+
+def get_rate_limiter():
+    return _rate_limiter
@@ -0,0 +1,413 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .utils import atomic_write
+from .json_backend import loads, loads_response
+
+# Use as a rule's TTL for responses that never change once produced
+IMMUTABLE = float('inf')
+
+DEFAULT_CACHE_MAX_SIZE_BYTES = 2 * 1024 * 1024 * 1024
+CACHE_CHUNK_SIZE = 1024 * 1024
+
+# Response headers kept alongside cached bodies
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Disposition')
+
+
+def immutable_with(*param_names):
+    """
+    A rule TTL for endpoints whose responses are immutable once pinned to a specific run (eg by initialization_time),
+    but change over time otherwise, in which case they aren't cached.
+    """
+    return expiring_with(IMMUTABLE, *param_names)
+
+
+def expiring_with(seconds, *param_names):
+    """
+    A rule TTL of the given seconds for endpoints that are only worth caching when pinned to a specific run (eg by initialization_time),
+    but whose responses can still change for a while after that, eg while the run is in progress.
+    """
+    def ttl(params):
+        if all(params.get(name) is not None for name in param_names):
+            return seconds
+        return None
+
+    return ttl
+
+
+# (URL path regex, TTL) pairs, first match wins. TTLs are seconds, IMMUTABLE, or a function of the request params
+# returning either of those or None for "don't cache". Endpoints matching no rule are never cached.
+DEFAULT_CACHE_RULES = [
+    (r"/forecasts/v1/[^/]+/gridded$", immutable_with('initialization_time')),
+    # Cyclone tracks keep being updated while a run is in progress, which can't be told from the request alone.
+    # Run information isn't cached at all, since its status is what callers poll for (with conditional requests)
+    (r"/forecasts/v1/[^/]+/tropical_cyclones$", expiring_with(900, 'initialization_time')),
+    (r"/forecasts/v1/[^/]+/point_forecast/stations/[^/]+$", immutable_with('initialization_time')),
+    (r"/forecasts/v1/[^/]+/point_forecast(/interpolated|/interpolated_sounding)?$", immutable_with('initialization_time')),
+    (r"/forecasts/v1/[^/]+/analysis/(gridded|interpolated)$", immutable_with('time')),
+    (r"/insights/v1/[^/]+/(hdds|cdds)$", immutable_with('initialization_time')),
+    (r"/observations/v1/soundings/[^/]+$", IMMUTABLE),
+    (r"/observations/v1/missions/[^/]+/launch_site\.json$", IMMUTABLE),
+    # Flight paths only stop changing once a mission lands, which can't be told from the request alone
+    (r"/observations/v1/missions/[^/]+/flight_path\.json$", 300),
+]
+
+
+class ResponseCache:
+    """
+    A persistent on-disk cache of API responses, keyed by URL and params.
+
+    Each entry is a body file plus a small JSON metadata file in one directory, written atomically so that
+    several processes can share a cache directory. Entries expire according to the TTL rules, and the least recently
+    used entries are evicted once the total size goes over max_size_bytes.
+
+    Attributes:
+        hits, misses, stores, evictions (int): Counters since the cache was created; see stats()
+    """
+
+    def __init__(self, directory, max_size_bytes=DEFAULT_CACHE_MAX_SIZE_BYTES, rules=None):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.max_size_bytes = max_size_bytes
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in (DEFAULT_CACHE_RULES if rules is None else rules)]
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._size_bytes = None
+
+    def ttl_for(self, url, params=None):
+        """
+        The TTL in seconds (or IMMUTABLE) for a request, or None if it shouldn't be cached.
+        """
+        path = urlsplit(url).path
+        for pattern, ttl in self.rules:
+            if pattern.search(path):
+                return ttl(params or {}) if callable(ttl) else ttl
+
+        return None
+
+    def key_for(self, url, params=None, client_id=None):
+        # Responses can depend on the account, so the client id is part of the key
+        normalized_params = sorted((str(key), value) for key, value in (params or {}).items() if value is not None)
+        payload = json.dumps([client_id, url, normalized_params], default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.body")
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def load(self, key, as_json=True):
+        """
+        Get a cached response.
+
+        Returns:
+            The parsed JSON if as_json, otherwise a requests.Response streaming the cached body. None on a miss.
+        """
+        meta_path, body_path = self._paths(key)
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            if meta.get('expires_at') is not None and meta['expires_at'] < time.time():
+                self._remove(key)
+                self._count('misses')
+                return None
+
+            body_file = open(body_path, 'rb')
+
+            # Mark as recently used for eviction
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+
+        if not as_json:
+            self._count('hits')
+            return self._cached_response(meta, body_file)
+
+        with body_file:
+            try:
+                value = loads(body_file.read())
+            except (OSError, ValueError):
+                # A corrupt entry is treated as a miss and refetched
+                self._remove(key)
+                self._count('misses')
+                return None
+
+        self._count('hits')
+        return value
+
+    def _new_meta(self, response, ttl):
+        return {
+            'url': response.url,
+            'stored_at': time.time(),
+            'expires_at': None if ttl == IMMUTABLE else time.time() + ttl,
+            'headers': {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+        }
+
+    def store(self, key, response, as_json=True, ttl=IMMUTABLE):
+        """
+        Save a successful, non-streamed response to the cache.
+        Streamed downloads are added once saved instead; see store_after_download.
+
+        Returns:
+            What make_api_request should return: the parsed JSON if as_json, otherwise a requests.Response streaming the cached body.
+            Responses that couldn't be cached are returned as they are.
+        """
+        meta_path, body_path = self._paths(key)
+        meta = self._new_meta(response, ttl)
+        meta['size'] = len(response.content)
+
+        if as_json:
+            value = loads_response(response)
+        else:
+            value = response
+
+        if meta['size'] > self.max_size_bytes:
+            # It would only be evicted again straight away
+            return value
+
+        try:
+            with atomic_write(body_path, 'wb') as f:
+                f.write(response.content)
+            with atomic_write(meta_path, 'w') as f:
+                json.dump(meta, f)
+
+            # Open before evicting, so the body stays readable even if this entry is immediately evicted
+            body_file = None if as_json else open(body_path, 'rb')
+        except OSError as e:
+            print(f"Could not write to the response cache: {e}")
+            return value
+
+        self._record_store(meta['size'])
+
+        if as_json:
+            return value
+
+        return self._cached_response(meta, body_file)
+
+    def store_after_download(self, key, response, ttl=IMMUTABLE):
+        """
+        Mark a streamed response to be added to the cache once its body has been saved to a file (see cache_downloaded_file).
+        Its body is left unread, so the download keeps its redirect history and can still be resumed with range requests.
+
+        Returns:
+            requests.Response: The response itself
+        """
+        response.cache_entry = (self, key, ttl)
+        return response
+
+    def store_file(self, key, response, path, ttl=IMMUTABLE):
+        """
+        Copy a file downloaded from a response into the cache.
+        """
+        meta_path, body_path = self._paths(key)
+        meta = self._new_meta(response, ttl)
+
+        try:
+            meta['size'] = os.path.getsize(path)
+            if meta['size'] > self.max_size_bytes:
+                return
+
+            with open(path, 'rb') as source, atomic_write(body_path, 'wb') as f:
+                shutil.copyfileobj(source, f, CACHE_CHUNK_SIZE)
+            with atomic_write(meta_path, 'w') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            print(f"Could not write to the response cache: {e}")
+            return
+
+        self._record_store(meta['size'])
+
+    def _cached_response(self, meta, body_file):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = meta['url']
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.headers['Content-Length'] = str(meta['size'])
+        response.raw = body_file
+        return response
+
+    def _record_store(self, size):
+        with self._lock:
+            self.stores += 1
+            if self._size_bytes is not None:
+                self._size_bytes += size
+            over_limit = self._size_bytes is None or self._size_bytes > self.max_size_bytes
+
+        if over_limit:
+            self.evict()
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json') or name.startswith('.'):
+                continue
+
+            key = name[:-len('.json')]
+            meta_path, body_path = self._paths(key)
+            try:
+                entries.append((os.path.getmtime(meta_path), os.path.getsize(body_path), key))
+            except OSError:
+                continue
+
+        return entries
+
+    def _is_expired(self, key, now):
+        meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                expires_at = json.load(f).get('expires_at')
+        except (OSError, ValueError):
+            return False
+
+        return expires_at is not None and expires_at < now
+
+    def evict(self):
+        """
+        Remove expired entries, then the least recently used ones until the cache fits in max_size_bytes.
+        """
+        now = time.time()
+        entries = []
+        evicted = 0
+        for entry in sorted(self._entries()):
+            if self._is_expired(entry[2], now):
+                self._remove(entry[2])
+                evicted += 1
+            else:
+                entries.append(entry)
+
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, key in entries:
+            if total_size <= self.max_size_bytes:
+                break
+
+            self._remove(key)
+            total_size -= size
+            evicted += 1
+
+        with self._lock:
+            self._size_bytes = total_size
+            self.evictions += evicted
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        for _, _, key in self._entries():
+            self._remove(key)
+
+        with self._lock:
+            self._size_bytes = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, stores, evictions, entries, and size_bytes
+        """
+        entries = self._entries()
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'size_bytes': sum(size for _, size, _ in entries),
+            }
+
+
+_response_cache = None
+_response_cache_configured = False
+_response_cache_lock = threading.Lock()
+
+
+def configure_response_cache(directory=None, max_size_bytes=DEFAULT_CACHE_MAX_SIZE_BYTES, rules=None):
+    """
+    Enable the on-disk response cache used by make_api_request, or disable it by passing directory=None.
+    The cache can also be enabled by setting the WB_CACHE_DIR environment variable.
+
+    Args:
+        directory (str): Directory to store cached responses in
+        max_size_bytes (int): Least recently used entries are evicted beyond this total size
+        rules (list): (URL path regex, TTL) pairs replacing DEFAULT_CACHE_RULES
+
+    Returns:
+        ResponseCache: The new cache, or None if disabled
+    """
+    global _response_cache, _response_cache_configured
+
+    with _response_cache_lock:
+        _response_cache = ResponseCache(directory, max_size_bytes=max_size_bytes, rules=rules) if directory else None
+        _response_cache_configured = True
+
+    return _response_cache
+
+
+def get_response_cache():
+    """
+    Returns:
+        ResponseCache: The cache used by make_api_request, or None if caching is disabled
+    """
+    global _response_cache, _response_cache_configured
+
+    if not _response_cache_configured:
+        with _response_cache_lock:
+            if not _response_cache_configured:
+                directory = os.getenv('WB_CACHE_DIR')
+                if directory:
+                    _response_cache = ResponseCache(directory)
+                _response_cache_configured = True
+
+    return _response_cache
+
+
+def cache_downloaded_file(response, path):
+    """
+    Add a file saved from a streamed response to the response cache, if make_api_request marked it for caching.
+    """
+    cache_entry = getattr(response, 'cache_entry', None)
+    if cache_entry is None:
+        return
+
+    cache, key, ttl = cache_entry
+    cache.store_file(key, response, path, ttl=ttl)
+
+
+def get_cache_stats():
+    """
+    Returns:
+        dict: Hit/miss counters and size of the response cache, or None if caching is disabled
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None
+
+    return cache.stats()
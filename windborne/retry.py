@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Status codes that mean "try again later" rather than "this request is wrong"
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class RetryBudget:
+    """
+    Limits retries across every request in the process, so that when the API is struggling, clients back off
+    instead of multiplying the load with retries.
+
+    Over any window of ttl seconds, up to min_per_second * ttl retries are allowed, plus ratio times the number of requests made.
+    Thread-safe.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1.0, ttl=10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.ttl = ttl
+
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        cutoff = now - self.ttl
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+    def record_request(self):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._requests.append(now)
+
+    def try_spend(self):
+        """
+        Returns:
+            bool: True if a retry is allowed (and counts it), False if the budget is exhausted
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            allowed = self.min_per_second * self.ttl + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                return False
+
+            self._retries.append(now)
+            return True
+
+
+class RetryState:
+    """
+    Tracks the retries of a single request. Created by RetryPolicy.start().
+    """
+
+    def __init__(self, policy, attempts=0):
+        self.policy = policy
+        self.attempts = attempts
+        self.started_at = time.monotonic()
+        self._previous_delay = policy.base_delay
+
+        if policy.budget is not None:
+            policy.budget.record_request()
+
+    def next_delay(self, retry_after=None):
+        """
+        Record a failed attempt and decide whether to retry.
+
+        Args:
+            retry_after (float): Seconds the server asked us to wait, if it sent a Retry-After header
+
+        Returns:
+            float: Seconds to sleep before the next attempt, or None to give up
+        """
+        self.attempts += 1
+        policy = self.policy
+
+        if self.attempts >= policy.max_attempts:
+            return None
+
+        # Decorrelated jitter: spreads out retries from many workers that failed at the same moment
+        delay = min(policy.max_delay, random.uniform(policy.base_delay, self._previous_delay * 3))
+        self._previous_delay = delay
+
+        if retry_after is not None and policy.respect_retry_after:
+            delay = max(delay, retry_after)
+
+        if policy.deadline is not None and time.monotonic() - self.started_at + delay > policy.deadline:
+            return None
+
+        if policy.budget is not None and not policy.budget.try_spend():
+            return None
+
+        return delay
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request. Used by make_api_request, windborne.aio and downloads.
+
+    Args:
+        max_attempts (int): Total attempts per request, including the first
+        base_delay (float): Minimum seconds between attempts
+        max_delay (float): Maximum seconds between attempts (a longer Retry-After from the server is still honored)
+        deadline (float): Give up once retrying would take a request past this many seconds in total. None for no deadline
+        retry_statuses (iterable): HTTP status codes to retry; connection errors and timeouts are always retried
+        respect_retry_after (bool): Wait at least as long as the server's Retry-After header asks
+        budget (RetryBudget): Shared limit on retries across requests. None for no limit
+    """
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=30.0, deadline=120.0, retry_statuses=DEFAULT_RETRY_STATUSES, respect_retry_after=True, budget=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget
+
+    def start(self, attempts=0):
+        return RetryState(self, attempts=attempts)
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.retry_statuses
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (either delay seconds or an HTTP date) into seconds from now.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_retry_policy = RetryPolicy(budget=RetryBudget())
+
+
+def configure_retry_policy(policy=None, **kwargs):
+    """
+    Set the retry policy used for every request.
+
+    Args:
+        policy (RetryPolicy): The policy to use. If omitted, a new RetryPolicy is built from kwargs
+                              (eg configure_retry_policy(max_attempts=3, deadline=30)), sharing the default retry budget
+
+    Returns:
+        RetryPolicy: The policy now in use
+    """
+    global _retry_policy
+
+    if policy is None:
+        kwargs.setdefault('budget', _retry_policy.budget)
+        policy = RetryPolicy(**kwargs)
+
+    _retry_policy = policy
+    return policy
+
+
+def get_retry_policy():
+    return _retry_policy
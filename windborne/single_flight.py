@@ -0,0 +1,116 @@
+import copy
+import threading
+import time
+
+# Memoized results are swept once there are more than this many finished calls remembered
+MEMO_SWEEP_THRESHOLD = 1024
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.expires_at = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in flight, other callers with the same key wait for it
+    and get its result (or exception) instead of making their own. Thread-safe.
+
+    With copy_result, every caller gets a result of its own: the caller that made the call gets the original, and the others
+    get copies of a copy kept aside, so that no caller can modify what another one got. Nothing is copied when no one shared the call.
+
+    Args:
+        memo_seconds (float): Keep returning a finished call's result for this many seconds afterwards. Errors are never memoized
+        copy_result (callable): Function copying a result, eg copy.deepcopy. Results are shared as they are if None
+    """
+
+    def __init__(self, memo_seconds=0.0, copy_result=None):
+        self.memo_seconds = memo_seconds
+        self.copy_result = copy_result
+        self.coalesced = 0
+
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _sweep(self, now):
+        for key in [key for key, call in self._calls.items() if call.expires_at is not None and call.expires_at <= now]:
+            del self._calls[key]
+
+    def do(self, key, func):
+        """
+        Run func() unless a call with the same key is already in flight (or memoized), in which case share its result.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and (call.expires_at is None or call.expires_at > now):
+                self.coalesced += 1
+                call.waiters += 1
+                is_leader = False
+            else:
+                if len(self._calls) > MEMO_SWEEP_THRESHOLD:
+                    self._sweep(now)
+
+                call = _Call()
+                self._calls[key] = call
+                is_leader = True
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            if self.copy_result is not None:
+                return self.copy_result(call.value)
+            return call.value
+
+        value = None
+        try:
+            value = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if call.error is None and self.memo_seconds > 0:
+                    call.expires_at = time.monotonic() + self.memo_seconds
+                elif self._calls.get(key) is call:
+                    del self._calls[key]
+
+                # No one can join the call any more unless it's memoized, so the waiters counted so far are all that share it
+                shared = call.waiters > 0 or call.expires_at is not None
+
+            # Copied before anyone is woken up, so the leader can't have modified its result yet
+            call.value = self.copy_result(value) if self.copy_result is not None and shared and call.error is None else value
+            call.event.set()
+
+        return value
+
+
+_request_coalescer = SingleFlight(copy_result=copy.deepcopy)
+
+
+def configure_request_coalescing(enabled=True, memo_seconds=0.0):
+    """
+    Configure how make_api_request coalesces identical JSON requests (same URL and params).
+    Concurrent identical requests share one network call. Each caller gets its own copy of the parsed result, so callers can modify it freely.
+
+    Args:
+        enabled (bool): Whether to coalesce identical concurrent requests. Enabled by default
+        memo_seconds (float): Also reuse a finished request's result for this many seconds. Off (0) by default
+
+    Returns:
+        SingleFlight: The new coalescer, or None if disabled
+    """
+    global _request_coalescer
+
+    _request_coalescer = SingleFlight(memo_seconds=memo_seconds, copy_result=copy.deepcopy) if enabled else None
+    return _request_coalescer
+
+
+def get_request_coalescer():
+    return _request_coalescer
@@ -0,0 +1,240 @@
+import re
+
+from .json_backend import loads
+from .tracing import span, SPAN_DOWNLOAD, SPAN_JSON_DECODE
+
+# Bytes read from the response at a time when streaming a page
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Inside values, only strings (which may contain brackets) and brackets matter.
+# A lone quote means a string that isn't complete yet, so scanning has to wait for more data
+_VALUE_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]|"')
+
+# Between the top-level keys, commas and colons matter too
+_TOP_LEVEL_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]|"')
+
+_WHITESPACE = re.compile(rb'\s*')
+
+_COMMA = ord(',')
+_CLOSING_BRACKET = ord(']')
+
+
+def _last_item_end(buffer, start):
+    # The end of the last '}' in buffer[start:] followed by ',' or ']', ie that could close an array item
+    end = len(buffer)
+    while True:
+        index = buffer.rfind(b'}', start, end)
+        if index < 0:
+            return None
+
+        following = _WHITESPACE.match(buffer, index + 1).end()
+        if following < len(buffer) and buffer[following] in (_COMMA, _CLOSING_BRACKET):
+            return index + 1
+
+        end = index
+
+
+class StreamingArrayParser:
+    """
+    Incrementally parses a JSON object such as {"observations": [...], "has_next_page": true, "next_since": 123},
+    returning the items of one array as soon as they are complete, without ever holding the parsed page in memory.
+    The object's other top-level values are collected in `fields`.
+
+    Feed it bytes with feed(), which returns the items completed so far, then call close().
+    """
+
+    def __init__(self, array_key='observations'):
+        self.array_key = array_key
+        self.fields = {}
+
+        self._buffer = b''
+        self._pos = 0
+        self._depth = 0
+        self._in_array = False
+        self._key = None
+        self._expecting_key = False
+        self._value_start = None
+        self._item_start = None
+        self._done = False
+
+    def feed(self, data):
+        """
+        Args:
+            data (bytes): The next bytes of the response body
+
+        Returns:
+            list: Items of the array completed by this data, in order
+        """
+        self._buffer += data
+        items = []
+        try_fast_path = True
+
+        buffer = self._buffer
+        while not self._done:
+            if try_fast_path and self._in_array and self._depth == 2:
+                # Fast path: decode every complete item in the buffer with one call to the JSON backend.
+                # If the bytes up to the last possible item end parse as array items, the cut must be between items
+                # (a cut inside a string or a nested value wouldn't parse); otherwise fall back to scanning tokens
+                try_fast_path = False
+                items_start = _WHITESPACE.match(buffer, self._pos).end()
+                if items_start < len(buffer) and buffer[items_start] == _COMMA:
+                    items_start = _WHITESPACE.match(buffer, items_start + 1).end()
+
+                items_end = _last_item_end(buffer, items_start)
+                if items_end is not None and buffer[items_start:items_start + 1] == b'{':
+                    try:
+                        items.extend(loads(b'[' + buffer[items_start:items_end] + b']'))
+                        self._pos = items_end
+                    except ValueError:
+                        pass
+
+            tokens = _TOP_LEVEL_TOKENS if self._depth <= 1 else _VALUE_TOKENS
+            match = tokens.search(buffer, self._pos)
+            if match is None or match.group() == b'"':
+                # Either nothing left to scan or a string split across chunks
+                if match is not None:
+                    self._pos = match.start()
+                else:
+                    self._pos = len(buffer)
+                break
+
+            token = match.group()
+            self._pos = match.end()
+
+            if self._depth == 1:
+                self._top_level_token(token, match.start(), buffer)
+                continue
+
+            if token == b'{' or token == b'[':
+                self._depth += 1
+                if self._in_array and self._depth == 3:
+                    self._item_start = match.start()
+                elif self._depth == 1:
+                    self._expecting_key = True
+            elif token == b'}' or token == b']':
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and self._item_start is not None:
+                    items.append(loads(buffer[self._item_start:match.end()]))
+                    self._item_start = None
+                elif self._in_array and self._depth == 1:
+                    self._in_array = False
+                    self._key = None
+                elif self._depth == 1 and self._value_start is not None:
+                    self.fields[self._key] = loads(buffer[self._value_start:match.end()])
+                    self._value_start = None
+                    self._key = None
+                elif self._depth == 0:
+                    self._done = True
+
+        self._compact()
+        return items
+
+    def _top_level_token(self, token, start, buffer):
+        if token == b'{' or token == b'[':
+            if self._key == self.array_key and token == b'[':
+                self._in_array = True
+                self._value_start = None
+            else:
+                self._value_start = start
+            self._depth += 1
+        elif token == b'}':
+            self._end_scalar_value(start, buffer)
+            self._depth -= 1
+            self._done = True
+        elif token == b',':
+            self._end_scalar_value(start, buffer)
+            self._expecting_key = True
+        elif token == b':':
+            self._value_start = self._pos
+        elif self._expecting_key:
+            self._key = loads(token)
+            self._expecting_key = False
+
+    def _end_scalar_value(self, end, buffer):
+        if self._key is not None and self._value_start is not None:
+            self.fields[self._key] = loads(buffer[self._value_start:end])
+
+        self._key = None
+        self._value_start = None
+
+    def _compact(self):
+        # Drop bytes that have been fully processed, keeping any value or item that is still incomplete
+        keep_from = self._pos
+        for start in (self._value_start, self._item_start):
+            if start is not None:
+                keep_from = min(keep_from, start)
+
+        if keep_from == 0:
+            return
+
+        self._buffer = self._buffer[keep_from:]
+        self._pos -= keep_from
+        if self._value_start is not None:
+            self._value_start -= keep_from
+        if self._item_start is not None:
+            self._item_start -= keep_from
+
+    def close(self):
+        """
+        Returns:
+            dict: The object's top-level values other than the array
+
+        Raises:
+            ValueError: If the body ended before the object was complete
+        """
+        if not self._done:
+            raise ValueError("Response body ended before the JSON object was complete")
+
+        return self.fields
+
+
+class StreamedPage:
+    """
+    A page of observations parsed while it downloads.
+
+    Iterate over it to get the observations one at a time as they arrive. Once iterated, the page's other values
+    (has_next_page, next_since, ...) are available as attributes and in `fields`.
+    A page can only be iterated once.
+    """
+
+    def __init__(self, response, array_key='observations', chunk_size=STREAM_CHUNK_SIZE):
+        self.response = response
+        self.array_key = array_key
+        self.chunk_size = chunk_size
+        self.fields = None
+
+    def __iter__(self):
+        if self.fields is not None:
+            raise RuntimeError("A streamed page can only be iterated once")
+
+        parser = StreamingArrayParser(self.array_key)
+        try:
+            chunks = self.response.iter_content(chunk_size=self.chunk_size)
+            while True:
+                # The page is read as it's iterated, after get_page's span has ended, so waiting for it is timed here
+                with span(SPAN_DOWNLOAD):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+
+                with span(SPAN_JSON_DECODE):
+                    items = parser.feed(chunk)
+                yield from items
+        finally:
+            self.response.close()
+
+        with span(SPAN_JSON_DECODE):
+            self.fields = parser.close()
+
+    def _field(self, name):
+        if self.fields is None:
+            raise RuntimeError(f"{name} is only available after iterating over the page")
+        return self.fields.get(name)
+
+    @property
+    def has_next_page(self):
+        return self._field('has_next_page')
+
+    @property
+    def next_since(self):
+        return self._field('next_since')
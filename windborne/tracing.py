@@ -0,0 +1,181 @@
+import threading
+import time
+
+# Names of the spans the library emits, nested roughly in this order
+SPAN_PAGE = 'windborne.page'                      # fetching and parsing one page of observations
+SPAN_HTTP_REQUEST = 'windborne.http_request'      # one attempt of an API request, until the response (or its headers, when streamed) arrived
+SPAN_DOWNLOAD = 'windborne.download'              # downloading a file (eg a gridded forecast) to disk, or reading a streamed response body
+SPAN_JSON_DECODE = 'windborne.json_decode'        # parsing a JSON response body
+SPAN_BATCH_CALLBACK = 'windborne.batch_callback'  # handing a batch of observations to the batch callback (usually saving it)
+SPAN_FILTER_SORT = 'windborne.filter_sort'        # filtering a batch to the requested time range and sorting it
+SPAN_SAVE_FILE = 'windborne.save_file'            # writing one output file (eg one bucket)
+SPAN_FORMAT = 'windborne.format'                  # converting observations to an output format (little_r, netcdf)
+SPAN_DISK_WRITE = 'windborne.disk_write'          # writing already formatted output to disk
+
+_tracer = None
+_tracing_configured = False
+_listeners = ()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _NoOpSpan:
+    """
+    Returned by span() when tracing is off, so that instrumented code costs one function call and one check.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class Span:
+    """
+    A timed section of work, reported to OpenTelemetry (when configured) and to span listeners.
+    Use through span().
+    """
+    __slots__ = ('name', 'attributes', 'start', 'duration', 'child_duration', '_otel_context', '_otel_span', '_parent')
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.start = None
+        self.duration = None
+        self.child_duration = 0.0
+        self._otel_context = None
+        self._otel_span = None
+        self._parent = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def __enter__(self):
+        tracer = _tracer
+        if tracer is not None:
+            self._otel_context = tracer.start_as_current_span(self.name, attributes=self.attributes)
+            self._otel_span = self._otel_context.__enter__()
+
+        self._parent = getattr(_local, 'current', None)
+        _local.current = self
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = time.perf_counter() - self.start
+        _local.current = self._parent
+        if self._parent is not None:
+            self._parent.child_duration += self.duration
+
+        if self._otel_context is not None:
+            self._otel_context.__exit__(exc_type, exc_value, traceback)
+
+        for listener in _listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Error in span listener {getattr(listener, '__name__', listener)}: {e}")
+
+        return False
+
+    @property
+    def self_duration(self):
+        """
+        Seconds spent in this span but not in the spans nested in it.
+        """
+        return self.duration - self.child_duration
+
+
+def _load_opentelemetry():
+    global _tracer, _tracing_configured
+
+    with _lock:
+        if _tracing_configured:
+            return
+
+        try:
+            from opentelemetry import trace
+            _tracer = trace.get_tracer('windborne')
+        except ImportError:
+            _tracer = None
+
+        _tracing_configured = True
+
+
+def span(name, **attributes):
+    """
+    Time a section of work, as a context manager:
+
+        with span(SPAN_SAVE_FILE, file=output_file) as current:
+            ...
+            current.set_attribute('observations', count)
+
+    Spans go to OpenTelemetry if it's installed (see configure_tracing) and to span listeners (see add_span_listener).
+    Otherwise a shared no-op span is returned and nothing is timed.
+    """
+    if not _tracing_configured:
+        _load_opentelemetry()
+
+    if _tracer is None and not _listeners:
+        return _NOOP_SPAN
+
+    return Span(name, attributes)
+
+
+def configure_tracing(enabled=True, tracer=None):
+    """
+    Choose whether spans are sent to OpenTelemetry. By default they are whenever the opentelemetry-api package is installed,
+    using the globally configured tracer provider (set one up with the OpenTelemetry SDK to export spans).
+
+    Args:
+        enabled (bool): Whether to send spans to OpenTelemetry
+        tracer: The OpenTelemetry tracer to use instead of the global provider's 'windborne' tracer
+
+    Returns:
+        The tracer spans are sent to, or None if tracing is disabled
+    """
+    global _tracer, _tracing_configured
+
+    if enabled and tracer is None:
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            print("Please install the opentelemetry-api library to use tracing, eg 'python3 -m pip install opentelemetry-api opentelemetry-sdk'.")
+            return None
+        tracer = trace.get_tracer('windborne')
+
+    with _lock:
+        _tracer = tracer if enabled else None
+        _tracing_configured = True
+
+    return _tracer
+
+
+def add_span_listener(listener):
+    """
+    Call listener(span) whenever a span ends, with span.name, span.attributes, span.duration and span.self_duration.
+    Listeners run on the thread that ran the span, whether or not OpenTelemetry is installed.
+    """
+    global _listeners
+
+    with _lock:
+        _listeners = _listeners + (listener,)
+
+    return listener
+
+
+def remove_span_listener(listener):
+    global _listeners
+
+    with _lock:
+        _listeners = tuple(registered for registered in _listeners if registered is not listener)
@@ -1,5 +1,6 @@
 from datetime import datetime
-import json
+
+from . import json_backend
 
 TRACK_SUPPORTED_FORMATS = ['.csv', '.json', '.geojson', '.gpx', '.kml', 'little_r']
 
@@ -12,7 +13,7 @@ def save_track(output_file, track_data, time_key='time', require_ids=False):
 
     if output_file.lower().endswith('.json'):
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(track_data, f, indent=4)
+            json_backend.dump(track_data, f)
     elif output_file.lower().endswith('.csv'):
         save_track_as_csv(output_file, track_data, time_key=time_key, include_id=include_id)
     elif output_file.lower().endswith('.geojson'):
@@ -257,6 +258,6 @@ def save_track_as_geojson(filename, track_data, time_key='time'):
     }
 
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(geojson, f, indent=4)
+        json_backend.dump(geojson, f)
     print("Saved to", filename)
 
@@ -1,10 +1,13 @@
 import os
 import re
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import dateutil.parser
-import json
 import csv
 
+from . import json_backend
+
 
 def to_unix_timestamp(date_string):
     """
@@ -95,6 +98,66 @@ def parse_time(time, init_time_flag=None, require_past=False):
         exit(2)
 
 
+def _read_umask():
+    # Linux reports the umask in /proc; elsewhere it can only be read by setting it, which races with other threads creating files
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+_import_umask = _read_umask()
+if _import_umask is None:
+    _import_umask = os.umask(0)
+    os.umask(_import_umask)
+
+
+def _default_file_mode():
+    # mkstemp creates files readable by the owner only; files written normally get 0o666 minus the umask
+    umask = _read_umask()
+    if umask is None:
+        umask = _import_umask
+    return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_write(output_file, mode='wb'):
+    """
+    Open a temporary file next to output_file for writing, and move it into place only once writing succeeded.
+    Readers never see a partially written output_file, and a failed write leaves any previous file untouched.
+    The file keeps the permissions of the file it replaces, or gets the usual ones for a new file.
+
+    Args:
+        output_file (str): The final path of the file
+        mode (str): Mode to open the temporary file with, eg 'wb' or 'w'
+
+    Yields:
+        file: The open temporary file
+    """
+    directory = os.path.dirname(output_file) or '.'
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(output_file)}.", suffix='.tmp')
+
+    try:
+        with os.fdopen(file_descriptor, mode) as f:
+            yield f
+
+        try:
+            file_mode = os.stat(output_file).st_mode & 0o7777
+        except OSError:
+            file_mode = _default_file_mode()
+        os.chmod(temp_path, file_mode)
+
+        os.replace(temp_path, output_file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def save_arbitrary_response(output_file, response, csv_data_key=None):
     """
     Save Data API response data to a file in either JSON or CSV format.
@@ -120,7 +183,7 @@ def save_arbitrary_response(output_file, response, csv_data_key=None):
         exit(1)
     elif output_file.lower().endswith('.json'):
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(response, f, indent=4)
+            json_backend.dump(response, f)
         print("Saved to", output_file)
     elif output_file.lower().endswith('.csv'):
         # Extract data for CSV if a key is provided